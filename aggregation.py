@@ -0,0 +1,150 @@
+"""Streaming, mergeable population statistics of calculation results."""
+import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PopulationAggregate:
+    """Grouped running sums, counts and fixed-bin histograms of result categories.
+
+    Memory depends only on the number of groups, categories and bins, never
+    on the number of records. Aggregates built with the same categories and
+    bins (e.g. in different processes) combine with ``merge``.
+    """
+
+    def __init__(self, categories: tuple, bins: int = 50, max_value: float = 50.0):
+        self.categories = tuple(categories)
+        self.bins = bins
+        self.max_value = max_value
+        self._index = {category: j for j, category in enumerate(self.categories)}
+        self.groups: dict[str, dict] = {}
+
+    def _group(self, group: str) -> dict:
+        stats = self.groups.get(group)
+        if stats is None:
+            k = len(self.categories)
+            stats = self.groups[group] = {
+                "count": 0,
+                "sum": np.zeros(k),
+                "sum_squares": np.zeros(k),
+                "histogram": np.zeros((k, self.bins), dtype=np.int64)
+            }
+        return stats
+
+    def _bin(self, values: np.ndarray) -> np.ndarray:
+        # Values outside [0, max_value) are counted in the first/last bin
+        return np.clip((values / self.max_value * self.bins).astype(np.int64), 0, self.bins - 1)
+
+    def add_many(self, groups: list, emissions: dict[str, np.ndarray]):
+        """Add a chunk of results: one group key per record and one array per category."""
+        if not len(groups):
+            return
+        values = np.column_stack([np.asarray(emissions[category], dtype=np.float64) for category in self.categories])
+        codes, keys = pd.factorize(pd.Series(groups, dtype=object).fillna("Bilinmiyor"))
+        n_groups, k = len(keys), len(self.categories)
+
+        counts = np.bincount(codes, minlength=n_groups)
+        sums = np.zeros((n_groups, k))
+        squares = np.zeros((n_groups, k))
+        np.add.at(sums, codes, values)
+        np.add.at(squares, codes, values ** 2)
+        # One flat bincount over (group, category, bin) for all histograms of the chunk
+        cells = (codes[:, None] * k + np.arange(k)) * self.bins + self._bin(values)
+        histograms = np.bincount(cells.ravel(), minlength=n_groups * k * self.bins).reshape(n_groups, k, self.bins)
+
+        for g, key in enumerate(keys):
+            stats = self._group(str(key))
+            stats["count"] += int(counts[g])
+            stats["sum"] += sums[g]
+            stats["sum_squares"] += squares[g]
+            stats["histogram"] += histograms[g]
+
+    def add(self, group: str, emissions: dict):
+        """Add a single result, e.g. an ``analyze_individual_emissions()["emissions"]`` dict."""
+        self.add_many([group], {category: [emissions[category]] for category in self.categories})
+
+    def merge(self, other: "PopulationAggregate"):
+        if other.categories != self.categories or other.bins != self.bins or other.max_value != self.max_value:
+            raise ValueError("Farklı kategori veya kutu ayarlarıyla oluşturulmuş toplamlar birleştirilemez")
+        for group, stats in other.groups.items():
+            mine = self._group(group)
+            for key in mine:
+                mine[key] = mine[key] + stats[key]
+
+    def count(self, group: Optional[str] = None) -> int:
+        if group is not None:
+            return self.groups[group]["count"] if group in self.groups else 0
+        return sum(stats["count"] for stats in self.groups.values())
+
+    def mean(self, group: str, category: str = "toplam") -> float:
+        stats = self.groups[group]
+        return float(stats["sum"][self._index[category]] / stats["count"]) if stats["count"] else 0.0
+
+    def std(self, group: str, category: str = "toplam") -> float:
+        stats = self.groups[group]
+        if not stats["count"]:
+            return 0.0
+        j = self._index[category]
+        mean = stats["sum"][j] / stats["count"]
+        return float(np.sqrt(max(stats["sum_squares"][j] / stats["count"] - mean ** 2, 0.0)))
+
+    def shares(self, group: str, exclude: tuple = ("toplam",)) -> dict[str, float]:
+        """Return each category's share of the group's emissions (excluding ``exclude``)."""
+        stats = self.groups[group]
+        parts = {category: stats["sum"][j] for j, category in enumerate(self.categories) if category not in exclude}
+        total = sum(parts.values())
+        return {category: float(value / total) if total else 0.0 for category, value in parts.items()}
+
+    def histogram(self, group: str, category: str = "toplam") -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(counts, bin edges)`` of one category of a group."""
+        edges = np.linspace(0, self.max_value, self.bins + 1)
+        return self.groups[group]["histogram"][self._index[category]].copy(), edges
+
+    def to_comparison_frame(self, category: str = "toplam", min_count: int = 1) -> pd.DataFrame:
+        """Return group means as the ``Konum``/``CO2`` frame used by the comparison charts."""
+        groups = sorted(group for group, stats in self.groups.items() if stats["count"] >= min_count)
+        return pd.DataFrame({"Konum": groups, "CO2": [self.mean(group, category) for group in groups]})
+
+    def to_dict(self) -> dict:
+        return {
+            "categories": list(self.categories),
+            "bins": self.bins,
+            "max_value": self.max_value,
+            "groups": {group: {key: value if key == "count" else value.tolist() for key, value in stats.items()}
+                       for group, stats in self.groups.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PopulationAggregate":
+        aggregate = cls(tuple(data["categories"]), data["bins"], data["max_value"])
+        for group, stats in data["groups"].items():
+            aggregate.groups[group] = {
+                "count": stats["count"],
+                "sum": np.array(stats["sum"], dtype=np.float64),
+                "sum_squares": np.array(stats["sum_squares"], dtype=np.float64),
+                "histogram": np.array(stats["histogram"], dtype=np.int64)
+            }
+        return aggregate
+
+
+def save_aggregates(aggregates: dict[str, PopulationAggregate], path: str):
+    """Write aggregates keyed by calculator type (``individual``/``business``) to a JSON file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({name: aggregate.to_dict() for name, aggregate in aggregates.items()}, f, ensure_ascii=False)
+
+
+def load_aggregates(path: str) -> dict[str, PopulationAggregate]:
+    with open(path, encoding='utf-8') as f:
+        return {name: PopulationAggregate.from_dict(data) for name, data in json.load(f).items()}
+
+
+def default_aggregates(bins: int = 50) -> dict[str, PopulationAggregate]:
+    """Aggregates for ``son.py batch``: individual categories by city, business categories by sector."""
+    from batch import BUSINESS_CATEGORIES, INDIVIDUAL_CATEGORIES
+
+    return {
+        "individual": PopulationAggregate(INDIVIDUAL_CATEGORIES + ("toplam",), bins, max_value=50.0),
+        "business": PopulationAggregate(BUSINESS_CATEGORIES + ("toplam",), bins, max_value=10000.0)
+    }
@@ -0,0 +1,239 @@
+"""Vectorized (column-wise) versions of the calculator formulas for many entities at once."""
+from dataclasses import dataclass
+
+import numpy as np
+
+from son import BUSINESS_SCOPES
+
+KM_PER_MILE = 1.60934
+
+# Business categories in the order of calculate_business_emissions
+BUSINESS_CATEGORIES = ("bina", "elektrik", "dogalgaz", "araclar", "hava_yolculugu", "calisanlar", "veri_merkezi",
+                       "tedarik_zinciri")
+
+# One-hot map of the business categories onto Scope 1/2/3
+SCOPE_MATRIX = np.array([[BUSINESS_SCOPES[category] == scope for scope in (1, 2, 3)]
+                         for category in BUSINESS_CATEGORIES], dtype=np.float64)
+
+# Individual categories in the order of analyze_individual_emissions
+INDIVIDUAL_CATEGORIES = ("ev_enerjisi", "ulasim", "gida", "harcama", "kamu_hizmetleri")
+
+
+@dataclass
+class BusinessArrays:
+    """A batch of businesses as activity × factor matrices.
+
+    Every category emission is ``activity[:, j] * factor[:, j]`` (tonnes CO2e),
+    and the total is the category sum times ``sector_multiplier * (1 - renewable_share)``.
+    Activities are in input units (sq ft, kWh, miles, flight hours or passenger-km,
+    employees, kWh, spend); electricity, vehicle, flight and supply-chain factors
+    are effective per-entity factors that include the green tariff, hourly grid
+    profile, fleet mix, route/cabin mix and supplier mix.
+    """
+    activity: np.ndarray
+    factor: np.ndarray
+    sector_multiplier: np.ndarray
+    renewable_share: np.ndarray
+    sectors: np.ndarray
+    num_employees: np.ndarray
+    green: np.ndarray  # green electricity tariff
+    hourly_electricity: np.ndarray  # electricity scored against an hourly grid profile
+    grid_factor: np.ndarray  # electricity tonnes per kWh before the green tariff
+    route_flights: np.ndarray  # air travel scored from travel_legs instead of hours
+    vehicle_miles: np.ndarray  # (n, car types) yearly mileage per car type
+    car_types: tuple
+
+    def __len__(self):
+        return len(self.sector_multiplier)
+
+
+def business_arrays(businesses: list, calculator) -> BusinessArrays:
+    """Extract the activity and factor columns of ``businesses`` under the calculator's factors."""
+    n = len(businesses)
+    activity = np.zeros((n, len(BUSINESS_CATEGORIES)))
+    factor = np.zeros((n, len(BUSINESS_CATEGORIES)))
+
+    activity[:, 0] = [b.office_space_sqft for b in businesses]
+    activity[:, 2] = [b.gas_kwh for b in businesses]
+    activity[:, 4] = [b.air_travel_hours for b in businesses]
+    activity[:, 5] = [b.num_employees for b in businesses]
+    activity[:, 6] = [b.data_center_usage for b in businesses]
+    factor[:, 0] = calculator.OFFICE_SPACE_CO2_FACTOR
+    factor[:, 2] = calculator.GAS_CO2_FACTOR / 1000
+    factor[:, 4] = calculator.FLIGHT_CO2_PER_HOUR
+    factor[:, 5] = calculator.EMPLOYEE_CO2_FACTOR
+    factor[:, 6] = calculator.DATA_CENTER_CO2_FACTOR
+
+    green = np.array([b.electricity_green for b in businesses], dtype=bool)
+    green_adjustment = np.where(green, 1 - calculator.GREEN_ELECTRICITY_REDUCTION, 1.0)
+    activity[:, 1] = [b.electricity_kwh for b in businesses]
+    factor[:, 1] = calculator.ELECTRICITY_CO2_FACTOR / 1000
+    hourly = np.zeros(n, dtype=bool)
+    if calculator.grid_intensity is not None:
+        for i, b in enumerate(businesses):
+            if b.electricity_profile is not None:
+                hourly[i] = True
+                profile = np.asarray(b.electricity_profile, dtype=np.float64)
+                emissions = calculator.grid_intensity.electricity_emissions(profile, b.grid_region, b.grid_year)
+                activity[i, 1] = profile.sum()
+                factor[i, 1] = emissions / 1000 / activity[i, 1] if activity[i, 1] else 0.0
+    grid_factor = factor[:, 1].copy()
+    factor[:, 1] *= green_adjustment
+
+    # Vehicles: miles per car type; the category uses total miles and the fleet's tonnes per mile
+    car_types = tuple(calculator.CAR_MPG.keys())
+    type_index = {car_type: j for j, car_type in enumerate(car_types)}
+    vehicle_miles = np.zeros((n, len(car_types)))
+    for i, b in enumerate(businesses):
+        for vehicle in b.company_vehicles.values():
+            vehicle_miles[i, type_index[vehicle["type"]]] += vehicle["mileage"]
+    mpg = np.array([calculator.CAR_MPG[car_type] for car_type in car_types], dtype=np.float64)
+    activity[:, 3] = vehicle_miles.sum(axis=1)
+    np.divide(vehicle_miles @ (KM_PER_MILE / mpg * calculator.CAR_CO2_FACTOR / 1000), activity[:, 3],
+              out=factor[:, 3], where=activity[:, 3] > 0)
+
+    # Flight legs of all businesses are scored together and summed per business
+    has_legs = np.zeros(n, dtype=bool)
+    if calculator.flights is not None:
+        owners = [i for i, b in enumerate(businesses) if b.travel_legs for _ in b.travel_legs]
+        if owners:
+            tonnes, passenger_km = calculator.flights.score_legs(
+                [leg for b in businesses if b.travel_legs for leg in b.travel_legs])
+            has_legs[owners] = True
+            activity[has_legs, 4] = np.bincount(owners, weights=passenger_km, minlength=n)[has_legs]
+            tonnes = np.bincount(owners, weights=tonnes, minlength=n)[has_legs]
+            factor[has_legs, 4] = np.divide(tonnes, activity[has_legs, 4], out=np.zeros(len(tonnes)),
+                                            where=activity[has_legs, 4] > 0)
+
+    # Supply chain: total procurement spend and its tonnes per currency unit, from one sparse product
+    spends = [b.procurement_spend for b in businesses]
+    activity[:, 7] = [sum(spend.values()) if spend else 0.0 for spend in spends]
+    if calculator.supply_chain is not None:
+        supply_chain_emissions = calculator.supply_chain.emissions_batch(spends)
+        np.divide(supply_chain_emissions, activity[:, 7], out=factor[:, 7], where=activity[:, 7] > 0)
+
+    sectors = np.array([b.sector for b in businesses], dtype=object)
+    return BusinessArrays(
+        activity=activity,
+        factor=factor,
+        sector_multiplier=np.array([calculator.SECTOR_MULTIPLIERS[sector] for sector in sectors], dtype=np.float64),
+        renewable_share=np.array([b.renewable_energy_percent for b in businesses], dtype=np.float64) / 100,
+        sectors=sectors,
+        num_employees=activity[:, 5].copy(),
+        green=green,
+        hourly_electricity=hourly,
+        grid_factor=grid_factor,
+        route_flights=has_legs,
+        vehicle_miles=vehicle_miles,
+        car_types=car_types
+    )
+
+
+def business_emissions_batch(arrays: BusinessArrays, scopes: bool = False) -> dict[str, np.ndarray]:
+    """Vectorized ``calculate_business_emissions``: one array per category plus ``toplam``.
+
+    With ``scopes``, ``kapsam_1``..``kapsam_3`` are added from the same category
+    matrix, with the adjustments allocated as in ``son.allocate_scopes``.
+    """
+    category_emissions = arrays.activity * arrays.factor
+    result = {category: category_emissions[:, j] for j, category in enumerate(BUSINESS_CATEGORIES)}
+    adjustment = arrays.sector_multiplier * (1 - arrays.renewable_share)
+    result["toplam"] = category_emissions.sum(axis=1) * adjustment
+    if scopes:
+        scope_totals = (category_emissions @ SCOPE_MATRIX) * adjustment[:, None]
+        for j in range(SCOPE_MATRIX.shape[1]):
+            result[f"kapsam_{j + 1}"] = scope_totals[:, j]
+    return result
+
+
+@dataclass
+class IndividualArrays:
+    """A batch of household/personal inputs as columns."""
+    members: np.ndarray
+    electricity_kwh: np.ndarray
+    electricity_green: np.ndarray
+    gas_kwh: np.ndarray
+    car_miles: np.ndarray  # (n, car types) yearly mileage per car type
+    car_types: tuple
+    bus_miles: np.ndarray
+    train_miles: np.ndarray
+    flight_hours: np.ndarray
+    food_modifier: np.ndarray  # product of the four food modifiers
+    food_modifiers: np.ndarray  # (n, food categories) modifier of each chosen label
+    food_categories: tuple
+    spending: np.ndarray
+
+    def __len__(self):
+        return len(self.members)
+
+
+def individual_arrays(pairs: list, calculator) -> IndividualArrays:
+    """Extract the columns of ``(household, personal)`` pairs under the calculator's factors."""
+    households = [household for household, _ in pairs]
+    personals = [personal for _, personal in pairs]
+    car_types = tuple(calculator.CAR_MPG.keys())
+    type_index = {car_type: j for j, car_type in enumerate(car_types)}
+
+    car_miles = np.zeros((len(pairs), len(car_types)))
+    for i, household in enumerate(households):
+        for car in household.car_mileages.values():
+            car_miles[i, type_index[car["type"]]] += car["mileage"]
+
+    food_categories = tuple(calculator.FOOD_MODIFIERS.keys())
+    food_modifiers = np.array([[calculator.FOOD_MODIFIERS[category][getattr(personal, category)]
+                                for category in food_categories] for personal in personals],
+                              dtype=np.float64).reshape(len(pairs), len(food_categories))
+
+    return IndividualArrays(
+        members=np.array([h.members for h in households], dtype=np.float64),
+        electricity_kwh=np.array([h.electricity_kwh for h in households], dtype=np.float64),
+        electricity_green=np.array([h.electricity_green for h in households], dtype=bool),
+        gas_kwh=np.array([h.gas_kwh for h in households], dtype=np.float64),
+        car_miles=car_miles,
+        car_types=car_types,
+        bus_miles=np.array([p.bus_miles for p in personals], dtype=np.float64),
+        train_miles=np.array([p.train_miles for p in personals], dtype=np.float64),
+        flight_hours=np.array([p.flight_hours for p in personals], dtype=np.float64),
+        food_modifier=food_modifiers.prod(axis=1),
+        food_modifiers=food_modifiers,
+        food_categories=food_categories,
+        spending=np.array([calculator.SPENDING_EMISSIONS[p.spending] for p in personals], dtype=np.float64)
+    )
+
+
+def individual_analysis_batch(arrays: IndividualArrays, calculator) -> dict[str, np.ndarray]:
+    """Vectorized ``analyze_individual_emissions`` category emissions (tonnes per person)."""
+    green_adjustment = np.where(arrays.electricity_green, 1 - calculator.GREEN_ELECTRICITY_REDUCTION, 1.0)
+    household_energy = (arrays.electricity_kwh * calculator.ELECTRICITY_CO2_FACTOR * green_adjustment +
+                        arrays.gas_kwh * calculator.GAS_CO2_FACTOR) / 1000 / arrays.members
+
+    # Like analyze_individual_emissions, car mileage is used without the km conversion
+    mpg = np.array([calculator.CAR_MPG[car_type] for car_type in arrays.car_types], dtype=np.float64)
+    car = (arrays.car_miles / mpg).sum(axis=1) * calculator.CAR_CO2_FACTOR / 1000 / arrays.members
+    transport = (car + arrays.bus_miles * calculator.BUS_CO2_FACTOR / 1000 +
+                 arrays.train_miles * calculator.TRAIN_CO2_FACTOR / 1000 +
+                 arrays.flight_hours * calculator.FLIGHT_CO2_PER_HOUR)
+
+    return {
+        "ev_enerjisi": household_energy,
+        "ulasim": transport,
+        "gida": calculator.FOOD_BASE_EMISSIONS * arrays.food_modifier,
+        "harcama": arrays.spending.copy(),
+        "kamu_hizmetleri": np.full(len(arrays), calculator.PUBLIC_SERVICES_EMISSIONS)
+    }
+
+
+def total_emissions_batch(arrays: IndividualArrays, calculator) -> np.ndarray:
+    """Vectorized ``calculate_total_emissions`` (household share plus personal emissions)."""
+    green_adjustment = np.where(arrays.electricity_green, 1 - calculator.GREEN_ELECTRICITY_REDUCTION, 1.0)
+    mpg = np.array([calculator.CAR_MPG[car_type] for car_type in arrays.car_types], dtype=np.float64)
+    car_kg = (arrays.car_miles * KM_PER_MILE / mpg).sum(axis=1) * calculator.CAR_CO2_FACTOR
+    household = (arrays.electricity_kwh * calculator.ELECTRICITY_CO2_FACTOR * green_adjustment +
+                 arrays.gas_kwh * calculator.GAS_CO2_FACTOR + car_kg) / 1000 / arrays.members
+
+    personal = (calculator.FOOD_BASE_EMISSIONS * arrays.food_modifier +
+                arrays.bus_miles * calculator.BUS_CO2_FACTOR / 1000 +
+                arrays.train_miles * calculator.TRAIN_CO2_FACTOR / 1000 +
+                arrays.flight_hours * calculator.FLIGHT_CO2_PER_HOUR +
+                arrays.spending + calculator.PUBLIC_SERVICES_EMISSIONS)
+    return household + personal
@@ -0,0 +1,224 @@
+"""Parallel rendering of per-respondent PDF/PNG reports."""
+import argparse
+import hashlib
+import io
+import itertools
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from matplotlib.figure import Figure
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak memory is then reported as 0
+    resource = None
+
+from shared_tables import SharedTables, init_worker, worker_tables
+from son import load_records
+from templates import DEFAULT_LANGUAGE, LANGUAGES, get_catalog
+
+
+class ReportTemplate:
+    """A pre-built A4 figure whose artists are reused for every report.
+
+    Only the data changes between reports: the text and title artists get new
+    strings, comparison bars are resized in place when the count matches, and
+    just the pie is redrawn. Businesses get no comparison chart, since the
+    city/country values are per-capita footprints.
+    """
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE):
+        self.catalog = get_catalog(language)
+        self.figure = Figure(figsize=(8.27, 11.69))
+        grid = self.figure.add_gridspec(3, 1, height_ratios=[1, 1.3, 1.3], hspace=0.4)
+        self.title = self.figure.suptitle("", fontsize=16)
+
+        text_ax = self.figure.add_subplot(grid[0])
+        text_ax.axis('off')
+        self.text = text_ax.text(0, 1, "", va='top', family='monospace', fontsize=10)
+
+        self.pie_ax = self.figure.add_subplot(grid[1])
+        self.bar_ax = self.figure.add_subplot(grid[2])
+        self.bar_ax.set_ylabel(self.catalog("bar_ylabel"))
+        self._bars = None
+
+    def render(self, report: dict, comparison_df, fmt: str) -> bytes:
+        emissions = {category: value for category, value in report["emissions"].items() if category != "toplam"}
+        total = report["total"]
+        catalog = self.catalog
+
+        self.title.set_text(catalog("report_heading", id=report['id']))
+        lines = [catalog("total", total=total), "", catalog("report_breakdown")]
+        # Shares of the category sum, as in the pie (the total may include adjustments or unit conversions)
+        category_total = sum(emissions.values())
+        for category, value in emissions.items():
+            share = value / category_total * 100 if category_total else 0
+            lines.append(catalog("report_share", label=catalog.label(category), value=value, share=share))
+        self.text.set_text("\n".join(lines))
+
+        self.pie_ax.clear()
+        positive = {category: value for category, value in emissions.items() if value > 0}
+        if positive:
+            self.pie_ax.pie(list(positive.values()), labels=[catalog.label(category) for category in positive],
+                            autopct='%1.1f%%', startangle=140)
+        self.pie_ax.set_title(catalog("pie_title"))
+        self.pie_ax.axis('equal')
+
+        if comparison_df is not None and report.get("type", "individual") == "individual":
+            self._draw_comparison(comparison_df['Konum'].tolist() + [catalog("you")],
+                                  comparison_df['CO2'].tolist() + [total])
+        elif self._bars is not None or self.bar_ax.axison:
+            self.bar_ax.clear()
+            self.bar_ax.set_axis_off()
+            self._bars = None
+
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format=fmt)
+        return buffer.getvalue()
+
+    def _draw_comparison(self, locations: list, values: list):
+        if self._bars is None or len(self._bars) != len(values):
+            self.bar_ax.clear()
+            self.bar_ax.set_axis_on()
+            self.bar_ax.set_title(self.catalog("bar_title"))
+            self.bar_ax.set_ylabel(self.catalog("bar_ylabel"))
+            self._bars = self.bar_ax.bar(range(len(values)), values, color='blue')
+            self._bars[-1].set_color('red')
+            self.bar_ax.set_xticks(range(len(values)))
+        else:
+            for bar, value in zip(self._bars, values):
+                bar.set_height(value)
+            self.bar_ax.relim()
+            self.bar_ax.autoscale_view()
+        self.bar_ax.set_xticklabels(locations, rotation=45, ha='right', fontsize=8)
+
+
+# Per-worker state, created once by _init_worker
+_template = None
+_calculator = None
+_output_dir = None
+_fmt = None
+
+
+def _init_worker(tables: str, output_dir: Optional[str], fmt: str, language: str = DEFAULT_LANGUAGE):
+    global _template, _calculator, _output_dir, _fmt
+    init_worker(tables)
+    _template = ReportTemplate(language)
+    _calculator = worker_tables().calculator()
+    _output_dir = output_dir
+    _fmt = fmt
+
+
+def _peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else 0
+
+
+def report_filename(record_id, fmt: str) -> str:
+    """File name of a record's report.
+
+    Characters other than ``[A-Za-z0-9_-]`` in the id become ``_``; a short hash
+    of the id keeps ids that differ only in those characters apart.
+    """
+    text = str(record_id)
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+    return f"rapor_{re.sub(r'[^A-Za-z0-9_-]', '_', text)}_{digest}.{fmt}"
+
+
+def _render_one(report: dict):
+    comparison_df = None
+    if report.get("type", "individual") == "individual":
+        comparison_df = _calculator.load_comparison_data(report["total"])
+    data = _template.render(report, comparison_df, _fmt)
+    filename = report_filename(report['id'], _fmt)
+    peak_kb = _peak_rss_kb()
+    if _output_dir is not None:
+        with open(os.path.join(_output_dir, filename), 'wb') as f:
+            f.write(data)
+        return filename, len(data), None, os.getpid(), peak_kb
+    return filename, len(data), data, os.getpid(), peak_kb
+
+
+def render_reports(reports: Iterable[dict], output: str, fmt: str = "pdf",
+                   workers: Optional[int] = None, chunksize: int = 32, language: str = DEFAULT_LANGUAGE) -> dict:
+    """Render one report per ``{"id", "type", "total", "emissions"}`` dict across a process pool.
+
+    ``output`` is a directory, or a ``.zip`` archive that the parent process
+    fills with the bytes returned by the workers. Reports are submitted a
+    bounded window at a time, so a large input is never queued at once.
+    Returns throughput and peak worker memory statistics.
+    """
+    to_archive = output.endswith(".zip")
+    output_dir = None
+    if not to_archive:
+        os.makedirs(output, exist_ok=True)
+        output_dir = output
+
+    start = time.perf_counter()
+    count = 0
+    total_bytes = 0
+    peaks = {}
+    archive = zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) if to_archive else None
+    # Factor packs and comparison records are published once and mapped read-only by every worker
+    tables = SharedTables.publish()
+    reports = iter(reports)
+    window = 4 * chunksize * (workers or os.cpu_count() or 1)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(tables.name, output_dir, fmt, language)) as executor:
+            for batch in iter(lambda: list(itertools.islice(reports, window)), []):
+                for filename, size, data, pid, peak_kb in executor.map(_render_one, batch, chunksize=chunksize):
+                    if archive is not None:
+                        archive.writestr(filename, data)
+                    count += 1
+                    total_bytes += size
+                    peaks[pid] = max(peaks.get(pid, 0), peak_kb)
+    finally:
+        tables.close()
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "reports": count,
+        "seconds": elapsed,
+        "reports_per_second": count / elapsed if elapsed else 0.0,
+        "bytes": total_bytes,
+        "workers": len(peaks),
+        "peak_worker_rss_mb": max(peaks.values(), default=0) / 1024,
+        "parent_rss_mb": _peak_rss_kb() / 1024
+    }
+
+
+def iter_batch_results(path: str):
+    """Yield the successful results of a ``son.py batch`` output file.
+
+    Businesses are charted with their allocated categories, which add up to the total.
+    """
+    for line_number, record in load_records(path):
+        if isinstance(record, dict) and "emissions" in record:
+            yield {"id": record.get("id", line_number), "type": record.get("type", "individual"),
+                   "total": record["total"], "emissions": record.get("allocated_emissions", record["emissions"])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu hesaplama sonuçlarından kişisel raporlar üretir")
+    parser.add_argument("input", help="'son.py batch' çıktısı (JSONL)")
+    parser.add_argument("--output", default="raporlar", help="Çıktı klasörü veya .zip arşivi")
+    parser.add_argument("--format", default="pdf", choices=["pdf", "png"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--lang", default=DEFAULT_LANGUAGE, choices=LANGUAGES, help="Rapor dili")
+    args = parser.parse_args()
+
+    stats = render_reports(iter_batch_results(args.input), args.output, args.format, args.workers,
+                           language=args.lang)
+    print(f"{stats['reports']} rapor {stats['seconds']:.1f} saniyede oluşturuldu "
+          f"({stats['reports_per_second']:.1f} rapor/sn, {stats['bytes'] / 1e6:.1f} MB)")
+    print(f"İşçi başına en yüksek bellek: {stats['peak_worker_rss_mb']:.0f} MB ({stats['workers']} işçi)")
+
+
+if __name__ == "__main__":
+    main()
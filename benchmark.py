@@ -0,0 +1,193 @@
+"""Per-sector streaming percentile benchmarks of business emissions."""
+import json
+import math
+import os
+from typing import Optional
+
+# Categories sketched for every sector, including the per-employee total
+BENCHMARK_CATEGORIES = ("bina", "elektrik", "dogalgaz", "araclar", "hava_yolculugu",
+                        "calisanlar", "veri_merkezi", "tedarik_zinciri", "toplam", "calisan_basina")
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with a fixed relative accuracy (DDSketch style).
+
+    Positive values fall into logarithmic buckets, so a quantile is off by at
+    most ``relative_accuracy`` of its value. Zero and negative values share one
+    bucket. Sketches with the same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy 0 ile 1 arasında olmalıdır")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self._cumulative = None  # Prefix sums rebuilt lazily after updates
+        self._min_key = 0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        """Add ``value`` to the sketch ``count`` times."""
+        if value > 0:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+        self._cumulative = None
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch with the same accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Farklı hassasiyetteki taslaklar birleştirilemez")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self._cumulative = None
+
+    def _build_cumulative(self):
+        cumulative = []
+        if self.bins:
+            self._min_key = min(self.bins)
+            running = self.zero_count
+            for key in range(self._min_key, max(self.bins) + 1):
+                running += self.bins.get(key, 0)
+                cumulative.append(running)
+        self._cumulative = cumulative
+
+    def rank(self, value: float) -> float:
+        """Return the fraction of added values that are less than or equal to ``value``."""
+        if self.count == 0:
+            return 0.0
+        if self._cumulative is None:
+            self._build_cumulative()
+        if value <= 0 or not self._cumulative:
+            at_or_below = self.zero_count if value >= 0 else 0
+        else:
+            index = self._key(value) - self._min_key
+            if index < 0:
+                at_or_below = self.zero_count
+            else:
+                at_or_below = self._cumulative[min(index, len(self._cumulative) - 1)]
+        return at_or_below / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the approximate value at quantile ``q`` (0-1)."""
+        if self.count == 0:
+            return None
+        if self._cumulative is None:
+            self._build_cumulative()
+        target = q * (self.count - 1)
+        if target < self.zero_count:
+            return 0.0
+        for index, running in enumerate(self._cumulative):
+            if running > target:
+                return self._value(self._min_key + index)
+        return self._value(self._min_key + len(self._cumulative) - 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bins": {str(key): count for key, count in self.bins.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
+
+
+class SectorBenchmark:
+    """Quantile sketches of every emission category, grouped by sector."""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.sketches: dict[tuple[str, str], QuantileSketch] = {}
+        self.keys: set[str] = set()  # Keys of companies added so far, so a re-run doesn't count them twice
+
+    def _sketch(self, sector: str, category: str) -> QuantileSketch:
+        sketch = self.sketches.get((sector, category))
+        if sketch is None:
+            sketch = self.sketches[(sector, category)] = QuantileSketch(self.relative_accuracy)
+        return sketch
+
+    def add(self, sector: str, emissions: dict, num_employees: int, key: Optional[str] = None) -> bool:
+        """Record one scored company from a ``calculate_business_emissions`` result.
+
+        A company with a ``key`` (e.g. its record id) is added once; returns whether it was added.
+        """
+        if key is not None:
+            if key in self.keys:
+                return False
+            self.keys.add(key)
+        for category in BENCHMARK_CATEGORIES:
+            if category in emissions:
+                self._sketch(sector, category).add(emissions[category])
+        if num_employees > 0 and "toplam" in emissions:
+            self._sketch(sector, "calisan_basina").add(emissions["toplam"] / num_employees)
+        return True
+
+    def percentile(self, sector: str, category: str, value: float) -> Optional[float]:
+        """Return the % of companies in the sector emitting at most ``value``."""
+        sketch = self.sketches.get((sector, category))
+        if sketch is None or sketch.count == 0:
+            return None
+        return sketch.rank(value) * 100
+
+    def quantile(self, sector: str, category: str, q: float) -> Optional[float]:
+        """Return the sector's value at quantile ``q`` (0-1) for a category."""
+        sketch = self.sketches.get((sector, category))
+        return sketch.quantile(q) if sketch is not None else None
+
+    def company_count(self, sector: str) -> int:
+        sketch = self.sketches.get((sector, "toplam"))
+        return sketch.count if sketch is not None else 0
+
+    def merge(self, other: "SectorBenchmark"):
+        """Fold the sketches of another benchmark (e.g. from a worker process) into this one."""
+        for (sector, category), sketch in other.sketches.items():
+            self._sketch(sector, category).merge(sketch)
+        self.keys |= other.keys
+
+    def save(self, path: str):
+        data = {
+            "relative_accuracy": self.relative_accuracy,
+            "sketches": [
+                {"sector": sector, "category": category, "sketch": sketch.to_dict()}
+                for (sector, category), sketch in self.sketches.items()
+            ],
+            "keys": sorted(self.keys)
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "SectorBenchmark":
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        benchmark = cls(data["relative_accuracy"])
+        for entry in data["sketches"]:
+            benchmark.sketches[(entry["sector"], entry["category"])] = QuantileSketch.from_dict(entry["sketch"])
+        benchmark.keys = set(data.get("keys", []))
+        return benchmark
+
+
+def open_benchmark(path: str, relative_accuracy: float = 0.01) -> SectorBenchmark:
+    """Load the benchmark saved at ``path``, or start an empty one if the file does not exist yet."""
+    if os.path.exists(path):
+        return SectorBenchmark.load(path)
+    return SectorBenchmark(relative_accuracy)
@@ -0,0 +1,153 @@
+"""Columnar, memory-mapped store of per-capita comparison data."""
+import argparse
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+STORE_PATH = "comparison.npy"
+
+KIND_CITY = 0
+KIND_COUNTRY = 1
+
+
+def record_dtype(name_length: int) -> np.dtype:
+    """Record layout whose ``konum`` field holds names of up to ``name_length`` characters."""
+    return np.dtype([("konum", f"U{max(name_length, 1)}"), ("tur", "i1"), ("yil", "i2"), ("co2", "f4")])
+
+
+def _read_csv(path: str, kind: int) -> pd.DataFrame:
+    """Read ``Konum,CO2[,Yıl]`` rows; a header line, if any, is dropped as non-numeric."""
+    df = pd.read_csv(path, header=None, encoding='utf-8-sig', dtype=str)
+    frame = pd.DataFrame({
+        "konum": df.iloc[:, 0].astype(str).str.strip(),
+        "co2": pd.to_numeric(df.iloc[:, 1], errors='coerce'),
+        "yil": pd.to_numeric(df.iloc[:, 2], errors='coerce') if df.shape[1] > 2 else 0
+    })
+    frame = frame.dropna()
+    frame["tur"] = kind
+    return frame
+
+
+def build_records(cities_csv: str = "Cities.csv", countries_csv: str = "Countries.csv") -> tuple[np.ndarray, list]:
+    """Return the sorted comparison records and their ``[tur, yil, start, stop]`` groups."""
+    frame = pd.concat([_read_csv(cities_csv, KIND_CITY), _read_csv(countries_csv, KIND_COUNTRY)])
+    frame = frame.sort_values(["tur", "yil", "co2"], kind="stable")
+
+    # The name field is as wide as the longest name, so no location is truncated
+    records = np.empty(len(frame), dtype=record_dtype(int(frame["konum"].str.len().max()) if len(frame) else 1))
+    records["konum"] = frame["konum"].to_numpy()
+    records["tur"] = frame["tur"].to_numpy()
+    records["yil"] = frame["yil"].to_numpy()
+    records["co2"] = frame["co2"].to_numpy()
+
+    # Rows are sorted by (tur, yil), so every group is one contiguous slice
+    groups = []
+    if len(records):
+        keys = records["tur"].astype(np.int32) * 100000 + records["yil"]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        stops = np.append(starts[1:], len(records))
+        for start, stop in zip(starts, stops):
+            groups.append([int(records["tur"][start]), int(records["yil"][start]), int(start), int(stop)])
+    return records, groups
+
+
+def build_store(cities_csv: str = "Cities.csv", countries_csv: str = "Countries.csv",
+                output: str = STORE_PATH) -> str:
+    """Convert the comparison CSVs into a sorted record file plus a group index."""
+    records, groups = build_records(cities_csv, countries_csv)
+    np.save(output, records)
+    with open(_index_path(output), 'w', encoding='utf-8') as f:
+        json.dump({"groups": groups}, f)
+    return output
+
+
+def _index_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".idx.json"
+
+
+class ComparisonStore:
+    """Read-only view over a store built by ``build_store``.
+
+    Selecting a region type and year returns a slice of the memory-mapped
+    records, so no rows are copied until they are turned into a DataFrame.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.records = np.load(path, mmap_mode='r')
+        with open(_index_path(path), encoding='utf-8') as f:
+            self.groups = {(kind, year): (start, stop) for kind, year, start, stop in json.load(f)["groups"]}
+
+    @classmethod
+    def from_records(cls, records: np.ndarray, groups: list) -> "ComparisonStore":
+        """Wrap records that are already in memory (e.g. a shared-memory view) without copying."""
+        store = cls.__new__(cls)
+        store.path = None
+        store.mtime = 0.0
+        store.records = records
+        store.groups = {(kind, year): (start, stop) for kind, year, start, stop in groups}
+        return store
+
+    def groups_list(self) -> list:
+        return [[kind, year, start, stop] for (kind, year), (start, stop) in sorted(self.groups.items())]
+
+    def years(self, kind: int) -> list[int]:
+        return sorted(year for group_kind, year in self.groups if group_kind == kind)
+
+    def _range(self, kind: int, year: Optional[int]) -> tuple[int, int]:
+        if year is None:
+            years = self.years(kind)
+            if not years:
+                return 0, 0
+            year = years[-1]
+        return self.groups.get((kind, year), (0, 0))
+
+    def select(self, kind: int, year: Optional[int] = None) -> np.ndarray:
+        """Return the rows of one region type and year (latest year by default) as a view."""
+        start, stop = self._range(kind, year)
+        return self.records[start:stop]
+
+    def top_relevant(self, user_emissions: float, n: int = 20, year: Optional[int] = None) -> np.ndarray:
+        """Return the ``n`` cities and countries whose per-capita CO2 is closest to the user's."""
+        indices = np.concatenate([np.arange(*self._range(kind, year)) for kind in (KIND_CITY, KIND_COUNTRY)])
+        if len(indices) > n:
+            distance = np.abs(self.records["co2"][indices] - user_emissions)
+            indices = np.sort(indices[np.argpartition(distance, n - 1)[:n]])
+        return self.records[indices]
+
+
+def to_frame(records: np.ndarray) -> pd.DataFrame:
+    """Turn store rows into the ``Konum``/``CO2`` frame used by the comparison charts."""
+    return pd.DataFrame({"Konum": records["konum"], "CO2": records["co2"].astype(np.float64)})
+
+
+_stores = {}
+
+
+def open_store(path: str = STORE_PATH) -> Optional[ComparisonStore]:
+    """Return a cached store for ``path``, reopened if the file changed; None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    store = _stores.get(path)
+    if store is None or store.mtime != os.path.getmtime(path):
+        store = _stores[path] = ComparisonStore(path)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Karşılaştırma CSV dosyalarını sütunlu biçime dönüştürür")
+    parser.add_argument("--cities", default="Cities.csv")
+    parser.add_argument("--countries", default="Countries.csv")
+    parser.add_argument("--output", default=STORE_PATH)
+    args = parser.parse_args()
+
+    output = build_store(args.cities, args.countries, args.output)
+    print(f"Karşılaştırma verisi şuraya yazıldı: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Country-specific emission factor packs loaded from JSON data files."""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional
+
+FACTORS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "factors")
+DEFAULT_PACK = "UK"
+
+# Scalar factors every pack must define, bound as calculator attributes
+SCALAR_FACTORS = (
+    "ELECTRICITY_CO2_FACTOR", "GREEN_ELECTRICITY_REDUCTION", "GAS_CO2_FACTOR", "CAR_CO2_FACTOR",
+    "OFFICE_SPACE_CO2_FACTOR", "EMPLOYEE_CO2_FACTOR", "DATA_CENTER_CO2_FACTOR",
+    "BUS_CO2_FACTOR", "TRAIN_CO2_FACTOR", "FLIGHT_CO2_PER_HOUR",
+    "FOOD_BASE_EMISSIONS", "PUBLIC_SERVICES_EMISSIONS"
+)
+TABLE_FACTORS = ("CAR_MPG", "SECTOR_MULTIPLIERS", "SPENDING_EMISSIONS", "INDIVIDUAL_AVERAGES")
+
+
+def _freeze(value):
+    """Turn nested dicts into read-only mappings and numbers into floats."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, bool) or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    raise ValueError(f"Desteklenmeyen katsayı değeri: {value!r}")
+
+
+@dataclass(frozen=True)
+class FactorPack:
+    """An immutable, compiled set of emission factors."""
+    code: str
+    name: str
+    version: str
+    fingerprint: str
+    factors: MappingProxyType
+    source: Optional[str] = None
+    mtime: float = 0.0
+
+
+def compile_pack(data: dict, source: Optional[str] = None, mtime: float = 0.0) -> FactorPack:
+    """Validate raw pack data and compile it into an immutable ``FactorPack``."""
+    from son import PERSONAL_CHOICES
+
+    factors = data.get("factors", {})
+    missing = [name for name in SCALAR_FACTORS + TABLE_FACTORS + ("FOOD_MODIFIERS", "AVERAGES_LABEL")
+               if name not in factors]
+    if missing:
+        raise ValueError(f"{data.get('code', source)} katsayı paketinde eksik alanlar: {missing}")
+
+    # Every label the CLI/GUI offers must have a factor, so lookups never fail mid-calculation
+    for category, modifiers in factors["FOOD_MODIFIERS"].items():
+        absent = set(PERSONAL_CHOICES[category]) - set(modifiers)
+        if absent:
+            raise ValueError(f"FOOD_MODIFIERS[{category}] için eksik seçenekler: {sorted(absent)}")
+    absent = set(PERSONAL_CHOICES["spending"]) - set(factors["SPENDING_EMISSIONS"])
+    if absent:
+        raise ValueError(f"SPENDING_EMISSIONS için eksik seçenekler: {sorted(absent)}")
+
+    canonical = json.dumps(factors, sort_keys=True, ensure_ascii=False)
+    fingerprint = hashlib.sha256(f"{data['code']}:{data.get('version', '')}:{canonical}".encode('utf-8')).hexdigest()
+    return FactorPack(
+        code=data["code"],
+        name=data.get("name", data["code"]),
+        version=str(data.get("version", "")),
+        fingerprint=fingerprint[:16],
+        factors=_freeze(factors),
+        source=source,
+        mtime=mtime
+    )
+
+
+def load_pack(path: str) -> FactorPack:
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return compile_pack(data, source=path, mtime=os.path.getmtime(path))
+
+
+class FactorRegistry:
+    """Loads every ``<CODE>.json`` pack of a directory and reloads changed files on demand.
+
+    Packs are compiled once; ``reload()`` recompiles only files whose
+    modification time changed and swaps the lookup table in one assignment,
+    so readers never see a half-updated registry.
+    """
+
+    def __init__(self, directory: str = FACTORS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._packs: dict[str, FactorPack] = {}
+        self.reload()
+
+    def reload(self) -> list[str]:
+        """Recompile new or modified packs; return the codes that changed."""
+        with self._lock:
+            packs = dict(self._packs)
+            changed = []
+            seen = set()
+            for filename in sorted(os.listdir(self.directory)):
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, filename)
+                current = next((pack for pack in packs.values() if pack.source == path), None)
+                if current is not None:
+                    seen.add(current.code)
+                    if current.mtime == os.path.getmtime(path):
+                        continue
+                pack = load_pack(path)
+                packs[pack.code] = pack
+                seen.add(pack.code)
+                changed.append(pack.code)
+            for code in set(packs) - seen:
+                del packs[code]
+                changed.append(code)
+            self._packs = packs
+            return changed
+
+    def get(self, code: str = DEFAULT_PACK) -> FactorPack:
+        try:
+            return self._packs[code]
+        except KeyError:
+            raise KeyError(f"Bilinmeyen katsayı paketi: {code} (mevcut: {', '.join(self.codes())})") from None
+
+    def codes(self) -> list[str]:
+        return sorted(self._packs)
+
+
+_registry = None
+
+
+def get_registry() -> FactorRegistry:
+    """Return the process-wide registry of the bundled factor packs."""
+    global _registry
+    if _registry is None:
+        _registry = FactorRegistry()
+    return _registry
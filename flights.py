@@ -0,0 +1,135 @@
+"""Route-based flight emissions from airport pairs, distance bands and cabin classes."""
+import argparse
+import hashlib
+import os
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+AIRPORTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "airports.csv")
+
+EARTH_RADIUS_KM = 6371.0
+DISTANCE_UPLIFT = 1.08  # Detours and holding patterns over the great-circle distance
+
+# Upper great-circle distance (km) of every band; the last band is open-ended
+DISTANCE_BANDS = (("ic_hat", 500.0), ("kisa", 3700.0), ("uzun", float("inf")))
+CABIN_CLASSES = ("ekonomi", "premium_ekonomi", "business", "birinci")
+
+# kg CO2e per passenger-km by distance band and cabin class (incl. radiative forcing)
+FLIGHT_FACTORS = {
+    "ic_hat": {"ekonomi": 0.273, "premium_ekonomi": 0.273, "business": 0.273, "birinci": 0.273},
+    "kisa": {"ekonomi": 0.183, "premium_ekonomi": 0.219, "business": 0.274, "birinci": 0.274},
+    "uzun": {"ekonomi": 0.165, "premium_ekonomi": 0.264, "business": 0.479, "birinci": 0.660}
+}
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km between points given in radians (element-wise)."""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class FlightEmissions:
+    """Scores flight legs from origin/destination IATA codes.
+
+    Airport pairs are keyed by one integer; their distances live in a dict
+    that is filled up-front for ``common_routes`` and, for every other pair,
+    by one vectorized haversine call per batch. A batch only looks up its
+    unique pairs, so millions of legs cost a few thousand dict lookups.
+    """
+
+    def __init__(self, path: str = AIRPORTS_PATH, common_routes: Optional[Iterable[tuple]] = None):
+        self.path = path
+        airports = pd.read_csv(path, encoding='utf-8', keep_default_na=False)
+        self.codes = tuple(airports["iata"])
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.latitudes = np.radians(airports["enlem"].to_numpy(dtype=np.float64))
+        self.longitudes = np.radians(airports["boylam"].to_numpy(dtype=np.float64))
+        with open(path, 'rb') as f:
+            self.fingerprint = hashlib.sha256(f.read()).hexdigest()[:16]
+
+        self.distances: dict[int, float] = {}
+        self._band_limits = np.array([limit for _, limit in DISTANCE_BANDS[:-1]])
+        self._factors = np.array([[FLIGHT_FACTORS[band][cabin] for cabin in CABIN_CLASSES]
+                                  for band, _ in DISTANCE_BANDS]) / 1000  # tonnes per passenger-km
+        if common_routes is not None:
+            origins, destinations = zip(*common_routes)
+            self.distances_km(origins, destinations)
+
+    def _airport_indices(self, codes) -> np.ndarray:
+        inverse, unique = pd.factorize(np.asarray(codes, dtype=object))  # hash-based, no string sort
+        try:
+            return np.array([self.index[code] for code in unique], dtype=np.int64)[inverse]
+        except KeyError as e:
+            raise KeyError(f"Havalimanı tablosunda bilinmeyen kod: {e.args[0]}") from None
+
+    def _pair_keys(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        # A route and its reverse share one key
+        return np.minimum(origins, destinations) * len(self.codes) + np.maximum(origins, destinations)
+
+    def distances_km(self, origins, destinations) -> np.ndarray:
+        """Return the great-circle distance of every leg, caching new pairs in the index."""
+        keys = self._pair_keys(self._airport_indices(origins), self._airport_indices(destinations))
+        inverse, unique_keys = pd.factorize(keys)
+        distances = np.array([self.distances.get(key, np.nan) for key in unique_keys.tolist()])
+
+        missing = np.isnan(distances)
+        if missing.any():
+            first, second = np.divmod(unique_keys[missing], len(self.codes))
+            computed = haversine_km(self.latitudes[first], self.longitudes[first],
+                                    self.latitudes[second], self.longitudes[second])
+            distances[missing] = computed
+            self.distances.update(zip(unique_keys[missing].tolist(), computed.tolist()))
+        return distances[inverse]
+
+    def _cabin_indices(self, cabins, count: int) -> np.ndarray:
+        if cabins is None:
+            return np.zeros(count, dtype=np.int64)
+        inverse, unique = pd.factorize(np.asarray(cabins, dtype=object))
+        lookup = {cabin: i for i, cabin in enumerate(CABIN_CLASSES)}
+        try:
+            return np.array([lookup[cabin] for cabin in unique], dtype=np.int64)[inverse]
+        except KeyError as e:
+            raise KeyError(f"Geçersiz kabin sınıfı: {e.args[0]} (geçerli: {', '.join(CABIN_CLASSES)})") from None
+
+    def score(self, origins, destinations, cabins=None, passengers=None) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(tonnes CO2e, passenger-km)`` arrays with one element per leg."""
+        distances = self.distances_km(origins, destinations)
+        bands = np.searchsorted(self._band_limits, distances, side='right')
+        passenger_km = distances * DISTANCE_UPLIFT
+        if passengers is not None:
+            passenger_km = passenger_km * np.asarray(passengers, dtype=np.float64)
+        return passenger_km * self._factors[bands, self._cabin_indices(cabins, len(distances))], passenger_km
+
+    def score_legs(self, legs: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+        """Score ``{"origin", "destination", "cabin", "count"}`` dicts; cabin and count are optional."""
+        return self.score([leg["origin"] for leg in legs], [leg["destination"] for leg in legs],
+                          [leg.get("cabin", CABIN_CLASSES[0]) for leg in legs],
+                          [leg.get("count", 1) for leg in legs])
+
+    def emissions(self, legs: list[dict]) -> float:
+        """Return the total tonnes CO2e of a list of legs."""
+        return float(self.score_legs(legs)[0].sum()) if legs else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uçuş kayıtlarından rota bazlı emisyon hesaplar")
+    parser.add_argument("ledger", help="origin,destination[,cabin][,count] sütunlu CSV dosyası")
+    parser.add_argument("--airports", default=AIRPORTS_PATH)
+    args = parser.parse_args()
+
+    flights = FlightEmissions(args.airports)
+    start = time.perf_counter()
+    ledger = pd.read_csv(args.ledger, encoding='utf-8', keep_default_na=False)
+    tonnes, passenger_km = flights.score(ledger["origin"], ledger["destination"],
+                                         ledger["cabin"] if "cabin" in ledger else None,
+                                         ledger["count"] if "count" in ledger else None)
+    elapsed = time.perf_counter() - start
+    print(f"{len(ledger)} uçuş: {tonnes.sum():.1f} ton CO2e, {passenger_km.sum():,.0f} yolcu-km "
+          f"({elapsed:.2f} saniye, {len(flights.distances)} rota)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Golden-output regression harness: a seeded synthetic corpus scored by every calculation engine."""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from batch import BUSINESS_CATEGORIES, INDIVIDUAL_CATEGORIES, business_arrays, business_emissions_batch, \
+    individual_analysis_batch, individual_arrays, total_emissions_batch
+from flights import AIRPORTS_PATH, CABIN_CLASSES, FlightEmissions
+from grid_intensity import HOURS_PER_YEAR, GridIntensityProvider
+from son import PERSONAL_CHOICES, SUPPLY_CHAIN_OPTIONS, Business, CarbonCalculator, Household, Personal
+from supply_chain import EEIO_PATH, EEIOTable
+
+GOLDEN_PATH = "golden.npz"
+GOLDEN_SEED = 20240601
+GOLDEN_SIZE = 50000  # per calculator type
+
+# Hourly electricity profiles are scored against one synthetic grid file written for the run
+GRID_REGION = "SENTETIK"
+GRID_YEAR = 2024
+PROFILE_SHAPES = 32  # distinct profiles, shared by every business that has one
+
+# Output columns of every engine; "toplam" of individuals is calculate_total_emissions (km-converted
+# car mileage), the categories are analyze_individual_emissions (miles), so both conventions are pinned
+INDIVIDUAL_COLUMNS = ("toplam",) + INDIVIDUAL_CATEGORIES
+BUSINESS_COLUMNS = BUSINESS_CATEGORIES + ("toplam",)
+
+FOOD_FIELDS = ("organic_food", "meat_dairy", "local_food", "processed_food", "composting", "food_waste")
+
+
+@dataclass
+class Corpus:
+    """Deterministic inputs: ``(Household, Personal)`` pairs and ``Business`` records."""
+    seed: int
+    pairs: list
+    businesses: list
+    fingerprint: str  # digest of the generated columns, so a changed generator is detected
+
+
+def _balanced(rng: np.random.Generator, options: list, size: int) -> np.ndarray:
+    """Indices into ``options`` that use every option equally often, in random order."""
+    return rng.permutation(np.arange(size) % len(options))
+
+
+def synthetic_grid(seed: int = GOLDEN_SEED) -> np.ndarray:
+    """Seeded hourly grid intensities (kg CO2 per kWh) with daily and seasonal cycles."""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(HOURS_PER_YEAR)
+    return (0.25 + 0.08 * np.sin(2 * np.pi * hours / 24) + 0.05 * np.cos(2 * np.pi * hours / HOURS_PER_YEAR)
+            + rng.uniform(0, 0.03, HOURS_PER_YEAR)).round(6)
+
+
+def configure(calculator: CarbonCalculator, grid_dir: Optional[str], eeio_path: Optional[str] = EEIO_PATH,
+              airports_path: Optional[str] = AIRPORTS_PATH) -> CarbonCalculator:
+    """Attach the EEIO table, airports and grid data the corpus's optional fields are scored with (None skips one)."""
+    calculator.supply_chain = EEIOTable(eeio_path) if eeio_path else None
+    calculator.flights = FlightEmissions(airports_path) if airports_path else None
+    calculator.grid_intensity = GridIntensityProvider(grid_dir) if grid_dir else None
+    return calculator
+
+
+def _options(calculator: CarbonCalculator) -> tuple:
+    """The ``configure`` arguments that rebuild ``calculator``'s tables, e.g. in a worker process."""
+    return (calculator.grid_intensity.data_dir if calculator.grid_intensity else None,
+            calculator.supply_chain.path if calculator.supply_chain else None,
+            calculator.flights.path if calculator.flights else None)
+
+
+@contextmanager
+def golden_calculator(factors: Optional[str] = None, seed: int = GOLDEN_SEED, grid_dir: Optional[str] = None):
+    """A calculator with the bundled EEIO table and airports and the synthetic grid written to ``grid_dir``.
+
+    Without ``grid_dir`` the grid file lives in a temporary directory for the duration of the block.
+    """
+    from factor_packs import get_registry
+
+    with nullcontext(grid_dir) if grid_dir else tempfile.TemporaryDirectory() as directory:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, f"{GRID_REGION}_{GRID_YEAR}.npy"), synthetic_grid(seed))
+        yield configure(CarbonCalculator(get_registry().get(factors) if factors else None), directory)
+
+
+def generate_corpus(size: int = GOLDEN_SIZE, seed: int = GOLDEN_SEED,
+                    calculator: Optional[CarbonCalculator] = None) -> Corpus:
+    """Generate ``size`` individuals and ``size`` businesses covering every choice label, car type and sector.
+
+    Businesses also get route-based flight legs, procurement spend and hourly
+    electricity profiles (on the ``GRID_REGION``/``GRID_YEAR`` grid); airports
+    and supplier sectors come from the calculator's tables, or the bundled ones.
+    """
+    calculator = calculator or CarbonCalculator()
+    rng = np.random.default_rng(seed)
+    car_types = list(calculator.CAR_MPG)
+    sectors = list(calculator.SECTOR_MULTIPLIERS)
+    airports = (calculator.flights or FlightEmissions()).codes
+    supplier_sectors = (calculator.supply_chain or EEIOTable()).sectors
+    columns = {}
+
+    def column(name: str, values: np.ndarray) -> np.ndarray:
+        columns[name] = values
+        return values
+
+    members = column("members", rng.integers(1, 7, size))
+    electricity = column("electricity", rng.uniform(500, 10000, size).round(1))
+    green = column("green", rng.random(size) < 0.3)
+    gas = column("gas", rng.uniform(0, 30000, size).round(1))
+    other_heating = column("other_heating", rng.random(size) < 0.2)
+    num_cars = column("num_cars", rng.integers(0, 4, size))
+    car_type = column("car_type", _balanced(rng, car_types, size * 3).reshape(size, 3))
+    car_miles = column("car_miles", rng.uniform(0, 20000, (size, 3)).round(0))
+    choices = {name: column(name, _balanced(rng, PERSONAL_CHOICES[name], size))
+               for name in FOOD_FIELDS + ("spending",)}
+    bus = column("bus", rng.uniform(0, 5000, size).round(0))
+    train = column("train", rng.uniform(0, 5000, size).round(0))
+    flight = column("flight", rng.uniform(0, 100, size).round(1))
+    recycles = column("recycles", rng.random((size, 2)) < 0.5)
+
+    pairs = []
+    for i in range(size):
+        household = Household(
+            members=int(members[i]), electricity_kwh=float(electricity[i]), electricity_green=bool(green[i]),
+            gas_kwh=float(gas[i]), other_heating=bool(other_heating[i]), num_cars=int(num_cars[i]),
+            car_mileages={f"araba_{k + 1}": {"type": car_types[car_type[i, k]], "mileage": float(car_miles[i, k])}
+                          for k in range(num_cars[i])})
+        personal = Personal(
+            **{name: PERSONAL_CHOICES[name][choices[name][i]] for name in FOOD_FIELDS},
+            bus_miles=float(bus[i]), train_miles=float(train[i]), flight_hours=float(flight[i]),
+            spending=PERSONAL_CHOICES["spending"][choices["spending"][i]],
+            recycles_basic=bool(recycles[i, 0]), recycles_plastic=bool(recycles[i, 1]))
+        pairs.append((household, personal))
+
+    sector = column("sector", _balanced(rng, sectors, size))
+    employees = column("employees", rng.integers(1, 5000, size))
+    office = column("office", rng.uniform(500, 100000, size).round(0))
+    business_electricity = column("business_electricity", rng.uniform(1000, 2000000, size).round(0))
+    business_green = column("business_green", rng.random(size) < 0.4)
+    business_gas = column("business_gas", rng.uniform(0, 500000, size).round(0))
+    vehicles = column("vehicles", rng.integers(0, 6, size))
+    vehicle_type = column("vehicle_type", _balanced(rng, car_types, size * 5).reshape(size, 5))
+    vehicle_miles = column("vehicle_miles", rng.uniform(0, 40000, (size, 5)).round(0))
+    air = column("air", rng.uniform(0, 2000, size).round(0))
+    recycling = column("recycling", rng.uniform(0, 100, size).round(0))
+    data_center = column("data_center", rng.uniform(0, 500, size).round(1))
+    assessment = column("assessment", _balanced(rng, SUPPLY_CHAIN_OPTIONS, size))
+    renewable = column("renewable", rng.uniform(0, 100, size).round(0))
+
+    # Optional inputs, each on part of the corpus: up to three legs and supplier sectors per business
+    num_legs = column("num_legs", np.where(rng.random(size) < 0.5, rng.integers(1, 4, size), 0))
+    leg_origin = column("leg_origin", rng.integers(0, len(airports), (size, 3)))
+    leg_offset = column("leg_offset", rng.integers(1, len(airports), (size, 3)))  # never the origin itself
+    leg_cabin = column("leg_cabin", _balanced(rng, CABIN_CLASSES, size * 3).reshape(size, 3))
+    leg_count = column("leg_count", rng.integers(1, 5, (size, 3)))
+    num_spends = column("num_spends", np.where(rng.random(size) < 0.5, rng.integers(1, 4, size), 0))
+    spend_sector = column("spend_sector", rng.permuted(np.tile(np.arange(len(supplier_sectors)), (size, 1)),
+                                                       axis=1)[:, :3])
+    spend_amount = column("spend_amount", rng.uniform(1000, 1000000, (size, 3)).round(0))
+    profiled = column("profiled", rng.random(size) < 0.02)
+    profile_shape = column("profile_shape", rng.integers(0, PROFILE_SHAPES, size))
+    hours = np.arange(HOURS_PER_YEAR)
+    daily = 1 + 0.5 * np.sin(2 * np.pi * (hours % 24 - 6) / 24)
+    profiles = column("profiles", (daily * rng.uniform(1, 200, (PROFILE_SHAPES, 1)) *
+                                   rng.uniform(0.8, 1.2, (PROFILE_SHAPES, HOURS_PER_YEAR))).round(3))
+    column("grid", synthetic_grid(seed))
+
+    businesses = [
+        Business(
+            name=f"sirket_{i}", sector=sectors[sector[i]], num_employees=int(employees[i]),
+            office_space_sqft=float(office[i]), electricity_kwh=float(business_electricity[i]),
+            electricity_green=bool(business_green[i]), gas_kwh=float(business_gas[i]),
+            company_vehicles={f"arac_{k + 1}": {"type": car_types[vehicle_type[i, k]],
+                                                "mileage": float(vehicle_miles[i, k])} for k in range(vehicles[i])},
+            air_travel_hours=float(air[i]), waste_recycling_rate=float(recycling[i]),
+            data_center_usage=float(data_center[i]), supply_chain_assessment=SUPPLY_CHAIN_OPTIONS[assessment[i]],
+            renewable_energy_percent=float(renewable[i]),
+            electricity_profile=profiles[profile_shape[i]] if profiled[i] else None,
+            grid_region=GRID_REGION if profiled[i] else None,
+            grid_year=GRID_YEAR if profiled[i] else None,
+            procurement_spend={supplier_sectors[spend_sector[i, k]]: float(spend_amount[i, k])
+                               for k in range(num_spends[i])} or None,
+            travel_legs=[{"origin": airports[leg_origin[i, k]],
+                          "destination": airports[(leg_origin[i, k] + leg_offset[i, k]) % len(airports)],
+                          "cabin": CABIN_CLASSES[leg_cabin[i, k]], "count": int(leg_count[i, k])}
+                         for k in range(num_legs[i])] or None)
+        for i in range(size)
+    ]
+
+    digest = hashlib.sha256()
+    for name in sorted(columns):
+        digest.update(name.encode('utf-8'))
+        digest.update(np.ascontiguousarray(columns[name]).tobytes())
+    digest.update(repr((car_types, sectors, PERSONAL_CHOICES, SUPPLY_CHAIN_OPTIONS, airports, supplier_sectors,
+                        CABIN_CLASSES, GRID_REGION, GRID_YEAR)).encode('utf-8'))
+    return Corpus(seed=seed, pairs=pairs, businesses=businesses, fingerprint=digest.hexdigest()[:16])
+
+
+def _individual_row(analysis: dict, total: float) -> list:
+    return [total] + [analysis["emissions"][category] for category in INDIVIDUAL_CATEGORIES]
+
+
+def scalar_engine(corpus: Corpus, calculator: CarbonCalculator) -> dict[str, np.ndarray]:
+    """The reference: one ``CarbonCalculator`` call per entity."""
+    individual = []
+    for household, personal in corpus.pairs:
+        calculator.household, calculator.personal = household, personal
+        individual.append(_individual_row(calculator.analyze_individual_emissions(),
+                                          calculator.calculate_total_emissions()))
+    business = [[emissions[column] for column in BUSINESS_COLUMNS]
+                for emissions in map(calculator.calculate_business_emissions, corpus.businesses)]
+    return {"individual": np.array(individual), "business": np.array(business)}
+
+
+def _batch(pairs: list, businesses: list, calculator: CarbonCalculator) -> dict[str, np.ndarray]:
+    arrays = individual_arrays(pairs, calculator)
+    analysis = individual_analysis_batch(arrays, calculator)
+    emissions = business_emissions_batch(business_arrays(businesses, calculator))
+    return {
+        "individual": np.column_stack([total_emissions_batch(arrays, calculator)] +
+                                      [analysis[category] for category in INDIVIDUAL_CATEGORIES]),
+        "business": np.column_stack([emissions[column] for column in BUSINESS_COLUMNS])
+    }
+
+
+def batch_engine(corpus: Corpus, calculator: CarbonCalculator) -> dict[str, np.ndarray]:
+    """The vectorized engine of ``batch.py`` over the whole corpus."""
+    return _batch(corpus.pairs, corpus.businesses, calculator)
+
+
+def _parallel_chunk(chunk: tuple) -> dict[str, np.ndarray]:
+    from shared_tables import worker_tables
+
+    pairs, businesses, code, options = chunk
+    return _batch(pairs, businesses, configure(worker_tables().calculator(code), *options))
+
+
+def parallel_engine(corpus: Corpus, calculator: CarbonCalculator, workers: Optional[int] = None,
+                    chunk_size: int = 10000) -> dict[str, np.ndarray]:
+    """The batch engine in chunks across a process pool that attaches to the shared tables."""
+    from shared_tables import SharedTables, init_worker
+
+    code = calculator.factors.code
+    options = _options(calculator)
+    size = max(len(corpus.pairs), len(corpus.businesses))
+    chunks = [(corpus.pairs[start:start + chunk_size], corpus.businesses[start:start + chunk_size], code, options)
+              for start in range(0, size, chunk_size)]
+    with SharedTables.publish(codes=[code]) as tables:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(tables.name,)) as executor:
+            results = list(executor.map(_parallel_chunk, chunks))
+    return {kind: np.concatenate([result[kind] for result in results if len(result[kind])])
+            for kind in ("individual", "business")}
+
+
+def cached_engine(corpus: Corpus, calculator: CarbonCalculator) -> dict[str, np.ndarray]:
+    """Scalar results through a fresh ``ResultCache``; the second pass reads every value back from it."""
+    from result_cache import ResultCache
+
+    cache = ResultCache(max_entries=4 * (len(corpus.pairs) + len(corpus.businesses)))
+    for _ in range(2):
+        individual = []
+        for household, personal in corpus.pairs:
+            calculator.household, calculator.personal = household, personal
+            individual.append(_individual_row(cache.individual_analysis(calculator), cache.total_emissions(calculator)))
+        business = [[emissions[column] for column in BUSINESS_COLUMNS]
+                    for emissions in (cache.business_emissions(calculator, b) for b in corpus.businesses)]
+    return {"individual": np.array(individual), "business": np.array(business)}
+
+
+ENGINES = {
+    "scalar": scalar_engine,
+    "batch": batch_engine,
+    "parallel": parallel_engine,
+    "cached": cached_engine
+}
+
+
+def record(path: str = GOLDEN_PATH, size: int = GOLDEN_SIZE, seed: int = GOLDEN_SEED, factors: Optional[str] = None,
+           grid_dir: Optional[str] = None):
+    """Score the corpus with the scalar engine and save it as the reference."""
+    with golden_calculator(factors, seed, grid_dir) as calculator:
+        corpus = generate_corpus(size, seed, calculator)
+        outputs = scalar_engine(corpus, calculator)
+    np.savez_compressed(path, seed=seed, size=size, corpus=corpus.fingerprint, factors=calculator.factors.code,
+                        factor_fingerprint=calculator.factors.fingerprint,
+                        eeio_fingerprint=calculator.supply_chain.fingerprint,
+                        airports_fingerprint=calculator.flights.fingerprint, **outputs)
+
+
+def compare(expected: np.ndarray, actual: np.ndarray, columns: tuple, rtol: float, atol: float) -> list[dict]:
+    """Return one ``{"column", "max_abs", "max_rel", "mismatches", "first"}`` row per column."""
+    if expected.shape != actual.shape:
+        raise ValueError(f"Beklenen {expected.shape} boyutu yerine {actual.shape} alındı")
+    difference = np.abs(actual - expected)
+    relative = np.divide(difference, np.abs(expected), out=np.zeros_like(difference), where=expected != 0)
+    mismatched = ~np.isclose(actual, expected, rtol=rtol, atol=atol)
+    rows = []
+    for j, column in enumerate(columns):
+        bad = np.flatnonzero(mismatched[:, j])
+        rows.append({"column": column, "max_abs": float(difference[:, j].max(initial=0.0)),
+                     "max_rel": float(relative[:, j].max(initial=0.0)), "mismatches": len(bad),
+                     "first": int(bad[0]) if len(bad) else None})
+    return rows
+
+
+def check(engines: list, path: str = GOLDEN_PATH, rtol: float = 1e-9, atol: float = 1e-9,
+          grid_dir: Optional[str] = None) -> bool:
+    """Score the reference corpus with ``engines``, print the differences and return whether all match."""
+    reference = np.load(path)
+    with golden_calculator(str(reference["factors"]), int(reference["seed"]), grid_dir) as calculator:
+        return _check(engines, reference, calculator, rtol, atol)
+
+
+def _check(engines: list, reference, calculator: CarbonCalculator, rtol: float, atol: float) -> bool:
+    if calculator.factors.fingerprint != str(reference["factor_fingerprint"]):
+        print(f"Uyarı: {reference['factors']} katsayı paketi referanstan sonra değişmiş", file=sys.stderr)
+    for name, table in (("eeio", calculator.supply_chain), ("airports", calculator.flights)):
+        if table.fingerprint != str(reference[f"{name}_fingerprint"]):
+            print(f"Uyarı: {table.path} referanstan sonra değişmiş", file=sys.stderr)
+    start = time.perf_counter()
+    corpus = generate_corpus(int(reference["size"]), int(reference["seed"]), calculator)
+    if corpus.fingerprint != str(reference["corpus"]):
+        raise ValueError("Üretilen derlem referanstakiyle aynı değil; referansı yeniden kaydedin (golden.py record)")
+    print(f"Derlem: {len(corpus.pairs)} birey, {len(corpus.businesses)} işletme "
+          f"({time.perf_counter() - start:.1f} saniye)")
+
+    passed = True
+    for name in engines:
+        start = time.perf_counter()
+        outputs = ENGINES[name](corpus, calculator)
+        elapsed = time.perf_counter() - start
+        failures = []
+        for kind, columns in (("individual", INDIVIDUAL_COLUMNS), ("business", BUSINESS_COLUMNS)):
+            for row in compare(reference[kind], outputs[kind], columns, rtol, atol):
+                if row["mismatches"]:
+                    failures.append((kind, row))
+        print(f"\n{name}: {'GEÇTİ' if not failures else 'BAŞARISIZ'} ({elapsed:.1f} saniye)")
+        for kind, row in failures:
+            print(f"  {kind}.{row['column']:<16} {row['mismatches']:>7} fark  en büyük {row['max_abs']:.3g} "
+                  f"(göreli {row['max_rel']:.3g}), ilk satır {row['first']}")
+        passed = passed and not failures
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sabit tohumlu derlemde hesaplama motorlarını referans çıktılarla karşılaştırır")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Skaler hesaplayıcıyla referans çıktıları kaydeder")
+    record_parser.add_argument("--output", default=GOLDEN_PATH)
+    record_parser.add_argument("--size", type=int, default=GOLDEN_SIZE, help="Hesaplayıcı türü başına kayıt sayısı")
+    record_parser.add_argument("--seed", type=int, default=GOLDEN_SEED)
+    record_parser.add_argument("--factors", default=None, help="Katsayı paketi (varsayılan: UK)")
+    record_parser.add_argument("--grid-dir", default=None,
+                               help="Sentetik şebeke dosyasının yazılacağı klasör (varsayılan: geçici klasör)")
+
+    check_parser = subparsers.add_parser("check", help="Motorları kayıtlı referansla karşılaştırır")
+    check_parser.add_argument("--reference", default=GOLDEN_PATH)
+    check_parser.add_argument("--engine", nargs='+', default=["batch"], choices=list(ENGINES))
+    check_parser.add_argument("--rtol", type=float, default=1e-9)
+    check_parser.add_argument("--atol", type=float, default=1e-9)
+    check_parser.add_argument("--grid-dir", default=None,
+                              help="Sentetik şebeke dosyasının yazılacağı klasör (varsayılan: geçici klasör)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        start = time.perf_counter()
+        record(args.output, args.size, args.seed, args.factors, args.grid_dir)
+        print(f"Referans şuraya kaydedildi: {args.output} ({time.perf_counter() - start:.1f} saniye)")
+    else:
+        sys.exit(0 if check(args.engine, args.reference, args.rtol, args.atol, args.grid_dir) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Hourly grid carbon-intensity factors backed by memory-mapped files."""
+import calendar
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+HOURS_PER_YEAR = 8760
+HOURS_PER_LEAP_YEAR = 8784
+
+
+def hours_in_year(year: int) -> int:
+    """Return the number of hours in a calendar year (8784 in leap years)."""
+    return HOURS_PER_LEAP_YEAR if calendar.isleap(int(year)) else HOURS_PER_YEAR
+
+
+def valid_lengths(year: int) -> tuple:
+    """Return the accepted series lengths for a year.
+
+    A leap year may be stored in full (8784 hours) or truncated to 8760 hours,
+    as many published data sets drop 31 December.
+    """
+    return tuple(sorted({HOURS_PER_YEAR, hours_in_year(year)}))
+
+
+class GridIntensityProvider:
+    """Serves hourly grid intensities (kg CO2 per kWh) per region and year.
+
+    Every region/year pair is stored as a ``<region>_<year>.npy`` file holding
+    one float64 value per hour (8760, or 8784 in a leap year). Files are
+    memory-mapped, so a lookup only touches the pages it needs, and each
+    mapping is opened once and reused until the file is regenerated.
+
+    A file is re-stat'ed at most once every ``check_interval`` seconds; its
+    fingerprint is a hash of its contents, recomputed only when the stat
+    signature changes.
+    """
+
+    def __init__(self, data_dir: str = "grid_intensity", check_interval: float = 1.0):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        # (region, year) -> (stat signature, content hash, mapping, last checked)
+        self._cache = {}
+
+    def path_for(self, region: str, year: int) -> str:
+        """Return the file path holding the intensities of a region/year."""
+        return os.path.join(self.data_dir, f"{region}_{year}.npy")
+
+    def _entry(self, region: str, year: int) -> tuple:
+        if region is None or year is None:
+            raise ValueError("Saatlik tüketim profili için şebeke bölgesi (grid_region) ve yılı (grid_year) "
+                             "gereklidir")
+        key = (region, int(year))
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[3] < self.check_interval:
+            return cached
+
+        path = self.path_for(region, year)
+        stat = os.stat(path)
+        signature = (os.path.realpath(path), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if cached is not None and cached[0] == signature:
+            entry = (*cached[:3], now)
+        else:
+            intensities = np.load(path, mmap_mode='r')
+            if intensities.ndim != 1 or intensities.shape[0] not in valid_lengths(year):
+                raise ValueError(f"{region} {year} için {hours_in_year(year)} saatlik değer bekleniyordu, "
+                                 f"{intensities.shape} bulundu")
+            digest = hashlib.sha256(np.ascontiguousarray(intensities).tobytes()).hexdigest()[:16]
+            entry = (signature, digest, intensities, now)
+        self._cache[key] = entry
+        return entry
+
+    def fingerprint(self, region: str, year: int) -> str:
+        """Return a hash of a region/year file's contents, which changes when it is regenerated."""
+        return self._entry(region, year)[1]
+
+    def get_intensities(self, region: str, year: int) -> np.ndarray:
+        """Return the read-only hourly intensity array of a region/year."""
+        return self._entry(region, year)[2]
+
+    def electricity_emissions(self, profile, region: str, year: int) -> float:
+        """Return kg CO2 for an hourly consumption profile (kWh per hour)."""
+        consumption = np.asarray(profile, dtype=np.float64)
+        intensities = self.get_intensities(region, year)
+        if consumption.shape != intensities.shape:
+            raise ValueError(f"Tüketim profili {region} {year} şebeke verisiyle aynı sayıda "
+                             f"({intensities.shape[0]}) saatlik değer içermelidir, {consumption.shape} bulundu")
+        return float(np.dot(consumption, intensities))
+
+    def import_csv(self, csv_path: str, region: str, year: int) -> str:
+        """Convert a CSV whose last column holds hourly intensities into a mapped file."""
+        df = pd.read_csv(csv_path, header=None, comment='#')
+        values = pd.to_numeric(df.iloc[:, -1], errors='coerce').dropna().to_numpy(dtype=np.float64)
+        if values.shape[0] not in valid_lengths(year):
+            raise ValueError(f"{csv_path} dosyasında {hours_in_year(year)} saatlik değer bekleniyordu, "
+                             f"{values.shape[0]} bulundu")
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = self.path_for(region, year)
+        np.save(path, values)
+        self._cache.pop((region, int(year)), None)
+        return path
+
+    def clear_cache(self):
+        """Drop all open mappings, e.g. after the files were regenerated."""
+        self._cache.clear()
@@ -1,18 +1,27 @@
+import argparse
+
 from matplotlib import pyplot as plt
 
-from son import CarbonCalculator, Household, Personal, Business
+from benchmark import open_benchmark
+from son import CarbonCalculator, Household, Personal, Business, PERSONAL_CHOICES, SUPPLY_CHAIN_OPTIONS
+from result_cache import get_shared_cache
+from templates import DEFAULT_LANGUAGE, LANGUAGES, render_business, render_individual
 import tkinter as tk
 from tkinter import ttk, messagebox
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 
 class CarbonCalculatorGUI:
-    def __init__(self):
+    def __init__(self, benchmark_path=None, language=DEFAULT_LANGUAGE):
         self.root = tk.Tk()
         self.root.title("Karbon Ayak İzi Hesaplayıcı")
         self.root.geometry("800x600")
 
-        self.calculator = CarbonCalculator()
+        # Sector benchmark shared by every calculation of the session, saved on exit
+        self.benchmark_path = benchmark_path
+        self.benchmark = open_benchmark(benchmark_path) if benchmark_path else None
+        self.language = language
+        self.calculator = self.new_calculator()
 
         # Main container
         self.main_frame = ttk.Frame(self.root)
@@ -25,16 +34,35 @@ class CarbonCalculatorGUI:
         self.calc_type.pack(pady=5)
         self.calc_type.bind('<<ComboboxSelected>>', self.on_type_change)
 
+        # Output language of results, charts and reports
+        ttk.Label(self.main_frame, text="Dil / Language").pack(pady=5)
+        self.lang_select = ttk.Combobox(self.main_frame, values=list(LANGUAGES), state="readonly")
+        self.lang_select.set(self.language)
+        self.lang_select.pack(pady=5)
+        self.lang_select.bind('<<ComboboxSelected>>', self.on_language_change)
+
         # Start calculation button
         ttk.Button(self.main_frame, text="Hesaplamaya Başla", command=self.start_calculation).pack(pady=10)
 
         self.car_frames = []  # To keep track of car entry frames
 
+    def new_calculator(self):
+        calculator = CarbonCalculator()
+        calculator.benchmark = self.benchmark
+        calculator.language = self.language
+        return calculator
+
     def on_type_change(self, event):
         # Reset calculator when type changes
-        self.calculator = CarbonCalculator()
+        self.calculator = self.new_calculator()
+
+    def on_language_change(self, event):
+        self.language = self.lang_select.get()
+        self.calculator.language = self.language
 
     def start_calculation(self):
+        # Edited factor pack files apply to the next calculation without restarting the GUI
+        self.calculator.refresh_factors()
         if self.calc_type.get() == "Bireysel":
             self.calculator.calculator_type = 'individual'
             self.collect_individual_data()
@@ -105,7 +133,7 @@ class CarbonCalculatorGUI:
                     
                         # Car type dropdown
                         ttk.Label(car_frame, text="Araç tipi:").pack()
-                        car_type = ttk.Combobox(car_frame, values=["küçük", "orta", "büyük"], state="readonly")
+                        car_type = ttk.Combobox(car_frame, values=list(self.calculator.CAR_MPG.keys()), state="readonly")
                         car_type.pack(pady=5)
                         car_type.set("orta")  # default value
                     
@@ -135,25 +163,12 @@ class CarbonCalculatorGUI:
         food_frame = ttk.LabelFrame(scrollable_frame, text="Gıda Tercihleri")
         food_frame.pack(fill='x', padx=5, pady=5)
 
-        organic_food = create_combobox("Gıdalarınızın ne kadarı organik?",
-                                       ["Hiçbiri", "Bazıları", "Çoğu", "Hepsi"])
-
-        meat_dairy = create_combobox("Et/süt tüketiminiz nedir?",
-                                     ["Ortalamanın üstünde et/süt", "Ortalama et/süt",
-                                      "Ortalamanın altında et/süt", "Lakto-vejetaryen", "Vegan"])
-
-        local_food = create_combobox("Gıdalarınızın ne kadarı yerel olarak üretiliyor?",
-                                     ["Çok azı", "Ortalama", "Ortalamanın üzerinde", "Tamamı"])
-
-        processed_food = create_combobox("Gıdalarınızın ne kadarı paketli/işlenmiş?",
-                                         ["Ortalamanın üzerinde", "Ortalama", "Ortalamanın altında", "Çok az"])
-
-        composting = create_combobox("Ne sıklıkla kompost yapıyorsunuz?",
-                                     ["Hiç", "Bazen", "Her zaman"])
-
-        food_waste = create_combobox("Ne kadar gıda israf ediyorsunuz?",
-                                     ["Ortalamanın üzerinde(50% çok)", "Ortalama",
-                                      "Ortalamanın altında (50% az)", "Çok az (90% az)"])
+        organic_food = create_combobox("Gıdalarınızın ne kadarı organik?", PERSONAL_CHOICES["organic_food"])
+        meat_dairy = create_combobox("Et/süt tüketiminiz nedir?", PERSONAL_CHOICES["meat_dairy"])
+        local_food = create_combobox("Gıdalarınızın ne kadarı yerel olarak üretiliyor?", PERSONAL_CHOICES["local_food"])
+        processed_food = create_combobox("Gıdalarınızın ne kadarı paketli/işlenmiş?", PERSONAL_CHOICES["processed_food"])
+        composting = create_combobox("Ne sıklıkla kompost yapıyorsunuz?", PERSONAL_CHOICES["composting"])
+        food_waste = create_combobox("Ne kadar gıda israf ediyorsunuz?", PERSONAL_CHOICES["food_waste"])
 
         # Transportation Section
         transport_frame = ttk.LabelFrame(scrollable_frame, text="Ulaşım")
@@ -167,11 +182,7 @@ class CarbonCalculatorGUI:
         lifestyle_frame = ttk.LabelFrame(scrollable_frame, text="Yaşam Tarzı ve Harcamalar")
         lifestyle_frame.pack(fill='x', padx=5, pady=5)
 
-        spending = create_combobox("Diğer harcamalarınız ne seviyede?",
-                                   ["Ortalamanın Üstünde (5 ton CO2)",
-                                    "Ortalama (3.4 ton CO2)",
-                                    "Ortalamanın Altında (2.4 ton CO2)",
-                                    "Ortalamanın Çok Altında (1.4 ton CO2)"])
+        spending = create_combobox("Diğer harcamalarınız ne seviyede?", PERSONAL_CHOICES["spending"])
 
         recycles_basic = create_checkbox("Kağıt, cam ve metali geri dönüştürüyor musunuz?")
         recycles_plastic = create_checkbox("Poşetler dışında plastiği geri dönüştürüyor musunuz?")
@@ -277,7 +288,7 @@ class CarbonCalculatorGUI:
                     'air_travel_hours': 0,
                     'waste_recycling_rate': 0,
                     'data_center_usage': 0,
-                    'supply_chain_assessment': "Temel değerlendirme",
+                    'supply_chain_assessment': SUPPLY_CHAIN_OPTIONS[1],
                     'renewable_energy_percent': 0
                 }
                 self.calculator.business = Business(**business_data)
@@ -298,35 +309,28 @@ class CarbonCalculatorGUI:
         results_window = tk.Toplevel(self.root)
         results_window.title("Sonuçlar")
         results_window.geometry("1500x1200")
+        catalog = self.calculator.catalog
 
         if self.calculator.calculator_type == 'individual':
-            total = self.calculator.calculate_total_emissions()
-            analysis = self.calculator.analyze_individual_emissions()
+            result = self.calculator.individual_result(get_shared_cache())
 
             # Text results
             text_frame = ttk.Frame(results_window)
             text_frame.pack(fill='x', padx=10, pady=10)
-
-            text = f"Toplam yıllık emisyonlar: {total:.1f} ton CO2e\n\n"
-            text += "Kategoriye göre dağılım:\n"
-            for category, emission in analysis['emissions'].items():
-                percentage = analysis['percentages'][category]
-                text += f"{category}: {emission:.1f} ton CO2e (%{percentage:.1f})\n"
-
-            ttk.Label(text_frame, text=text, justify='left').pack(pady=10)
+            ttk.Label(text_frame, text=render_individual(result, catalog), justify='left').pack(pady=10)
 
             # Create frame for graphs
             graphs_frame = ttk.Frame(results_window)
             graphs_frame.pack(fill='both', expand=True, padx=10, pady=10)
 
             # Pie chart
-            pie_frame = ttk.LabelFrame(graphs_frame, text="Emisyon Dağılımı")
+            pie_frame = ttk.LabelFrame(graphs_frame, text=catalog("pie_title"))
             pie_frame.pack(side='left', fill='both', expand=True, padx=5)
 
             fig1, ax1 = plt.subplots(figsize=(6, 6))
-            labels = list(analysis['emissions'].keys())
-            sizes = [analysis['emissions'][key] for key in labels]
-            ax1.pie(sizes, labels=labels, autopct='%1.1f%%')
+            categories = list(result.emissions.keys())
+            sizes = [result.emissions[key] for key in categories]
+            ax1.pie(sizes, labels=[catalog.label(key) for key in categories], autopct='%1.1f%%')
             ax1.axis('equal')
 
             canvas1 = FigureCanvasTkAgg(fig1, master=pie_frame)
@@ -334,20 +338,20 @@ class CarbonCalculatorGUI:
             canvas1.get_tk_widget().pack(fill='both', expand=True)
 
             # Bar chart
-            bar_frame = ttk.LabelFrame(graphs_frame, text="Karbon Ayak İzi Karşılaştırması")
+            bar_frame = ttk.LabelFrame(graphs_frame, text=catalog("bar_title"))
             bar_frame.pack(side='right', fill='both', expand=True, padx=5)
 
             fig2, ax2 = plt.subplots(figsize=(6, 6))
 
             # Get comparison data
-            combined_df = self.calculator.load_comparison_data()
+            combined_df = self.calculator.load_comparison_data(result.total)
             if combined_df is not None:
                 countries = combined_df['Konum'].tolist()
                 co2_values = combined_df['CO2'].tolist()
 
                 # Add user's value
-                countries.append('Sizin Ayak İziniz')
-                co2_values.append(total)
+                countries.append(catalog("you"))
+                co2_values.append(result.total)
 
                 # Create bar chart
                 bars = ax2.bar(range(len(countries)), co2_values)
@@ -357,7 +361,7 @@ class CarbonCalculatorGUI:
 
                 ax2.set_xticks(range(len(countries)))
                 ax2.set_xticklabels(countries, rotation=45, ha='right')
-                ax2.set_ylabel('Karbon Ayak İzi (ton CO2e)')
+                ax2.set_ylabel(catalog("bar_ylabel"))
                 plt.tight_layout()
 
                 canvas2 = FigureCanvasTkAgg(fig2, master=bar_frame)
@@ -365,27 +369,33 @@ class CarbonCalculatorGUI:
                 canvas2.get_tk_widget().pack(fill='both', expand=True)
 
         else:  # Business
-            emissions = self.calculator.calculate_business_emissions()
-            text = f"İşletme: {self.calculator.business.name}\n"
-            text += f"Sektör: {self.calculator.business.sector}\n\n"
-            text += "Emisyonlar:\n"
-            for category, value in emissions.items():
-                if category != 'toplam':
-                    text += f"{category}: {value:.1f} ton CO2e\n"
-            text += f"\nToplam emisyonlar: {emissions['toplam']:.1f} ton CO2e"
+            business = self.calculator.business
+            emissions = get_shared_cache().business_emissions(self.calculator)
+            # Compared with the sector before the business itself is added to it
+            result = self.calculator.business_result(emissions)
+            if self.benchmark is not None:
+                self.benchmark.add(business.sector, emissions, business.num_employees)
 
-            ttk.Label(results_window, text=text, justify='left').pack(pady=10)
+            # Monospace, so the category columns of the template line up
+            ttk.Label(results_window, text=render_business(result, catalog), justify='left',
+                      font=('Courier', 10)).pack(pady=10)
 
         # Add export button
         ttk.Button(results_window, text="Rapor Oluştur",
-                   command=lambda: self.calculator.generate_report(
-                       emissions if self.calculator.calculator_type == 'business' else None)
-                   ).pack(pady=10)
+                   command=lambda: self.calculator.generate_report(result)).pack(pady=10)
 
     def run(self):
         self.root.mainloop()
+        if self.benchmark is not None:
+            self.benchmark.save(self.benchmark_path)
 
 
 if __name__ == "__main__":
-    app = CarbonCalculatorGUI()
+    parser = argparse.ArgumentParser(description="Karbon Ayak İzi Hesaplayıcı (arayüz)")
+    parser.add_argument("--benchmark", default=None,
+                        help="Sektör karşılaştırmalarının okunup kaydedileceği JSON dosyası (yoksa oluşturulur)")
+    parser.add_argument("--lang", default=DEFAULT_LANGUAGE, choices=LANGUAGES,
+                        help="Başlangıçtaki sonuç, grafik ve rapor dili (varsayılan: tr)")
+    args = parser.parse_args()
+    app = CarbonCalculatorGUI(args.benchmark, args.lang)
     app.run()
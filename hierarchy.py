@@ -0,0 +1,137 @@
+"""Group → subsidiary → site roll-ups of business emissions."""
+from typing import Optional
+
+from son import CarbonCalculator, Business
+
+
+class EntityNode:
+    """One entity of a business group with its cached emission subtotals."""
+
+    def __init__(self, name: str, level: str, parent: Optional["EntityNode"] = None):
+        self.name = name
+        self.level = level
+        self.parent = parent
+        self.children: dict[str, EntityNode] = {}
+        self.business: Optional[Business] = None  # Only set on sites
+        self.totals: dict[str, float] = {}
+        self.num_employees = 0
+
+    def path(self) -> list[str]:
+        """Return the names from the group down to this node."""
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return names[::-1]
+
+    def per_employee(self) -> dict[str, float]:
+        """Return the cached subtotals divided by the employees below this node."""
+        if self.num_employees <= 0:
+            return {category: 0.0 for category in self.totals}
+        return {category: value / self.num_employees for category, value in self.totals.items()}
+
+    def walk(self):
+        """Yield this node and all of its descendants, depth first."""
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+
+class BusinessHierarchy:
+    """Scores sites with ``calculate_business_emissions`` and rolls totals up the tree.
+
+    Every node caches the sum of its sites, so adding, editing or removing a
+    site only re-scores that site and applies the difference to its ancestors.
+    """
+
+    def __init__(self, group_name: str, calculator: Optional[CarbonCalculator] = None):
+        self.calculator = calculator or CarbonCalculator()
+        self.root = EntityNode(group_name, "group")
+
+    def add_subsidiary(self, name: str, parent: Optional[EntityNode] = None) -> EntityNode:
+        """Add a subsidiary under the group, or under another subsidiary."""
+        parent = parent or self.root
+        if parent.level == "site":
+            raise ValueError("Tesislerin alt birimi olamaz")
+        if name in parent.children:
+            raise ValueError(f"'{name}' zaten '{parent.name}' altında tanımlı")
+        node = EntityNode(name, "subsidiary", parent)
+        parent.children[name] = node
+        return node
+
+    def add_site(self, parent: EntityNode, business: Business) -> EntityNode:
+        """Add a site scored from ``business`` and roll its totals up."""
+        if parent.level == "site":
+            raise ValueError("Tesislerin alt birimi olamaz")
+        if business.name in parent.children:
+            raise ValueError(f"'{business.name}' zaten '{parent.name}' altında tanımlı")
+        # Score before attaching, so a site that fails to score leaves the tree untouched
+        totals = self.calculator.calculate_business_emissions(business)
+        site = EntityNode(business.name, "site", parent)
+        parent.children[business.name] = site
+        self._apply(site, business, totals)
+        return site
+
+    def update_site(self, site: EntityNode, business: Business):
+        """Re-score one site and re-aggregate only its ancestors."""
+        if site.level != "site":
+            raise ValueError("Yalnızca tesisler güncellenebilir")
+        self._apply(site, business, self.calculator.calculate_business_emissions(business))
+
+    def _apply(self, site: EntityNode, business: Business, new_totals: dict):
+        delta = {category: value - site.totals.get(category, 0.0) for category, value in new_totals.items()}
+        for category in site.totals.keys() - new_totals.keys():
+            delta[category] = -site.totals[category]
+        employee_delta = business.num_employees - site.num_employees
+
+        site.business = business
+        site.totals = dict(new_totals)
+        site.num_employees = business.num_employees
+        self._propagate(site.parent, delta, employee_delta)
+
+    def remove_site(self, site: EntityNode):
+        """Detach a site and subtract its totals from its ancestors."""
+        if site.level != "site":
+            raise ValueError("Yalnızca tesisler kaldırılabilir")
+        del site.parent.children[site.name]
+        delta = {category: -value for category, value in site.totals.items()}
+        self._propagate(site.parent, delta, -site.num_employees)
+        site.parent = None
+
+    def _propagate(self, node: Optional[EntityNode], delta: dict, employee_delta: int):
+        while node is not None:
+            for category, value in delta.items():
+                node.totals[category] = node.totals.get(category, 0.0) + value
+            node.num_employees += employee_delta
+            node = node.parent
+
+    def recompute(self):
+        """Rebuild every subtotal from the sites, e.g. after changing factors."""
+        self._recompute(self.root)
+
+    def _recompute(self, node: EntityNode):
+        if node.level == "site":
+            node.totals = self.calculator.calculate_business_emissions(node.business)
+            node.num_employees = node.business.num_employees
+            return
+        node.totals = {}
+        node.num_employees = 0
+        for child in node.children.values():
+            self._recompute(child)
+            for category, value in child.totals.items():
+                node.totals[category] = node.totals.get(category, 0.0) + value
+            node.num_employees += child.num_employees
+
+    def summary(self) -> list[dict]:
+        """Return one row per node with its total and per-employee total."""
+        rows = []
+        for node in self.root.walk():
+            rows.append({
+                "path": " / ".join(node.path()),
+                "level": node.level,
+                "num_employees": node.num_employees,
+                "toplam": node.totals.get("toplam", 0.0),
+                "calisan_basina": node.per_employee().get("toplam", 0.0)
+            })
+        return rows
@@ -0,0 +1,168 @@
+"""Per-stage time, throughput and memory profile of an end-to-end run over a JSONL input."""
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Charts rendered by the traced (memory) run
+TRACED_CHARTS = 3
+
+# Frames of the profiler itself and of the import machinery are not allocation sites of the workload
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+)
+
+
+@dataclass
+class StageStats:
+    name: str
+    seconds: float = 0.0
+    items: int = 0
+    peak_bytes: int = 0
+    allocations: list = field(default_factory=list)  # (size_diff, count_diff, "file:line") of the stage
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+class Profiler:
+    """Times named stages, or records each stage's tracemalloc peak and top allocation sites.
+
+    Tracing slows Python code several times over, so a profile runs the
+    workload twice: once untraced for the times and once traced for memory.
+    Tracing starts and stops with every stage, so a stage's peak and sites
+    count only the memory that stage allocated.
+    """
+
+    def __init__(self, top: int = 10, trace_memory: bool = False):
+        self.top = top
+        self.trace_memory = trace_memory
+        self.stages: list[StageStats] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        stats = StageStats(name)
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds = time.perf_counter() - start
+            if self.trace_memory:
+                stats.peak_bytes = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+                tracemalloc.stop()
+                stats.allocations = [(statistic.size, statistic.count, str(statistic.traceback))
+                                     for statistic in snapshot.statistics('lineno')[:self.top]]
+            self.stages.append(stats)
+
+    def merge_memory(self, traced: "Profiler"):
+        """Take peaks and allocation sites from a traced run of the same stages."""
+        memory = {stats.name: stats for stats in traced.stages}
+        for stats in self.stages:
+            if stats.name in memory:
+                stats.peak_bytes = memory[stats.name].peak_bytes
+                stats.allocations = memory[stats.name].allocations
+
+    def report(self) -> str:
+        lines = [f"{'Aşama':<14} {'Süre (sn)':>10} {'Kayıt':>8} {'Kayıt/sn':>11} {'Tepe bellek (MB)':>17}", "-" * 64]
+        for stats in self.stages:
+            lines.append(f"{stats.name:<14} {stats.seconds:>10.3f} {stats.items:>8} {stats.throughput:>11.1f} "
+                         f"{stats.peak_bytes / 1e6:>17.1f}")
+        lines.append("-" * 64)
+        lines.append(f"{'toplam':<14} {sum(stats.seconds for stats in self.stages):>10.3f}")
+
+        sites = sorted(((size, count, site, stats.name) for stats in self.stages
+                        for size, count, site in stats.allocations), reverse=True)[:self.top]
+        if sites:
+            lines.append(f"\nEn çok bellek ayıran {len(sites)} satır (aşama sonunda hâlâ ayrılmış):")
+            for size, count, site, name in sites:
+                lines.append(f"  {size / 1024:>10.1f} KB {count:>8} blok  {name:<14} {site}")
+        return "\n".join(lines)
+
+
+def _run_stages(profiler: Profiler, path: str, calculator, charts: int, reports: int,
+                output_dir: Optional[str]):
+    from batch_reports import ReportTemplate, report_filename
+    from son import load_records
+    from templates import render_report
+    from validation import build_validators, validate_records
+
+    with profiler.stage("ayrıştırma") as stats:
+        chunk = list(load_records(path))
+        stats.items = len(chunk)
+
+    with profiler.stage("doğrulama") as stats:
+        records = [record if record is not None else {"type": None} for _, record in chunk]
+        report = validate_records(records, build_validators(calculator))
+        valid = [(record.get("id", line_number), inputs)
+                 for (line_number, _), record, inputs in zip(chunk, records, report.records) if inputs is not None]
+        stats.items = len(records)
+
+    with profiler.stage("hesaplama") as stats:
+        results = []
+        for record_id, inputs in valid:
+            if inputs["type"] == "business":
+                emissions = calculator.calculate_business_emissions(inputs["business"])
+                total = emissions["toplam"]
+            else:
+                calculator.household, calculator.personal = inputs["household"], inputs["personal"]
+                emissions = calculator.analyze_individual_emissions()["emissions"]
+                total = calculator.calculate_total_emissions()
+            results.append({"id": record_id, "total": total, "emissions": emissions})
+        stats.items = len(results)
+
+    with profiler.stage("karşılaştırma") as stats:
+        individual = [i for i, (_, inputs) in enumerate(valid) if inputs["type"] == "individual"]
+        comparisons = {i: calculator.load_comparison_data(results[i]["total"]) for i in individual}
+        stats.items = len(comparisons)
+
+    with profiler.stage("grafik") as stats:
+        template = ReportTemplate(calculator.language)
+        for i in individual[:charts]:
+            template.render(results[i], comparisons[i], "png")
+            stats.items += 1
+
+    with tempfile.TemporaryDirectory() as temporary, profiler.stage("rapor") as stats:
+        directory = output_dir or temporary
+        for (record_id, inputs), result in list(zip(valid, results))[:reports]:
+            if inputs["type"] == "business":
+                calculator.business = inputs["business"]
+                rendered = calculator.business_result(result["emissions"])
+            else:
+                calculator.household, calculator.personal = inputs["household"], inputs["personal"]
+                rendered = calculator.individual_result()
+            with open(os.path.join(directory, report_filename(record_id, "txt")), 'w', encoding='utf-8') as f:
+                f.write(render_report(rendered, calculator.catalog))
+            stats.items += 1
+
+
+def profile_run(path: str, calculator=None, charts: int = 10, reports: int = 200, top: int = 10,
+                output_dir: Optional[str] = None, trace_memory: bool = True) -> Profiler:
+    """Run ``path`` through parsing, validation, calculation, comparison, charts and reports.
+
+    Every valid record is calculated and looked up in the comparison data; charts
+    are rendered for the first ``charts`` individual results and text reports
+    written for the first ``reports`` records, into ``output_dir`` or a temporary
+    directory. With ``trace_memory`` a second, traced run adds peaks and allocation sites.
+    """
+    from son import CarbonCalculator
+
+    calculator = calculator or CarbonCalculator()
+    profiler = Profiler(top)
+    _run_stages(profiler, path, calculator, charts, reports, output_dir)
+    if trace_memory and not tracemalloc.is_tracing():
+        traced = Profiler(top, trace_memory=True)
+        # Peaks of chart rendering do not grow with the count (the figure is reused), and traced
+        # matplotlib is slow, so the memory run renders only a few charts
+        _run_stages(traced, path, calculator, min(charts, TRACED_CHARTS), reports, output_dir)
+        profiler.merge_memory(traced)
+    return profiler
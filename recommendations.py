@@ -0,0 +1,210 @@
+"""Catalogue of reduction actions ranked by the tonnes they save, for one entity or a whole batch."""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+
+from batch import KM_PER_MILE, BusinessArrays, IndividualArrays, business_arrays, business_emissions_batch, \
+    individual_arrays, total_emissions_batch
+
+# Assumed effect of each action on its inputs
+HEATING_SAVING = 0.15  # gas use after insulation and thermostat changes
+CAR_TO_PUBLIC_TRANSPORT = 0.25  # share of car miles moved to the bus
+FLIGHT_REDUCTION = 0.5  # flight hours dropped
+BUSINESS_TRAVEL_REDUCTION = 0.25  # business flights replaced by video calls
+BUILDING_SAVING = 0.2  # building emissions after efficiency upgrades
+DATA_CENTER_SAVING = 0.3  # data center emissions at an efficient provider
+RENEWABLE_TARGET = 0.5  # renewable share of a business after the switch
+SMALLER_CAR = ("büyük", "küçük")  # car type replaced, and its replacement
+
+# Target labels of the choice-based individual actions (see son.PERSONAL_CHOICES)
+LESS_MEAT = ("meat_dairy", "Ortalamanın altında et/süt")
+LOCAL_FOOD = ("local_food", "Ortalamanın üzerinde")
+LESS_SPENDING = "Ortalamanın Altında (2.4 ton CO2)"
+
+
+@dataclass(frozen=True)
+class Action:
+    """A change to the inputs of an entity: ``apply`` returns a modified copy of the arrays (or None)."""
+    key: str
+    category: str
+    apply: Callable
+
+
+def _swap_car_type(miles: np.ndarray, car_types: tuple) -> np.ndarray | None:
+    old, new = SMALLER_CAR
+    if old not in car_types or new not in car_types:
+        return None
+    miles = miles.copy()
+    miles[:, car_types.index(new)] += miles[:, car_types.index(old)]
+    miles[:, car_types.index(old)] = 0.0
+    return miles
+
+
+def _choose_food(arrays: IndividualArrays, calculator, category: str, label: str) -> IndividualArrays | None:
+    if category not in arrays.food_categories:
+        return None
+    modifiers = arrays.food_modifiers.copy()
+    j = arrays.food_categories.index(category)
+    # Only an improvement: entities already at or below the target keep their choice
+    np.minimum(modifiers[:, j], calculator.FOOD_MODIFIERS[category][label], out=modifiers[:, j])
+    return replace(arrays, food_modifiers=modifiers, food_modifier=modifiers.prod(axis=1))
+
+
+def _smaller_car(arrays: IndividualArrays, calculator):
+    miles = _swap_car_type(arrays.car_miles, arrays.car_types)
+    return None if miles is None else replace(arrays, car_miles=miles)
+
+
+def _public_transport(arrays: IndividualArrays, calculator):
+    moved = arrays.car_miles * CAR_TO_PUBLIC_TRANSPORT
+    return replace(arrays, car_miles=arrays.car_miles - moved, bus_miles=arrays.bus_miles + moved.sum(axis=1))
+
+
+INDIVIDUAL_ACTIONS = (
+    Action("yesil_tarife", "ev_enerjisi",
+           lambda a, c: replace(a, electricity_green=np.ones(len(a), dtype=bool))),
+    Action("isi_yalitimi", "ev_enerjisi", lambda a, c: replace(a, gas_kwh=a.gas_kwh * (1 - HEATING_SAVING))),
+    Action("kucuk_arac", "ulasim", _smaller_car),
+    Action("toplu_tasima", "ulasim", _public_transport),
+    Action("daha_az_ucus", "ulasim", lambda a, c: replace(a, flight_hours=a.flight_hours * (1 - FLIGHT_REDUCTION))),
+    Action("daha_az_et", "gida", lambda a, c: _choose_food(a, c, *LESS_MEAT)),
+    Action("yerel_gida", "gida", lambda a, c: _choose_food(a, c, *LOCAL_FOOD)),
+    Action("daha_az_harcama", "harcama",
+           lambda a, c: replace(a, spending=np.minimum(a.spending, c.SPENDING_EMISSIONS[LESS_SPENDING])))
+)
+
+
+def _scale_column(arrays: BusinessArrays, name: str, j: int, factor: float) -> BusinessArrays:
+    matrix = getattr(arrays, name).copy()
+    matrix[:, j] *= factor
+    return replace(arrays, **{name: matrix})
+
+
+def _green_electricity(arrays: BusinessArrays, calculator):
+    factor = arrays.factor.copy()
+    factor[~arrays.green, 1] *= 1 - calculator.GREEN_ELECTRICITY_REDUCTION
+    return replace(arrays, factor=factor, green=np.ones(len(arrays), dtype=bool))
+
+
+def _smaller_fleet(arrays: BusinessArrays, calculator):
+    miles = _swap_car_type(arrays.vehicle_miles, arrays.car_types)
+    if miles is None:
+        return None
+    mpg = np.array([calculator.CAR_MPG[car_type] for car_type in arrays.car_types], dtype=np.float64)
+    factor = arrays.factor.copy()
+    np.divide(miles @ (KM_PER_MILE / mpg * calculator.CAR_CO2_FACTOR / 1000), arrays.activity[:, 3],
+              out=factor[:, 3], where=arrays.activity[:, 3] > 0)
+    return replace(arrays, factor=factor, vehicle_miles=miles)
+
+
+BUSINESS_ACTIONS = (
+    Action("yesil_elektrik", "elektrik", _green_electricity),
+    Action("yenilenebilir_enerji", "toplam",
+           lambda a, c: replace(a, renewable_share=np.maximum(a.renewable_share, RENEWABLE_TARGET))),
+    Action("kucuk_filo", "araclar", _smaller_fleet),
+    Action("bina_verimliligi", "bina", lambda a, c: _scale_column(a, "factor", 0, 1 - BUILDING_SAVING)),
+    Action("video_konferans", "hava_yolculugu",
+           lambda a, c: _scale_column(a, "activity", 4, 1 - BUSINESS_TRAVEL_REDUCTION)),
+    Action("verimli_veri_merkezi", "veri_merkezi", lambda a, c: _scale_column(a, "factor", 6, 1 - DATA_CENTER_SAVING))
+)
+
+
+@dataclass
+class Recommendations:
+    """Tonnes CO2e per year saved by every action (columns) for every entity (rows)."""
+    actions: tuple
+    savings: np.ndarray
+    totals: np.ndarray
+
+    def top(self, k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(action indices, tonnes saved)``, both (n, k), best first; unused slots save 0."""
+        k = min(k, len(self.actions))
+        top = np.argpartition(-self.savings, k - 1, axis=1)[:, :k]
+        saved = np.take_along_axis(self.savings, top, axis=1)
+        order = np.argsort(-saved, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(saved, order, axis=1)
+
+    def for_entity(self, i: int, k: int = 3) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(action key, tonnes saved)`` pairs of entity ``i`` that save anything."""
+        row = self.savings[i]
+        order = np.argsort(-row)[:k]
+        return [(self.actions[j].key, float(row[j])) for j in order if row[j] > 0]
+
+    def population(self) -> list[tuple[str, float, int]]:
+        """Return ``(action key, total tonnes saved, entities it applies to)`` by total savings."""
+        totals = self.savings.sum(axis=0)
+        counts = (self.savings > 0).sum(axis=0)
+        return [(self.actions[j].key, float(totals[j]), int(counts[j])) for j in np.argsort(-totals)]
+
+
+def _evaluate(arrays, calculator, actions: tuple, total: Callable) -> Recommendations:
+    base = total(arrays)
+    savings = np.zeros((len(base), len(actions)))
+    for j, action in enumerate(actions):
+        changed = action.apply(arrays, calculator)
+        if changed is not None:
+            # Differences at rounding level mean the action does not apply to that entity
+            saved = base - total(changed)
+            savings[:, j] = np.where(saved > 1e-9, saved, 0.0)
+    return Recommendations(actions=actions, savings=savings, totals=base)
+
+
+def individual_recommendations(arrays: IndividualArrays, calculator,
+                               actions: tuple = INDIVIDUAL_ACTIONS) -> Recommendations:
+    """Savings of every action against ``calculate_total_emissions`` for a batch of respondents."""
+    return _evaluate(arrays, calculator, actions, lambda a: total_emissions_batch(a, calculator))
+
+
+def business_recommendations(arrays: BusinessArrays, calculator,
+                             actions: tuple = BUSINESS_ACTIONS) -> Recommendations:
+    """Savings of every action against the adjusted business total (``toplam``)."""
+    return _evaluate(arrays, calculator, actions, lambda a: business_emissions_batch(a)["toplam"])
+
+
+def main():
+    from son import CarbonCalculator, load_records
+    from validation import build_validators, validate_records
+
+    parser = argparse.ArgumentParser(description="Toplu kayıtlar için en çok tasarruf sağlayan eylemleri sıralar")
+    parser.add_argument("input", help="'son.py batch' biçiminde JSONL dosyası")
+    parser.add_argument("--top", type=int, default=3, help="Kayıt başına eylem sayısı")
+    parser.add_argument("--summary", action="store_true", help="Kayıt satırları yerine yalnızca özet yazar")
+    args = parser.parse_args()
+
+    calculator = CarbonCalculator()
+    chunk = list(load_records(args.input))
+    records = [record if record is not None else {"type": None} for _, record in chunk]
+    report = validate_records(records, build_validators(calculator))
+    ids = [record.get("id", line_number) if isinstance(record, dict) else line_number
+           for (line_number, _), record in zip(chunk, records)]
+
+    for title, calculator_type, extract, recommend in [
+        ("Bireysel", "individual", individual_arrays, individual_recommendations),
+        ("İşletme", "business", business_arrays, business_recommendations)
+    ]:
+        rows = [i for i, inputs in enumerate(report.records) if inputs is not None and inputs["type"] == calculator_type]
+        if not rows:
+            continue
+        entities = [(report.records[i]["household"], report.records[i]["personal"])
+                    if calculator_type == "individual" else report.records[i]["business"] for i in rows]
+        start = time.perf_counter()
+        result = recommend(extract(entities, calculator), calculator)
+        elapsed = time.perf_counter() - start
+        if not args.summary:
+            for position, i in enumerate(rows):
+                print(json.dumps({"id": ids[i], "type": calculator_type,
+                                  "actions": [{"action": action, "saving": saving}
+                                              for action, saving in result.for_entity(position, args.top)]},
+                                 ensure_ascii=False))
+        print(f"\n{title} ({len(rows)} kayıt, {elapsed:.2f} saniye) - toplam tasarruf potansiyeli:", file=sys.stderr)
+        for action, saving, count in result.population():
+            print(f"  {action:<22} {saving:>12.1f} ton CO2e  ({count} kayıt)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Content-addressed cache of calculation results."""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Optional
+
+
+def _canonical(value):
+    """Normalize a value so equal inputs always serialize identically."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return _canonical(value.tolist())
+    raise TypeError(f"Önbellek anahtarı için desteklenmeyen tür: {type(value).__name__}")
+
+
+def canonical_hash(payload) -> str:
+    """Return a stable SHA-256 hex digest of a JSON-like payload."""
+    text = json.dumps(_canonical(payload), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# Bumped when the shape of cached results changes (2: language-neutral category keys)
+RESULT_FORMAT = 2
+
+
+def factor_version(calculator, inputs: tuple = ()) -> str:
+    """Return the fingerprint of the factor pack (and grid data, EEIO and airport tables) a calculator uses.
+
+    Hourly grid data is fingerprinted per input: a business with an electricity
+    profile adds the content hash of the region/year file it is scored against.
+    """
+    version = calculator.factors.fingerprint
+    if calculator.grid_intensity is not None:
+        for item in inputs:
+            if getattr(item, "electricity_profile", None) is not None:
+                version = f"{version}:{calculator.grid_intensity.fingerprint(item.grid_region, item.grid_year)}"
+    if calculator.supply_chain is not None:
+        version = f"{version}:{calculator.supply_chain.fingerprint}"
+    if calculator.flights is not None:
+        version = f"{version}:{calculator.flights.fingerprint}"
+    return version
+
+
+class ResultCache:
+    """Bounded in-memory LRU of results with an optional SQLite tier.
+
+    Keys hash the canonicalized inputs together with the operation and the
+    factor fingerprint, so changing any factor never serves a stale result.
+    Values are stored as JSON, so callers always get an independent copy.
+    Disk writes are queued and written with one ``executemany`` and a single
+    commit per ``flush`` (called per batch chunk, every ``flush_every`` puts
+    and on ``close``), so SQLite commits do not dominate batch runs.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None, flush_every: int = 10000):
+        self.max_entries = max_entries
+        self.path = path
+        self.flush_every = flush_every
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._pending: dict[str, str] = {}  # Disk writes not yet committed
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.commit()
+
+    def make_key(self, calculator, operation: str, *inputs) -> str:
+        payload = [operation, RESULT_FORMAT, factor_version(calculator, inputs)] + [asdict(item) for item in inputs]
+        return canonical_hash(payload)
+
+    def get(self, key: str):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(text)
+
+            if self._db is not None:
+                text = self._pending.get(key)
+                row = (text,) if text is not None else \
+                    self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._store(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value):
+        text = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._store(key, text)
+            if self._db is not None:
+                self._pending[key] = text
+                if len(self._pending) >= self.flush_every:
+                    self._flush()
+
+    def flush(self):
+        """Write the queued results to SQLite in one transaction."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._db is not None and self._pending:
+            self._db.executemany("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", self._pending.items())
+            self._db.commit()
+            self._pending.clear()
+
+    def _store(self, key: str, text: str):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _cached(self, key: str, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def business_emissions(self, calculator, business=None) -> dict:
+        """Cached ``calculate_business_emissions``."""
+        business = business or calculator.business
+        if not business:
+            return {}
+        key = self.make_key(calculator, "business", business)
+        return self._cached(key, lambda: calculator.calculate_business_emissions(business))
+
+    def individual_analysis(self, calculator) -> dict:
+        """Cached ``analyze_individual_emissions``."""
+        if not calculator.household or not calculator.personal:
+            return {}
+        key = self.make_key(calculator, "individual_analysis", calculator.household, calculator.personal)
+        return self._cached(key, calculator.analyze_individual_emissions)
+
+    def total_emissions(self, calculator) -> float:
+        """Cached ``calculate_total_emissions``."""
+        inputs = [item for item in (calculator.household, calculator.personal) if item]
+        key = self.make_key(calculator, "total", *inputs)
+        return self._cached(key, calculator.calculate_total_emissions)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_size = 0
+            if self._db is not None:
+                self._flush()
+                disk_size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "disk_size": disk_size,
+                "max_entries": self.max_entries,
+                "evictions": self.evictions
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+
+_shared_cache = None
+
+
+def configure_shared_cache(max_entries: int = 10000, path: Optional[str] = None) -> ResultCache:
+    """Replace the process-wide cache used by the CLI batch mode, the GUI and services."""
+    global _shared_cache
+    if _shared_cache is not None:
+        _shared_cache.close()
+    _shared_cache = ResultCache(max_entries, path)
+    return _shared_cache
+
+
+def get_shared_cache() -> ResultCache:
+    """Return the process-wide cache, creating an in-memory one on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResultCache()
+    return _shared_cache
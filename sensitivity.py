@@ -0,0 +1,184 @@
+"""Analytic sensitivities of the footprint with respect to every input and emission factor."""
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+
+from batch import KM_PER_MILE, BusinessArrays, IndividualArrays, business_arrays, individual_arrays, \
+    total_emissions_batch
+
+
+@dataclass
+class Sensitivity:
+    """Partial derivatives of the totals of a batch, one column per input or factor.
+
+    ``gradient[i, j]`` is ∂total/∂x at entity ``i``, ``values[i, j]`` the value
+    of ``x`` there. Table factors (``FOOD_MODIFIERS[...]``, ``SPENDING_EMISSIONS``,
+    ``SECTOR_MULTIPLIERS``) refer to the entry the entity actually uses.
+    """
+    names: tuple
+    gradient: np.ndarray
+    values: np.ndarray
+    totals: np.ndarray
+
+    @property
+    def elasticity(self) -> np.ndarray:
+        """% change of the total per % change of each input: ∂T/∂x · x / T."""
+        return np.divide(self.gradient * self.values, self.totals[:, None],
+                         out=np.zeros_like(self.gradient), where=self.totals[:, None] != 0)
+
+    def top_drivers(self, k: int = 5) -> list[list[tuple[str, float]]]:
+        """Return the ``k`` inputs with the largest absolute elasticity for every entity."""
+        elasticity = self.elasticity
+        k = min(k, len(self.names))
+        top = np.argpartition(-np.abs(elasticity), k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.abs(np.take_along_axis(elasticity, top, axis=1)), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return [[(self.names[j], float(elasticity[i, j])) for j in row] for i, row in enumerate(top)]
+
+    def population_drivers(self, k: int = 10) -> list[tuple[str, float]]:
+        """Rank inputs by the elasticity of the population total, Σ ∂T/∂x · x / Σ T."""
+        total = self.totals.sum()
+        elasticity = (self.gradient * self.values).sum(axis=0) / total if total else np.zeros(len(self.names))
+        order = np.argsort(-np.abs(elasticity))[:k]
+        return [(self.names[j], float(elasticity[j])) for j in order]
+
+
+def _build(columns: list, totals: np.ndarray) -> Sensitivity:
+    n = len(totals)
+    return Sensitivity(
+        names=tuple(name for name, _, _ in columns),
+        gradient=np.column_stack([np.broadcast_to(gradient, n) for _, gradient, _ in columns]),
+        values=np.column_stack([np.broadcast_to(value, n) for _, _, value in columns]).astype(np.float64),
+        totals=totals
+    )
+
+
+def individual_sensitivity(arrays: IndividualArrays, calculator) -> Sensitivity:
+    """Gradients of ``calculate_total_emissions`` for a batch of respondents in one pass."""
+    c = calculator
+    per_person = 1 / 1000 / arrays.members  # kg per household -> tonnes per person
+    green = arrays.electricity_green
+    green_adjustment = np.where(green, 1 - c.GREEN_ELECTRICITY_REDUCTION, 1.0)
+    mpg = np.array([c.CAR_MPG[car_type] for car_type in arrays.car_types], dtype=np.float64)
+    gallons = arrays.car_miles * KM_PER_MILE / mpg
+    household_kg = (arrays.electricity_kwh * c.ELECTRICITY_CO2_FACTOR * green_adjustment +
+                    arrays.gas_kwh * c.GAS_CO2_FACTOR + gallons.sum(axis=1) * c.CAR_CO2_FACTOR)
+
+    columns = [
+        ("household.members", -household_kg * per_person / arrays.members, arrays.members),
+        ("household.electricity_kwh", c.ELECTRICITY_CO2_FACTOR * green_adjustment * per_person,
+         arrays.electricity_kwh),
+        ("household.gas_kwh", c.GAS_CO2_FACTOR * per_person, arrays.gas_kwh)
+    ]
+    for j, car_type in enumerate(arrays.car_types):
+        columns.append((f"household.car_mileages[{car_type}]", KM_PER_MILE / mpg[j] * c.CAR_CO2_FACTOR * per_person,
+                        arrays.car_miles[:, j]))
+    columns += [
+        ("personal.bus_miles", c.BUS_CO2_FACTOR / 1000, arrays.bus_miles),
+        ("personal.train_miles", c.TRAIN_CO2_FACTOR / 1000, arrays.train_miles),
+        ("personal.flight_hours", c.FLIGHT_CO2_PER_HOUR, arrays.flight_hours),
+        ("ELECTRICITY_CO2_FACTOR", arrays.electricity_kwh * green_adjustment * per_person, c.ELECTRICITY_CO2_FACTOR),
+        ("GREEN_ELECTRICITY_REDUCTION", -arrays.electricity_kwh * c.ELECTRICITY_CO2_FACTOR * green * per_person,
+         c.GREEN_ELECTRICITY_REDUCTION),
+        ("GAS_CO2_FACTOR", arrays.gas_kwh * per_person, c.GAS_CO2_FACTOR),
+        ("CAR_CO2_FACTOR", gallons.sum(axis=1) * per_person, c.CAR_CO2_FACTOR)
+    ]
+    for j, car_type in enumerate(arrays.car_types):
+        columns.append((f'CAR_MPG["{car_type}"]', -gallons[:, j] * c.CAR_CO2_FACTOR / mpg[j] * per_person, mpg[j]))
+    columns += [
+        ("BUS_CO2_FACTOR", arrays.bus_miles / 1000, c.BUS_CO2_FACTOR),
+        ("TRAIN_CO2_FACTOR", arrays.train_miles / 1000, c.TRAIN_CO2_FACTOR),
+        ("FLIGHT_CO2_PER_HOUR", arrays.flight_hours, c.FLIGHT_CO2_PER_HOUR),
+        ("FOOD_BASE_EMISSIONS", arrays.food_modifier, c.FOOD_BASE_EMISSIONS)
+    ]
+    for j, category in enumerate(arrays.food_categories):
+        others = np.delete(arrays.food_modifiers, j, axis=1).prod(axis=1)
+        columns.append((f"FOOD_MODIFIERS[{category}]", c.FOOD_BASE_EMISSIONS * others, arrays.food_modifiers[:, j]))
+    columns += [
+        ("SPENDING_EMISSIONS", 1.0, arrays.spending),
+        ("PUBLIC_SERVICES_EMISSIONS", 1.0, c.PUBLIC_SERVICES_EMISSIONS)
+    ]
+    return _build(columns, total_emissions_batch(arrays, calculator))
+
+
+def business_sensitivity(arrays: BusinessArrays, calculator) -> Sensitivity:
+    """Gradients of ``calculate_business_emissions()["toplam"]`` for a batch of businesses in one pass."""
+    c = calculator
+    activity, factor = arrays.activity, arrays.factor
+    adjustment = arrays.sector_multiplier * (1 - arrays.renewable_share)
+    subtotal = (activity * factor).sum(axis=1)
+    green_adjustment = np.where(arrays.green, 1 - c.GREEN_ELECTRICITY_REDUCTION, 1.0)
+    flat_electricity = ~arrays.hourly_electricity
+    hour_based_flights = ~arrays.route_flights
+    mpg = np.array([c.CAR_MPG[car_type] for car_type in arrays.car_types], dtype=np.float64)
+    gallons = arrays.vehicle_miles * KM_PER_MILE / mpg
+
+    columns = [
+        ("business.office_space_sqft", factor[:, 0] * adjustment, activity[:, 0]),
+        ("business.electricity_kwh", np.where(flat_electricity, factor[:, 1] * adjustment, 0.0),
+         np.where(flat_electricity, activity[:, 1], 0.0)),
+        ("business.gas_kwh", factor[:, 2] * adjustment, activity[:, 2])
+    ]
+    for j, car_type in enumerate(arrays.car_types):
+        columns.append((f"business.company_vehicles[{car_type}]",
+                        KM_PER_MILE / mpg[j] * c.CAR_CO2_FACTOR / 1000 * adjustment, arrays.vehicle_miles[:, j]))
+    columns += [
+        ("business.air_travel_hours", np.where(hour_based_flights, factor[:, 4] * adjustment, 0.0),
+         np.where(hour_based_flights, activity[:, 4], 0.0)),
+        ("business.num_employees", factor[:, 5] * adjustment, activity[:, 5]),
+        ("business.data_center_usage", factor[:, 6] * adjustment, activity[:, 6]),
+        ("business.procurement_spend", factor[:, 7] * adjustment, activity[:, 7]),
+        ("business.renewable_energy_percent", -subtotal * arrays.sector_multiplier / 100,
+         arrays.renewable_share * 100),
+        ("OFFICE_SPACE_CO2_FACTOR", activity[:, 0] * adjustment, c.OFFICE_SPACE_CO2_FACTOR),
+        ("ELECTRICITY_CO2_FACTOR", np.where(flat_electricity, activity[:, 1] * green_adjustment / 1000, 0.0) * adjustment,
+         c.ELECTRICITY_CO2_FACTOR),
+        ("GREEN_ELECTRICITY_REDUCTION",
+         -np.where(arrays.green, activity[:, 1] * arrays.grid_factor, 0.0) * adjustment,
+         c.GREEN_ELECTRICITY_REDUCTION),
+        ("GAS_CO2_FACTOR", activity[:, 2] / 1000 * adjustment, c.GAS_CO2_FACTOR),
+        ("CAR_CO2_FACTOR", gallons.sum(axis=1) / 1000 * adjustment, c.CAR_CO2_FACTOR)
+    ]
+    for j, car_type in enumerate(arrays.car_types):
+        columns.append((f'CAR_MPG["{car_type}"]', -gallons[:, j] * c.CAR_CO2_FACTOR / mpg[j] / 1000 * adjustment,
+                        mpg[j]))
+    columns += [
+        ("FLIGHT_CO2_PER_HOUR", np.where(hour_based_flights, activity[:, 4], 0.0) * adjustment, c.FLIGHT_CO2_PER_HOUR),
+        ("EMPLOYEE_CO2_FACTOR", activity[:, 5] * adjustment, c.EMPLOYEE_CO2_FACTOR),
+        ("DATA_CENTER_CO2_FACTOR", activity[:, 6] * adjustment, c.DATA_CENTER_CO2_FACTOR),
+        ("SECTOR_MULTIPLIERS", subtotal * (1 - arrays.renewable_share), arrays.sector_multiplier)
+    ]
+    return _build(columns, subtotal * adjustment)
+
+
+def main():
+    from son import CarbonCalculator, load_records
+    from validation import build_validators, validate_records
+
+    parser = argparse.ArgumentParser(description="Toplu kayıtlarda sonucun en duyarlı olduğu girdileri sıralar")
+    parser.add_argument("input", help="'son.py batch' biçiminde JSONL dosyası")
+    parser.add_argument("--top", type=int, default=10, help="Gösterilecek girdi sayısı")
+    args = parser.parse_args()
+
+    calculator = CarbonCalculator()
+    records = [record if record is not None else {"type": None} for _, record in load_records(args.input)]
+    report = validate_records(records, build_validators(calculator))
+    valid = [inputs for inputs in report.records if inputs is not None]
+
+    pairs = [(inputs["household"], inputs["personal"]) for inputs in valid if inputs["type"] == "individual"]
+    businesses = [inputs["business"] for inputs in valid if inputs["type"] == "business"]
+    for title, count, sensitivity in [
+        ("Bireysel", len(pairs), pairs and individual_sensitivity(individual_arrays(pairs, calculator), calculator)),
+        ("İşletme", len(businesses),
+         businesses and business_sensitivity(business_arrays(businesses, calculator), calculator))
+    ]:
+        if not count:
+            continue
+        print(f"\n{title} ({count} kayıt) - toplam emisyonun esnekliği:")
+        for name, elasticity in sensitivity.population_drivers(args.top):
+            print(f"  {name:<42} {elasticity:+.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Factor packs and comparison records in one shared-memory block for worker pools."""
+import argparse
+import json
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from comparison_store import STORE_PATH, ComparisonStore, build_records, open_store
+from factor_packs import DEFAULT_PACK, FactorPack, _freeze, get_registry
+
+_HEADER = struct.Struct("<8sQ")  # magic, metadata length
+_MAGIC = b"KAIZTBL1"
+_ALIGN = 64
+
+
+def _thaw(value):
+    """Turn a pack's read-only mappings back into plain dicts for serialization."""
+    if hasattr(value, "items"):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+class SharedTables:
+    """Read-only factor packs and comparison records shared by every worker of a pool.
+
+    The parent ``publish``es the tables once: pack factors as JSON metadata and
+    the comparison records as one aligned numpy block. Workers ``attach`` by
+    name and get non-writeable views into the same pages, so nothing is
+    re-read from CSV/JSON and no per-worker copy is made, no matter how many
+    workers are forked.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        size, = _HEADER.unpack_from(shm.buf, 0)[1:]
+        metadata = json.loads(bytes(shm.buf[_HEADER.size:_HEADER.size + size]).decode('utf-8'))
+        self.default_pack = metadata["default"]
+        self._pack_data = metadata["packs"]
+        self._packs: dict[str, FactorPack] = {}
+
+        layout = metadata["records"]
+        self.comparison = None
+        if layout is not None:
+            records = np.ndarray(layout["count"], dtype=np.dtype([tuple(field) for field in layout["dtype"]]),
+                                 buffer=shm.buf, offset=layout["offset"])
+            records.flags.writeable = False
+            self.comparison = ComparisonStore.from_records(records, metadata["groups"])
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def publish(cls, codes: Optional[list] = None, default: str = DEFAULT_PACK,
+                cities_csv: str = "Cities.csv", countries_csv: str = "Countries.csv",
+                store_path: str = STORE_PATH) -> "SharedTables":
+        """Create the block from the registry's packs and ``comparison.npy`` (or the CSVs)."""
+        registry = get_registry()
+        packs = {code: registry.get(code) for code in (codes or registry.codes())}
+        packs.setdefault(default, registry.get(default))
+
+        store = open_store(store_path)
+        if store is not None:
+            records, groups = np.ascontiguousarray(store.records), store.groups_list()
+        elif os.path.exists(cities_csv) and os.path.exists(countries_csv):
+            records, groups = build_records(cities_csv, countries_csv)
+        else:
+            records, groups = None, []
+
+        metadata = {
+            "default": default,
+            "packs": {code: {"name": pack.name, "version": pack.version, "fingerprint": pack.fingerprint,
+                             "factors": _thaw(pack.factors)} for code, pack in packs.items()},
+            "groups": groups,
+            "records": None
+        }
+        # The records offset depends on the metadata length, so size it with a placeholder first
+        if records is not None:
+            metadata["records"] = {"offset": 0, "count": len(records), "dtype": records.dtype.descr}
+            length = len(json.dumps(metadata, ensure_ascii=False).encode('utf-8')) + 32
+            offset = -(-(_HEADER.size + length) // _ALIGN) * _ALIGN
+            metadata["records"]["offset"] = offset
+        encoded = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+        size = _HEADER.size + len(encoded) if records is None else metadata["records"]["offset"] + records.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, len(encoded))
+        shm.buf[_HEADER.size:_HEADER.size + len(encoded)] = encoded
+        if records is not None:
+            offset = metadata["records"]["offset"]
+            shm.buf[offset:offset + records.nbytes] = records.tobytes()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedTables":
+        """Map an existing block read-only; the publisher stays responsible for unlinking it."""
+        shm = shared_memory.SharedMemory(name=name)
+        if _HEADER.unpack_from(shm.buf, 0)[0] != _MAGIC:
+            shm.close()
+            raise ValueError(f"Paylaşılan bellek bloğu tablo biçiminde değil: {name}")
+        return cls(shm, owner=False)
+
+    def pack(self, code: Optional[str] = None) -> FactorPack:
+        code = code or self.default_pack
+        pack = self._packs.get(code)
+        if pack is None:
+            try:
+                data = self._pack_data[code]
+            except KeyError:
+                raise KeyError(f"Paylaşılan tablolarda olmayan katsayı paketi: {code}") from None
+            # Already validated by the publisher; keep its fingerprint so cache keys match across processes
+            pack = self._packs[code] = FactorPack(code=code, name=data["name"], version=data["version"],
+                                                  fingerprint=data["fingerprint"], factors=_freeze(data["factors"]))
+        return pack
+
+    def calculator(self, code: Optional[str] = None):
+        """Return a ``CarbonCalculator`` bound to a shared pack and the shared comparison records."""
+        from son import CarbonCalculator
+
+        calculator = CarbonCalculator(self.pack(code))
+        calculator.comparison_store = self.comparison
+        return calculator
+
+    def close(self):
+        """Drop the views and unmap the block; the publisher also unlinks it."""
+        self.comparison = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-worker state, created once by init_worker
+_tables = None
+
+
+def init_worker(name: str):
+    """``ProcessPoolExecutor`` initializer: attach to the tables published under ``name``."""
+    global _tables
+    _tables = SharedTables.attach(name)
+
+
+def worker_tables() -> SharedTables:
+    if _tables is None:
+        raise RuntimeError("Bu süreç paylaşılan tablolara bağlı değil (init_worker çağrılmadı)")
+    return _tables
+
+
+def _private_memory_kb() -> int:
+    """Private (not shared with the parent) resident memory of this process, in kB."""
+    try:
+        with open("/proc/self/smaps_rollup", encoding='utf-8') as f:
+            return sum(int(line.split()[1]) for line in f if line.startswith(("Private_Clean", "Private_Dirty")))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else 0
+
+
+def _private_probe(_):
+    from son import CarbonCalculator
+
+    start = time.perf_counter()
+    calculator = CarbonCalculator()
+    calculator.load_comparison_data(10.0)
+    return os.getpid(), time.perf_counter() - start, _private_memory_kb()
+
+
+def _shared_probe(_):
+    start = time.perf_counter()
+    worker_tables().calculator().load_comparison_data(10.0)
+    return os.getpid(), time.perf_counter() - start, _private_memory_kb()
+
+
+def probe_pool(workers: int, shared: Optional[SharedTables] = None) -> dict:
+    """Start a pool, run one setup probe per worker and report spawn time and private memory."""
+    start = time.perf_counter()
+    initializer, initargs, probe = (None, (), _private_probe) if shared is None else \
+        (init_worker, (shared.name,), _shared_probe)
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        results = list(executor.map(probe, range(workers)))
+    elapsed = time.perf_counter() - start
+    return {
+        "workers": len({pid for pid, _, _ in results}),
+        "seconds": elapsed,
+        "setup_ms": max(seconds for _, seconds, _ in results) * 1000,
+        "private_mb": max(memory for _, _, memory in results) / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paylaşılan tablolarla ve tablosuz işçi havuzlarını karşılaştırır")
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with SharedTables.publish() as tables:
+        print(f"{'işçi':>5} {'mod':<10} {'süre (sn)':>10} {'kurulum (ms)':>13} {'özel bellek (MB)':>17}")
+        for workers in args.workers:
+            for mode, shared in (("ayrı", None), ("paylaşılan", tables)):
+                stats = probe_pool(workers, shared)
+                print(f"{workers:>5} {mode:<10} {stats['seconds']:>10.2f} {stats['setup_ms']:>13.1f} "
+                      f"{stats['private_mb']:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,58 @@
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
+import argparse
+import json
+import sys
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from comparison_store import KIND_CITY, KIND_COUNTRY, open_store, to_frame
+from factor_packs import FactorPack, get_registry
+from result_cache import configure_shared_cache
+from templates import DEFAULT_LANGUAGE, LANGUAGES, get_catalog, render_business, render_comparison_table, \
+    render_individual, render_report
+
+# Kişisel bilgiler için seçenek etiketleri (CLI, GUI ve toplu doğrulama ortak kullanır)
+PERSONAL_CHOICES = {
+    "organic_food": ["Hiçbiri", "Bazıları", "Çoğu", "Hepsi"],
+    "meat_dairy": ["Ortalamanın üstünde et/süt", "Ortalama et/süt",
+                   "Ortalamanın altında et/süt", "Lakto-vejetaryen", "Vegan"],
+    "local_food": ["Çok azı", "Ortalama", "Ortalamanın üzerinde", "Tamamı"],
+    "processed_food": ["Ortalamanın üzerinde", "Ortalama", "Ortalamanın altında", "Çok az"],
+    "composting": ["Hiç", "Bazen", "Her zaman"],
+    "food_waste": ["Ortalamanın üzerinde(50% çok)", "Ortalama",
+                   "Ortalamanın altında (50% az)", "Çok az (90% az)"],
+    "spending": ["Ortalamanın Üstünde (5 ton CO2)", "Ortalama (3.4 ton CO2)",
+                 "Ortalamanın Altında (2.4 ton CO2)", "Ortalamanın Çok Altında (1.4 ton CO2)"]
+}
+
+# Karşılaştırma grafiklerinde gösterilecek en yakın konum sayısı
+COMPARISON_TOP_N = 20
+
+# Sonuçlarda gösterilecek en fazla öneri sayısı
+RECOMMENDATIONS_TOP_K = 3
+
+SUPPLY_CHAIN_OPTIONS = [
+    "Değerlendirme yok",
+    "Temel değerlendirme",
+    "Bazı tedarikçilerle kapsamlı değerlendirme",
+    "Tüm tedarikçilerle tam değerlendirme"
+]
+
+# GHG Protokolü kapsamları: 1 doğrudan yakma, 2 satın alınan enerji, 3 değer zinciri
+BUSINESS_SCOPES = {
+    "bina": 3,
+    "elektrik": 2,
+    "dogalgaz": 1,
+    "araclar": 1,
+    "hava_yolculugu": 3,
+    "calisanlar": 3,
+    "veri_merkezi": 2,
+    "tedarik_zinciri": 3
+}
+
 
 @dataclass
 class Household:
@@ -47,45 +96,88 @@ class Business:
     data_center_usage: float
     supply_chain_assessment: str
     renewable_energy_percent: float
+    electricity_profile: Optional[list[float]] = None  # Hourly kWh for interval meters (8760 values, 8784 in a leap year)
+    grid_region: Optional[str] = None
+    grid_year: Optional[int] = None
+    procurement_spend: Optional[dict[str, float]] = None  # Yearly purchases per supplier sector
+    travel_legs: Optional[list[dict]] = None  # Flights as {"origin", "destination", "cabin", "count"}
+
+
+@dataclass
+class IndividualResult:
+    """Bireysel hesaplamanın dilden bağımsız sonucu; metinler ``templates`` ile oluşturulur."""
+    total: float  # Kategorilerin toplamı
+    annual_total: float  # calculate_total_emissions() sonucu (raporda kullanılır)
+    emissions: dict[str, float]
+    percentages: dict[str, float]
+    comparison: dict[str, float]
+    region: str  # Ortalamaların bölge kodu (AVERAGES_LABEL)
+    average: float  # Bölgenin kişi başı ortalaması (INDIVIDUAL_AVERAGES toplamı)
+    actions: list  # (eylem anahtarı, yıllık tasarruf tonu), en çok tasarruf sağlayan önce
+    priorities: tuple  # Ortalamanın üzerindeki en yüksek iki kategori
+
+
+@dataclass
+class BusinessResult:
+    """İşletme hesaplamasının dilden bağımsız sonucu."""
+    name: str
+    sector: str
+    emissions: dict[str, float]
+    scopes: dict[str, float]
+    categories: dict[str, float]  # Ayarlamaların dağıtıldığı kategoriler (allocate_scopes), toplamı ``toplam``
+    per_employee: float
+    actions: list  # (eylem anahtarı, yıllık tasarruf tonu), en çok tasarruf sağlayan önce
+    sector_count: int = 0
+    sector_percentiles: Optional[dict[str, float]] = None
+
+    @property
+    def total(self) -> float:
+        return self.emissions["toplam"]
 
 
 class CarbonCalculator:
-    def __init__(self):
+    def __init__(self, factors: Optional[FactorPack] = None):
         self.household = None
         self.personal = None
         self.business = None
         self.calculator_type = None
-
-        # Constants for individual calculations
-        self.ELECTRICITY_CO2_FACTOR = 0.309  # kg CO2 per kWh
-        self.GREEN_ELECTRICITY_REDUCTION = 0.25  # 25% reduction for green tariffs
-        self.GAS_CO2_FACTOR = 0.203  # kg CO2 per kWh
-        self.CAR_CO2_FACTOR = 14.3  # kg CO2 per gallon
-
-        # Constants for business calculations
-        self.OFFICE_SPACE_CO2_FACTOR = 0.05  # tonnes CO2 per sq ft per year
-        self.EMPLOYEE_CO2_FACTOR = 2.5  # tonnes CO2 per employee per year
-        self.DATA_CENTER_CO2_FACTOR = 0.000475  # tonnes CO2 per kWh
-
-        # Car fuel efficiency (mpg) by type
-        self.CAR_MPG = {
-            "küçük": 52,
-            "orta": 46,
-            "büyük": 35
-        }
-
-        # Business sectors and their multipliers
-        self.SECTOR_MULTIPLIERS = {
-            "Teknoloji": 1.0,
-            "Üretim": 1.8,
-            "Perakende": 1.2,
-            "Sağlık": 1.3,
-            "Finansal Hizmetler": 0.9,
-            "İnşaat": 1.6,
-            "Ulaşım": 2.0,
-            "Tarım": 1.7,
-            "Diğer": 1.0
-        }
+        self.grid_intensity = None  # Optional GridIntensityProvider for hourly electricity factors
+        self.benchmark = None  # Optional SectorBenchmark of previously scored companies
+        self.supply_chain = None  # Optional EEIOTable for supply-chain emissions from procurement spend
+        self.flights = None  # Optional FlightEmissions for route-based business travel
+        self.population = None  # Optional PopulationAggregate whose group means replace the comparison CSVs
+        self.comparison_store = None  # Optional ComparisonStore used instead of comparison.npy (e.g. shared memory)
+        self.language = DEFAULT_LANGUAGE  # Output language of displays, charts and reports
+
+        # Emission factors (ELECTRICITY_CO2_FACTOR, CAR_MPG, SECTOR_MULTIPLIERS, ...) come from
+        # a compiled factor pack in factors/<CODE>.json; the default pack is the UK one
+        self.use_factors(factors or get_registry().get())
+
+    def use_factors(self, pack: FactorPack):
+        """Bind a factor pack's values as attributes, so calculations pay no per-call lookup cost."""
+        self.factors = pack
+        for name, value in pack.factors.items():
+            setattr(self, name, value)
+
+    def refresh_factors(self, registry=None) -> bool:
+        """Reload edited pack files and rebind the current pack if it changed; return whether it did.
+
+        A long-running process (GUI, batch) calls this between calculations, so
+        edits to ``factors/<CODE>.json`` apply without a restart.
+        """
+        registry = registry or get_registry()
+        registry.reload()
+        if self.factors.code not in registry.codes():
+            return False
+        pack = registry.get(self.factors.code)
+        if pack.fingerprint == self.factors.fingerprint:
+            return False
+        self.use_factors(pack)
+        return True
+
+    @property
+    def catalog(self):
+        return get_catalog(self.language)
 
     def get_calculator_type(self):
         """Kullanılacak hesaplayıcı türünü alır."""
@@ -172,7 +264,7 @@ class CarbonCalculator:
         car_mileages = {}
 
         if num_cars > 0:
-            car_types = ["küçük", "orta", "büyük"]
+            car_types = list(self.CAR_MPG.keys())
             for i in range(num_cars):
                 car_type = self.get_choice_input(f"Araç tipini seçin {i + 1}:", car_types)
                 mileage = self.get_float_input(f"Aracın yıllık kilometresini girin {i + 1}: ")
@@ -193,25 +285,14 @@ class CarbonCalculator:
         print("\n=== Kişisel Bilgiler ===")
 
         # Food choices
-        organic_options = ["Hiçbiri", "Bazıları", "Çoğu", "Hepsi"]
-        organic_food = self.get_choice_input("Gıdalarınızın ne kadarı organik?", organic_options)
-
-        meat_dairy_options = ["Ortalamanın üstünde et/süt", "Ortalama et/süt",
-                              "Ortalamanın altında et/süt", "Lakto-vejetaryen", "Vegan"]
-        meat_dairy = self.get_choice_input("Et/süt tüketiminiz nedir?", meat_dairy_options)
-
-        local_food_options = ["Çok azı", "Ortalama", "Ortalamanın üzerinde", "Tamamı"]
-        local_food = self.get_choice_input("Gıdalarınızın ne kadarı yerel olarak üretiliyor?", local_food_options)
-
-        processed_food_options = ["Ortalamanın üzerinde", "Ortalama", "Ortalamanın altında", "Çok az"]
-        processed_food = self.get_choice_input("Gıdalarınızın ne kadarı paketli/işlenmiş?", processed_food_options)
-
-        composting_options = ["Hiç", "Bazen", "Her zaman"]
-        composting = self.get_choice_input("Ne sıklıkla kompost yapıyorsunuz?", composting_options)
-
-        food_waste_options = ["Ortalamanın üzerinde(50% çok)", "Ortalama",
-                              "Ortalamanın altında (50% az)", "Çok az (90% az)"]
-        food_waste = self.get_choice_input("Ne kadar gıda israf ediyorsunuz?", food_waste_options)
+        organic_food = self.get_choice_input("Gıdalarınızın ne kadarı organik?", PERSONAL_CHOICES["organic_food"])
+        meat_dairy = self.get_choice_input("Et/süt tüketiminiz nedir?", PERSONAL_CHOICES["meat_dairy"])
+        local_food = self.get_choice_input("Gıdalarınızın ne kadarı yerel olarak üretiliyor?",
+                                           PERSONAL_CHOICES["local_food"])
+        processed_food = self.get_choice_input("Gıdalarınızın ne kadarı paketli/işlenmiş?",
+                                               PERSONAL_CHOICES["processed_food"])
+        composting = self.get_choice_input("Ne sıklıkla kompost yapıyorsunuz?", PERSONAL_CHOICES["composting"])
+        food_waste = self.get_choice_input("Ne kadar gıda israf ediyorsunuz?", PERSONAL_CHOICES["food_waste"])
 
         # Transportation
         bus_miles = self.get_float_input("Yıllık otobüs yolculuğu mesafenizi km cinsinden girin: ", 0)
@@ -219,9 +300,7 @@ class CarbonCalculator:
         flight_hours = self.get_float_input("Geçen yılki toplam uçuş saatinizi girin:  ", 0)
 
         # Lifestyle
-        spending_options = ["Ortalamanın Üstünde (5 ton CO2)", "Ortalama (3.4 ton CO2)",
-                            "Ortalamanın Altında (2.4 ton CO2)", "Ortalamanın Çok Altında (1.4 ton CO2)"]
-        spending = self.get_choice_input("Diğer harcamalarınız ne seviyede?", spending_options)
+        spending = self.get_choice_input("Diğer harcamalarınız ne seviyede?", PERSONAL_CHOICES["spending"])
 
         recycles_basic = self.get_yes_no_input("Kağıt, cam ve metali geri dönüştürüyor musunuz?")
         recycles_plastic = self.get_yes_no_input("Poşetler dışında plastiği geri dönüştürüyor musunuz?")
@@ -271,31 +350,22 @@ class CarbonCalculator:
             return 0
 
         # Food emissions based on choices
-        food_emissions = 2.2  # Base food emissions in tonnes
-
-        # Modify based on choices
-        food_modifiers = {
-            "organic_food": {"Hiçbiri": 1.0, "Bazıları": 0.9, "Çoğu": 0.7, "Hepsi": 0.5},
-            "meat_dairy": {"Ortalamanın üstünde et/süt": 1.2, "Ortalama et/süt": 1.0,
-                           "Ortalamanın altında et/süt": 0.8, "Lakto-vejetaryen": 0.5, "Vegan": 0.3},
-            "local_food": {"Çok azı": 1.2, "Ortalama": 1.0, "Ortalamanın üzerinde": 0.8, "Tamamıl": 0.6},
-            "processed_food": {"Ortalamanın üzerinde": 1.2, "Ortalama": 1.0, "Ortalamanın altında": 0.8, "Çok az": 0.6}
-        }
+        food_emissions = self.FOOD_BASE_EMISSIONS  # Base food emissions in tonnes
 
-        for category, modifiers in food_modifiers.items():
+        for category, modifiers in self.FOOD_MODIFIERS.items():
             choice = getattr(self.personal, category)
             food_emissions *= modifiers[choice]
 
         # Transport emissions
-        bus_emissions = self.personal.bus_miles * 0.1 / 1000  # 100g/mile
-        train_emissions = self.personal.train_miles * 0.1 / 1000  # 100g/mile
-        flight_emissions = self.personal.flight_hours * 0.25  # 0.25 tonnes/hour
+        bus_emissions = self.personal.bus_miles * self.BUS_CO2_FACTOR / 1000  # kg/mile
+        train_emissions = self.personal.train_miles * self.TRAIN_CO2_FACTOR / 1000  # kg/mile
+        flight_emissions = self.personal.flight_hours * self.FLIGHT_CO2_PER_HOUR  # tonnes/hour
 
         # Spending emissions (already in tonnes)
-        spending_emissions = float(self.personal.spending.split("(")[1].split(" ")[0])
+        spending_emissions = self.SPENDING_EMISSIONS[self.personal.spending]
 
         # Public services (constant)
-        public_services = 1.1  # tonnes
+        public_services = self.PUBLIC_SERVICES_EMISSIONS  # tonnes
 
         return food_emissions + bus_emissions + train_emissions + flight_emissions + spending_emissions + \
             public_services
@@ -326,78 +396,80 @@ class CarbonCalculator:
             transport += (gallons * self.CAR_CO2_FACTOR) / 1000 / self.household.members
 
         # Add public transport
-        transport += (self.personal.bus_miles * 0.1 / 1000)  # Bus
-        transport += (self.personal.train_miles * 0.1 / 1000)  # Train
-        transport += (self.personal.flight_hours * 0.25)  # Flights
+        transport += (self.personal.bus_miles * self.BUS_CO2_FACTOR / 1000)  # Bus
+        transport += (self.personal.train_miles * self.TRAIN_CO2_FACTOR / 1000)  # Train
+        transport += (self.personal.flight_hours * self.FLIGHT_CO2_PER_HOUR)  # Flights
 
         # Food emissions calculation
-        food_base = 2.2  # Base food emissions in tonnes
-        food_modifiers = {
-            "organic_food": {"Hiçbiri": 1.0, "Bazıları": 0.9, "Çoğu": 0.7, "Hepsi": 0.5},
-            "meat_dairy": {"Ortalamanın üstünde et/süt": 1.2, "Ortalama et/süt": 1.0,
-                           "Ortalamanın altında et/süt": 0.8, "Lakto-vejetaryen": 0.5, "Vegan": 0.3},
-            "local_food": {"Çok azı": 1.2, "Ortalama": 1.0, "Ortalamanın üzerinde": 0.8, "Tamamıl": 0.6},
-            "processed_food": {"Ortalamanın üzerinde": 1.2, "Ortalama": 1.0, "Ortalamanın altında": 0.8, "Çok az": 0.6}
-        }
+        food_base = self.FOOD_BASE_EMISSIONS  # Base food emissions in tonnes
 
         food_emissions = food_base
-        for category, modifiers in food_modifiers.items():
+        for category, modifiers in self.FOOD_MODIFIERS.items():
             choice = getattr(self.personal, category)
             food_emissions *= modifiers[choice]
 
         # Get spending emissions
-        spending = float(self.personal.spending.split("(")[1].split(" ")[0])
+        spending = self.SPENDING_EMISSIONS[self.personal.spending]
 
         # Public services (constant)
-        public_services = 1.1
-
-        # Reference averages (UK)
-        averages = {
-            "ev_enerjisi": 2.5,
-            "ulasim": 3.0,
-            "gida": 2.2,
-            "harcama": 3.4,
-            "kamu_hizmetleri": 1.1
-        }
+        public_services = self.PUBLIC_SERVICES_EMISSIONS
+
+        # Reference averages of the factor pack (UK by default)
+        averages = dict(self.INDIVIDUAL_AVERAGES)
 
         # Calculate percentages of total
         total = household_energy + transport + food_emissions + spending + public_services
         percentages = {
-            "Ev Enerjisi": (household_energy / total) * 100,
-            "Ulaşım": (transport / total) * 100,
-            "Gıda": (food_emissions / total) * 100,
-            "Tüketici Harcaması": (spending / total) * 100,
-            "Kamu Hizmetleri": (public_services / total) * 100
+            "ev_enerjisi": (household_energy / total) * 100,
+            "ulasim": (transport / total) * 100,
+            "gida": (food_emissions / total) * 100,
+            "harcama": (spending / total) * 100,
+            "kamu_hizmetleri": (public_services / total) * 100
         }
 
         # Compare with averages to identify high-impact areas
         comparison = {
-            "Ev Enerjisi": household_energy / averages["ev_enerjisi"],
-            "Ulaşım": transport / averages["ulasim"],
-            "Gıda": food_emissions / averages["gida"],
-            "Tüketici Harcaması": spending / averages["harcama"],
-            "Kamu Hizmetleri": 1.0  # Always 1.0 as it's constant
+            "ev_enerjisi": household_energy / averages["ev_enerjisi"],
+            "ulasim": transport / averages["ulasim"],
+            "gida": food_emissions / averages["gida"],
+            "harcama": spending / averages["harcama"],
+            "kamu_hizmetleri": 1.0  # Always 1.0 as it's constant
         }
 
         return {
             "emissions": {
-                "Ev Enerjisi": household_energy,
-                "Ulaşım": transport,
-                "Gıda": food_emissions,
-                "Tüketici Harcaması": spending,
-                "Kamu Hizmetleri": public_services
+                "ev_enerjisi": household_energy,
+                "ulasim": transport,
+                "gida": food_emissions,
+                "harcama": spending,
+                "kamu_hizmetleri": public_services
             },
             "percentages": percentages,
             "comparison": comparison,
             "averages": averages
         }
 
-    def load_comparison_data(self):
-        """Load and combine city and country comparison data with better error handling."""
+    def load_comparison_data(self, user_emissions: Optional[float] = None, top_n: int = COMPARISON_TOP_N):
+        """Load and combine city and country comparison data with better error handling.
+
+        Uses ``self.population`` (group means of a ``PopulationAggregate``) when set, then
+        ``self.comparison_store`` or the columnar store built by ``comparison_store.py`` when it
+        exists, otherwise the CSV files.
+        With ``user_emissions`` only the ``top_n`` closest locations are returned.
+        """
+        if self.population is not None:
+            return self._nearest(self.population.to_comparison_frame(), user_emissions, top_n)
+
+        store = self.comparison_store if self.comparison_store is not None else open_store()
+        if store is not None:
+            if user_emissions is not None:
+                return to_frame(store.top_relevant(user_emissions, top_n))
+            return to_frame(np.concatenate([store.select(KIND_CITY), store.select(KIND_COUNTRY)]))
+
         try:
-            # Read CSV files without specifying usecols to see what columns are actually present
-            cities_df = pd.read_csv("Cities.csv")
-            countries_df = pd.read_csv("Countries.csv")
+            # Read CSV files without a header row; a header line, if present, is dropped below as non-numeric
+            cities_df = pd.read_csv("Cities.csv", header=None, encoding="utf-8-sig")
+            countries_df = pd.read_csv("Countries.csv", header=None, encoding="utf-8-sig")
 
             # Select and rename columns based on actual column names
             # Modify these column names to match your actual CSV files
@@ -417,9 +489,9 @@ class CarbonCalculator:
             countries_df = countries_df.dropna()
 
             # Combine the dataframes
-            combined_df = pd.concat([cities_df, countries_df], axis=0)
+            combined_df = pd.concat([cities_df, countries_df], axis=0, ignore_index=True)
 
-            return combined_df
+            return self._nearest(combined_df, user_emissions, top_n)
 
         except FileNotFoundError:
             print("Hata: CSV dosyalarından biri veya her ikisi bulunamadı. Lütfen dosya yollarını kontrol edin.")
@@ -432,91 +504,65 @@ class CarbonCalculator:
             print("-  İkinci sütun CO2 değerlerini içermelidir")
             return None
 
+    @staticmethod
+    def _nearest(combined_df, user_emissions: Optional[float], top_n: int):
+        if user_emissions is not None and len(combined_df) > top_n:
+            nearest = (combined_df['CO2'] - user_emissions).abs().nsmallest(top_n).index
+            combined_df = combined_df.loc[nearest.sort_values()]
+        return combined_df
+
     def compare_emissions(self, user_emissions, combined_df):
         """Compare user emissions with cities and countries."""
-        # Add user's footprint to the dataframe
-        combined_df.loc['Sizin Ayak İziniz'] = {'Konum': 'Sizin Ayak İziniz', 'CO2': user_emissions}
-
-        # Sort by location name
-        combined_df = combined_df.sort_values('Konum')
-
-        # Print formatted comparison table
-        print("\nEmisyon Karşılaştırması (kişi başına ton CO2e):")
-        print("-" * 45)
-        print(f"{'Konum':<25} {'CO2 Emisyonları':>15}")
-        print("-" * 45)
-
-        for index, row in combined_df.iterrows():
-            location = row['Konum']
-            co2 = row['CO2']
-
-            # Highlight user's footprint
-            if location == 'Sizin Ayak İziniz':
-                print(f">>> {location:<22} {co2:>15.1f} <<<")
-            else:
-                print(f"{location:<25} {co2:>15.1f}")
-
-        print("-" * 45)
-
-    def display_results(self):
-        """Gelişmiş hesaplama sonuçlarını kategori analiziyle görüntüler."""
-        analysis = self.analyze_individual_emissions()
-        total = sum(analysis["emissions"].values())
-
-        print("\n=== Karbon Ayak İzi Sonuçlarınız ===")
-        print(f"Toplam yıllık emisyonlar: {total:.1f} ton CO2e")
-
-        print("\nKategoriye göre dağılım:")
-        print("-" * 50)
-        for category, emission in analysis["emissions"].items():
-            percentage = analysis["percentages"][category]
-            comparison = analysis["comparison"][category]
-
-            print(f"\n{category}:")
-            print(f"  Emisyonlar: {emission:.1f} ton CO2e (toplamınızın %{percentage:.1f}'si)")
-            print(f"  Birleşik Krallık ortalamasına kıyasla: {comparison:.1f} kat")
-
-            # Kategoriye özgü bilgiler ekleyin
-            if comparison > 1.2:  # Ortalamanın %20'sinden fazla
-                if category == "Ev Enerjisi":
-                    print("  • Enerji verimliliği iyileştirmelerini göz önünde bulundurun")
-                    print("  • Yeşil enerji sağlayıcılarına bakın")
-                elif category == "Ulaşım":
-                    print("  • Araba kullanımını azaltmayı veya elektrikli araçlara geçmeyi düşünün")
-                    print("  • Hava yolculuğuna alternatifler arayın")
-                elif category == "Gıda":
-                    print("  • Et tüketimini azaltmayı düşünün")
-                    print("  • Daha fazla yerel ve mevsimlik gıda satın alın")
-                elif category == "Tüketici Harcaması":
-                    print("  • Tüketimi azaltmanın yollarını arayın")
-                    print("  • İkinci el veya tamir seçeneklerini göz önünde bulundurun")
-        # İyileştirme için en önemli alanları belirleyin
-        high_impact_areas = sorted(
-            [(k, v) for k, v in analysis["comparison"].items() if k != "Kamu Hizmetleri"],
-            key=lambda x: x[1],
-            reverse=True
+        print(render_comparison_table(user_emissions, combined_df, self.catalog))
+
+    def individual_result(self, cache=None) -> IndividualResult:
+        """Analizi bir kez hesaplayıp görüntüleme ve rapor için sonuç nesnesine dönüştürür.
+
+        ``cache`` (ResultCache) verilirse analiz ve yıllık toplam önbellekten okunur.
+        """
+        from batch import individual_arrays
+        from recommendations import individual_recommendations
+
+        analysis = cache.individual_analysis(self) if cache is not None else self.analyze_individual_emissions()
+        comparison = analysis["comparison"]
+        # İyileştirme için en önemli alanlar (kamu hizmetleri sabit olduğundan hariç)
+        high_impact_areas = sorted([(k, v) for k, v in comparison.items() if k != "kamu_hizmetleri"],
+                                   key=lambda x: x[1], reverse=True)
+        return IndividualResult(
+            total=sum(analysis["emissions"].values()),
+            annual_total=cache.total_emissions(self) if cache is not None else self.calculate_total_emissions(),
+            emissions=analysis["emissions"],
+            percentages=analysis["percentages"],
+            comparison=comparison,
+            region=self.AVERAGES_LABEL,
+            average=sum(self.INDIVIDUAL_AVERAGES.values()),
+            actions=individual_recommendations(individual_arrays([(self.household, self.personal)], self),
+                                               self).for_entity(0, RECOMMENDATIONS_TOP_K),
+            priorities=tuple(k for k, v in high_impact_areas[:2] if v > 1)
         )
 
-        print("\nAzaltılması Gereken Öncelikli Alanlar:")
-        for area, ratio in high_impact_areas[:2]:
-            if ratio > 1:
-                print(f"• {area}: Ortalamanın %{(ratio - 1) * 100:.0f} üzerinde")
+    def display_results(self, result: Optional[IndividualResult] = None):
+        """Gelişmiş hesaplama sonuçlarını kategori analiziyle görüntüler."""
+        result = result or self.individual_result()
+        catalog = self.catalog
+        total = result.total
+        print(render_individual(result, catalog))
 
-        combined_df = self.load_comparison_data()
+        combined_df = self.load_comparison_data(total)
         if combined_df is None:
             return  # CSV dosyaları bulunamadıysa çık
 
         self.compare_emissions(total, combined_df)
 
         # Pasta grafiği oluştur
-        labels = list(analysis["percentages"].keys())
-        sizes = list(analysis["percentages"].values())
+        labels = [catalog.label(key) for key in result.percentages]
+        sizes = list(result.percentages.values())
 
         fig, ax = plt.subplots()
         ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140)
         ax.axis('equal')  # Eşit en boy oranı, dairesel pasta grafiği sağlar
 
-        plt.title("Karbon Ayak İzi Dağılımı")
+        plt.title(catalog("pie_title"))
         plt.show()
 
         # Çubuk grafiği oluştur
@@ -525,7 +571,7 @@ class CarbonCalculator:
         # Ülkelerin ve kullanıcının verilerini al
         countries = combined_df['Konum'].tolist()
         co2_values = combined_df['CO2'].tolist()
-        countries.append('Sizin Ayak İziniz')  # Kullanıcıyı ekle
+        countries.append(catalog("you"))  # Kullanıcıyı ekle
         co2_values.append(total)  # Kullanıcının değerini ekle
 
         # Çubukları oluştur
@@ -534,13 +580,13 @@ class CarbonCalculator:
         # Kullanıcının çubuğunu vurgula
         plt.bar(countries[-1], co2_values[-1], color='red')
 
-        plt.xlabel("Ülkeler")
-        plt.ylabel("Karbon Ayak İzi (ton CO2e)")
-        plt.title("Karbon Ayak İzi Karşılaştırması")
+        plt.xlabel(catalog("bar_xlabel"))
+        plt.ylabel(catalog("bar_ylabel"))
+        plt.title(catalog("bar_title"))
         plt.xticks(rotation=45, ha="right")  # Ülke isimlerini döndür
         plt.tight_layout()  # Daha iyi düzen
         plt.show()
-        
+
     def collect_business_data(self):
         """İşletmeyle ilgili verileri toplar."""
         print("\n=== İşletme Bilgileri ===")
@@ -565,7 +611,7 @@ class CarbonCalculator:
         num_vehicles = int(self.get_float_input("Şirket araç sayısı: ", 0))
         company_vehicles = {}
         if num_vehicles > 0:
-            vehicle_types = ["küçük", "orta", "büyük"]
+            vehicle_types = list(self.CAR_MPG.keys())
             for i in range(num_vehicles):
                 vehicle_type = self.get_choice_input(f"{i + 1}. araç için tipi seçin:", vehicle_types)
                 mileage = self.get_float_input(f"{i + 1}. aracın yıllık kilometresini girin: ")
@@ -577,15 +623,9 @@ class CarbonCalculator:
         waste_recycling_rate = self.get_float_input("Atık geri dönüşüm oranı (0-100%): ", 0) / 100
         data_center_usage = self.get_float_input("Yıllık veri merkezi enerji kullanımı (kWh): ", 0)
 
-        supply_chain_options = [
-            "Değerlendirme yok",
-            "Temel değerlendirme",
-            "Bazı tedarikçilerle kapsamlı değerlendirme",
-            "Tüm tedarikçilerle tam değerlendirme"
-        ]
         supply_chain_assessment = self.get_choice_input(
             "Tedarik zinciri çevresel değerlendirme seviyesi:",
-            supply_chain_options
+            SUPPLY_CHAIN_OPTIONS
         )
 
         renewable_energy_percent = self.get_float_input("Yenilenebilir kaynaklardan elde edilen enerji yüzdesi (0-100%): ", 0)
@@ -606,43 +646,60 @@ class CarbonCalculator:
             renewable_energy_percent=renewable_energy_percent
         )
 
-    def calculate_business_emissions(self) -> dict:
-        """Kategoriye göre işletme karbon emisyonlarını hesaplar."""
-        if not self.business:
+    def calculate_business_emissions(self, business: Optional[Business] = None) -> dict:
+        """Kategoriye göre işletme karbon emisyonlarını hesaplar.
+
+        Verilen işletme yoksa ``self.business`` kullanılır.
+        """
+        business = business or self.business
+        if not business:
             return {}
 
         # Bina emisyonları
-        building_emissions = self.business.office_space_sqft * self.OFFICE_SPACE_CO2_FACTOR
+        building_emissions = business.office_space_sqft * self.OFFICE_SPACE_CO2_FACTOR
 
-        # Enerji emisyonları
-        electricity_emissions = (self.business.electricity_kwh * self.ELECTRICITY_CO2_FACTOR / 1000)
-        if self.business.electricity_green:
+        # Enerji emisyonları (saatlik profil varsa saatlik şebeke yoğunluğuyla)
+        if self.grid_intensity is not None and business.electricity_profile is not None:
+            electricity_emissions = self.grid_intensity.electricity_emissions(
+                business.electricity_profile, business.grid_region, business.grid_year) / 1000
+        else:
+            electricity_emissions = (business.electricity_kwh * self.ELECTRICITY_CO2_FACTOR / 1000)
+        if business.electricity_green:
             electricity_emissions *= (1 - self.GREEN_ELECTRICITY_REDUCTION)
 
-        gas_emissions = self.business.gas_kwh * self.GAS_CO2_FACTOR / 1000
+        gas_emissions = business.gas_kwh * self.GAS_CO2_FACTOR / 1000
 
         # Araç emisyonları
         vehicle_emissions = 0
-        for vehicle in self.business.company_vehicles.values():
+        for vehicle in business.company_vehicles.values():
             mileage_km = vehicle["mileage"] * 1.60934
             mpg = self.CAR_MPG[vehicle["type"]]
             gallons = mileage_km / mpg
             vehicle_emissions += (gallons * self.CAR_CO2_FACTOR) / 1000
 
-        # Seyahat emisyonları
-        air_travel_emissions = self.business.air_travel_hours * 0.25
+        # Seyahat emisyonları (uçuş kayıtları varsa saat tahmini yerine rota bazında)
+        if self.flights is not None and business.travel_legs:
+            air_travel_emissions = self.flights.emissions(business.travel_legs)
+        else:
+            air_travel_emissions = business.air_travel_hours * self.FLIGHT_CO2_PER_HOUR
 
         # Çalışanla ilgili emisyonlar
-        employee_emissions = self.business.num_employees * self.EMPLOYEE_CO2_FACTOR
+        employee_emissions = business.num_employees * self.EMPLOYEE_CO2_FACTOR
 
         # Veri merkezi emisyonları
-        data_center_emissions = self.business.data_center_usage * self.DATA_CENTER_CO2_FACTOR
+        data_center_emissions = business.data_center_usage * self.DATA_CENTER_CO2_FACTOR
+
+        # Tedarik zinciri emisyonları (satın alma harcamalarından, EEIO tablosuyla)
+        if self.supply_chain is not None and business.procurement_spend:
+            supply_chain_emissions = self.supply_chain.emissions(business.procurement_spend)
+        else:
+            supply_chain_emissions = 0.0
 
         # Sektör çarpanını uygula
-        sector_multiplier = self.SECTOR_MULTIPLIERS[self.business.sector]
+        sector_multiplier = self.SECTOR_MULTIPLIERS[business.sector]
 
         # Yenilenebilir enerji indirimini uygula
-        renewable_reduction = self.business.renewable_energy_percent / 100
+        renewable_reduction = business.renewable_energy_percent / 100
 
         # Ayarlamalarla toplamı hesapla
         subtotal = sum([
@@ -652,7 +709,8 @@ class CarbonCalculator:
             vehicle_emissions,
             air_travel_emissions,
             employee_emissions,
-            data_center_emissions
+            data_center_emissions,
+            supply_chain_emissions
         ])
 
         # Değiştiricileri uygula
@@ -666,71 +724,61 @@ class CarbonCalculator:
             "hava_yolculugu": air_travel_emissions,
             "calisanlar": employee_emissions,
             "veri_merkezi": data_center_emissions,
+            "tedarik_zinciri": supply_chain_emissions,
             "toplam": total
         }
 
-    def display_business_results(self, emissions: dict):
-        """İşletme emisyon sonuçlarını görüntüler."""
-        print("\n=== İşletme Karbon Ayak İzi Sonuçları ===")
-        print(f"\nSonuçlar: {self.business.name}")
-        print(f"Sektör: {self.business.sector}")
-        print("\nKategoriye göre emisyonlar (yılda ton CO2e):")
-        print(f"Bina operasyonları:        {emissions['bina']:.1f}")
-        print(f"Elektrik kullanımı:        {emissions['elektrik']:.1f}")
-        print(f"Doğalgaz kullanımı:        {emissions['dogalgaz']:.1f}")
-        print(f"Şirket araçları:           {emissions['araclar']:.1f}")
-        print(f"İş hava yolculuğu:         {emissions['hava_yolculugu']:.1f}")
-        print(f"Çalışanla ilgili:          {emissions['calisanlar']:.1f}")
-        print(f"Veri merkezi:              {emissions['veri_merkezi']:.1f}")
-        print(f"\nToplam yıllık emisyonlar: {emissions['toplam']:.1f} ton CO2e")
-
-        # Çalışan başına emisyonları hesapla
+    def business_result(self, emissions: dict) -> BusinessResult:
+        """``calculate_business_emissions`` sonucunu görüntüleme ve rapor için sonuç nesnesine dönüştürür."""
+        from batch import business_arrays
+        from recommendations import business_recommendations
+
+        scopes = allocate_scopes(emissions)
         per_employee = emissions['toplam'] / self.business.num_employees
-        print(f"Çalışan başına emisyonlar: {per_employee:.1f} ton CO2e")
-
-        # Önerilerde bulun
-        print("\nAzaltma için öneriler:")
-        if emissions['elektrik'] > 50:
-            print("- Yenilenebilir enerji kullanımını artırmayı düşünün")
-        if emissions['araclar'] > 20:
-            print("- Filonuz için elektrikli veya hibrit araçları inceleyin")
-        if per_employee > 5:
-            print("- Sürdürülebilirlik için çalışan katılım programları uygulayın")
-        if emissions['bina'] > 100:
-            print("- Bina enerji verimliliği iyileştirmelerine yatırım yapın")
-        if emissions['veri_merkezi'] > 10:
-            print("- Veri merkezi operasyonlarını optimize edin veya verimli sağlayıcılara geçin")
-
-    def generate_report(self, emissions: dict = None):
-        """Karbon ayak izi hesaplamasının ayrıntılı bir raporunu oluşturur."""
+
+        # Eylem kataloğundan en çok tasarruf sağlayan öneriler
+        recommendations = business_recommendations(business_arrays([self.business], self), self)
+        result = BusinessResult(
+            name=self.business.name,
+            sector=self.business.sector,
+            emissions=emissions,
+            scopes={key: value for key, value in scopes.items() if key.startswith("kapsam_")},
+            categories=scopes["kategoriler"],
+            per_employee=per_employee,
+            actions=recommendations.for_entity(0, RECOMMENDATIONS_TOP_K)
+        )
+
+        # Sektördeki diğer şirketlerle karşılaştır
+        if self.benchmark is not None and self.benchmark.company_count(self.business.sector) > 0:
+            result.sector_count = self.benchmark.company_count(self.business.sector)
+            result.sector_percentiles = {
+                category: self.benchmark.percentile(self.business.sector, category, value)
+                for category, value in [("toplam", emissions['toplam']), ("calisan_basina", per_employee)]
+            }
+        return result
+
+    def display_business_results(self, result):
+        """İşletme emisyon sonuçlarını görüntüler (``BusinessResult`` veya emisyon sözlüğü)."""
+        if isinstance(result, dict):
+            result = self.business_result(result)
+        print(render_business(result, self.catalog))
+
+    def generate_report(self, result=None):
+        """Karbon ayak izi hesaplamasının ayrıntılı bir raporunu oluşturur.
+
+        ``result`` verilmezse bireysel sonuç hesaplanır; emisyon sözlüğü işletme sonucuna dönüştürülür.
+        """
+        if result is None:
+            result = self.individual_result()
+        elif isinstance(result, dict):
+            result = self.business_result(result)
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"karbon_ayak_izi_raporu_{timestamp}.txt"
 
-        with open(filename, 'w') as f:
-            f.write("Karbon Ayak İzi Analiz Raporu\n")
-            f.write(f"Oluşturulma Tarihi: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-            if self.calculator_type == 'individual':
-                total = self.calculate_total_emissions()
-                f.write("=== Bireysel Karbon Ayak İzi ===\n")
-                f.write(f"Toplam yıllık emisyonlar: {total:.1f} ton CO2e\n")
-                f.write("\nOrtalamalarla Karşılaştırma:\n")
-                f.write(f"Sizin ayak iziniz: {total:.1f} ton CO2e\n")
-                f.write("Dünya ortalaması:  4.4 ton CO2e\n")
-                f.write("Birleşik Krallık ortalaması: 14.1 ton CO2e\n")
-            else:
-                f.write(f"=== İşletme Karbon Ayak İzi: {self.business.name} ===\n")
-                f.write(f"Sektör: {self.business.sector}\n")
-                f.write("\nKategoriye göre emisyonlar (ton CO2e):\n")
-                for category, value in emissions.items():
-                    if category != 'toplam':
-                        f.write(f"{category.title():15} {value:.1f}\n")
-                f.write(f"\nToplam emisyonlar: {emissions['toplam']:.1f} ton CO2e\n")
-                f.write(f"Çalışan başına:    {emissions['toplam'] / self.business.num_employees:.1f} ton CO2e\n")
-
-            f.write("\nRapor, Karbon Ayak İzi Hesaplayıcı v1.0 tarafından oluşturuldu")
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(render_report(result, self.catalog))
 
-        print(f"\nAyrıntılı rapor şuraya kaydedildi: {filename}")
+        print(self.catalog("report_saved", filename=filename))
 
     def run(self):
         """Seçilen türe göre hesaplayıcıyı çalıştırır."""
@@ -739,18 +787,281 @@ class CarbonCalculator:
         if self.calculator_type == 'individual':
             self.collect_household_data()
             self.collect_personal_data()
-            self.display_results()
-            self.generate_report()
+            result = self.individual_result()
+            self.display_results(result)
+            self.generate_report(result)
         else:
             self.collect_business_data()
             emissions = self.calculate_business_emissions()
-            self.display_business_results(emissions)
-            self.generate_report(emissions)
+            result = self.business_result(emissions)
+            self.display_business_results(result)
+            if self.benchmark is not None:
+                self.benchmark.add(self.business.sector, emissions, self.business.num_employees)
+            self.generate_report(result)
+
+
+def allocate_scopes(emissions: dict) -> dict:
+    """İşletme sonucunu GHG Protokolü kapsamlarına ayırır.
+
+    Sektör çarpanı ve yenilenebilir enerji indirimi kategorilere oranlı
+    dağıtılır, böylece düzeltilmiş kategoriler ve kapsamlar ``toplam``a eşit olur.
+    Yalnızca ``calculate_business_emissions`` sonucunu kullanır, yeniden hesaplama yapmaz.
+    """
+    subtotal = sum(emissions[category] for category in BUSINESS_SCOPES)
+    scale = emissions["toplam"] / subtotal if subtotal else 0.0
+    categories = {category: emissions[category] * scale for category in BUSINESS_SCOPES}
+    scopes = {f"kapsam_{scope}": 0.0 for scope in (1, 2, 3)}
+    for category, value in categories.items():
+        scopes[f"kapsam_{BUSINESS_SCOPES[category]}"] += value
+    return {"kategoriler": categories, **scopes, "toplam": emissions["toplam"]}
+
+
+def benchmark_key(record: dict, inputs: dict) -> str:
+    """Sektör karşılaştırmasında bir işletmeyi tanımlayan anahtar: kayıt kimliği, yoksa girdilerin özeti.
+
+    Aynı dosya tekrar işlendiğinde işletmeler karşılaştırmaya ikinci kez eklenmez.
+    """
+    from result_cache import canonical_hash
+
+    if "id" in record:
+        return f"id:{record['id']}"
+    return f"girdi:{canonical_hash(asdict(inputs['business']))}"
+
+
+def load_records(path: str):
+    """JSON satırları (JSONL) dosyasındaki hesaplama kayıtlarını sırayla okur.
+
+    Geçersiz JSON içeren satırlar için kayıt yerine None döner.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError:
+                    yield line_number, None
+
+
+def run_batch(path: str, cache, chunk_size: int = 10000, factors: Optional[FactorPack] = None, store=None,
+              supply_chain=None, flights=None, aggregates=None, write_results: bool = True, grid_intensity=None,
+              benchmark=None, year: Optional[int] = None):
+    """Kayıtları paylaşılan önbellek üzerinden hesaplar ve her biri için bir JSON satırı yazar.
+
+    Kayıt biçimi: {"id": ..., "type": "individual", "household": {...}, "personal": {...}}
+    veya {"id": ..., "type": "business", "business": {...}}; isteğe bağlı "year" alanı
+    kaydın raporlama yılıdır (yoksa ``year``, o da yoksa kayıt anının yılı saklanır).
+
+    Kayıtlar parçalar halinde sütun sütun doğrulanır; hatalı kayıtlar toplu işi durdurmaz,
+    bunun yerine alan bazında hataları içeren bir satır yazılır. ``store`` verilirse
+    (SubmissionStore) geçerli kayıtlar ve sonuçları her parçada toplu olarak kaydedilir.
+    ``supply_chain`` (EEIOTable) verilirse ``procurement_spend`` alanları, ``flights``
+    (FlightEmissions) verilirse ``travel_legs`` uçuş kayıtları, ``grid_intensity``
+    (GridIntensityProvider) verilirse ``electricity_profile`` saatlik profilleri hesaba katılır.
+
+    ``aggregates`` (``aggregation.default_aggregates()``) verilirse sonuçlar her parçada
+    kayıttaki ``city`` alanına (işletmelerde sektöre) göre gruplanarak toplanır;
+    ``write_results=False`` ile yalnızca toplamlar tutulur, sonuç satırları yazılmaz.
+    ``benchmark`` (SectorBenchmark) verilirse her geçerli işletme sektör dağılımına eklenir.
+    """
+    from validation import build_validators
+
+    calculator = CarbonCalculator(factors)
+    calculator.supply_chain = supply_chain
+    calculator.flights = flights
+    calculator.grid_intensity = grid_intensity
+    validators = build_validators(calculator)
+
+    chunk = []
+    for item in load_records(path):
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            _run_batch_chunk(chunk, calculator, validators, cache, store, aggregates, write_results, benchmark, year)
+            chunk = []
+            # Pack files edited during a long run apply from the next chunk on
+            if calculator.refresh_factors():
+                validators = build_validators(calculator)
+                print(f"Katsayı paketi yeniden yüklendi: {calculator.factors.code} "
+                      f"({calculator.factors.fingerprint})", file=sys.stderr)
+    if chunk:
+        _run_batch_chunk(chunk, calculator, validators, cache, store, aggregates, write_results, benchmark, year)
+
+    print(f"Önbellek: {json.dumps(cache.stats())}", file=sys.stderr)
+
+
+def _run_batch_chunk(chunk: list, calculator: CarbonCalculator, validators: dict, cache, store=None,
+                     aggregates=None, write_results: bool = True, benchmark=None, year: Optional[int] = None):
+    from storage import business_submission, individual_submission
+    from validation import validate_records
+
+    submissions = []
+    aggregated = {"individual": ([], []), "business": ([], [])}  # group keys and results per type
+
+    records = [record if record is not None else {"type": None} for _, record in chunk]
+    report = validate_records(records, validators)
+    errors = report.errors_by_row()
+
+    for i, (line_number, record) in enumerate(chunk):
+        record_id = record.get("id", line_number) if isinstance(record, dict) else line_number
+        inputs = report.records[i]
+        if inputs is None:
+            row_errors = [{"field": "satır", "message": "geçersiz JSON"}] if record is None else \
+                [{"field": error.field, "message": error.message} for error in errors.get(i, [])]
+            print(json.dumps({"id": record_id, "errors": row_errors}, ensure_ascii=False))
+            continue
+
+        # A record the tables can't score (e.g. an unknown sector, airport or grid file) is
+        # reported like a validation error instead of stopping the batch
+        try:
+            if inputs["type"] == "business":
+                emissions = cache.business_emissions(calculator, inputs["business"])
+                total = emissions["toplam"]
+            else:
+                calculator.household = inputs["household"]
+                calculator.personal = inputs["personal"]
+                emissions = cache.individual_analysis(calculator)["emissions"]
+                total = cache.total_emissions(calculator)
+        except (KeyError, ValueError, OSError) as error:
+            message = f"hesaplanamadı: {error.args[0] if isinstance(error, KeyError) and error.args else error}"
+            print(json.dumps({"id": record_id, "errors": [{"field": "kayıt", "message": message}]},
+                             ensure_ascii=False))
+            continue
+
+        reporting_year = inputs["year"] if inputs["year"] is not None else year
+        if inputs["type"] == "business":
+            group = inputs["business"].sector
+            if benchmark is not None:
+                benchmark.add(group, emissions, inputs["business"].num_employees, key=benchmark_key(record, inputs))
+            if store is not None:
+                submissions.append(business_submission(inputs["business"], emissions, external_id=record_id,
+                                                       year=reporting_year, calculator=calculator))
+        else:
+            group = record.get("city")
+            if store is not None:
+                submissions.append(individual_submission(inputs["household"], inputs["personal"], emissions, total,
+                                                         external_id=record_id, year=reporting_year,
+                                                         calculator=calculator))
+
+        if aggregates is not None:
+            groups, results = aggregated[inputs["type"]]
+            groups.append(group)
+            results.append({**emissions, "toplam": total})
+        if not write_results:
+            continue
+
+        result = {"id": record_id, "type": inputs["type"], "total": total, "emissions": emissions}
+        if inputs["type"] == "business":
+            scopes = allocate_scopes(emissions)
+            result["scopes"] = {key: value for key, value in scopes.items() if key.startswith("kapsam_")}
+            result["allocated_emissions"] = scopes["kategoriler"]
+        print(json.dumps(result, ensure_ascii=False))
+
+    # Results of the chunk reach the disk tier of the cache in one transaction
+    cache.flush()
+    if submissions:
+        store.add_many(submissions)
+    if aggregates is not None:
+        for calculator_type, (groups, results) in aggregated.items():
+            aggregate = aggregates[calculator_type]
+            aggregate.add_many(groups, {category: [result[category] for result in results]
+                                        for category in aggregate.categories})
 
 
 def main():
-    calculator = CarbonCalculator()
-    calculator.run()
+    parser = argparse.ArgumentParser(description="Karbon Ayak İzi Hesaplayıcı")
+    parser.add_argument("--factors", default=None, choices=get_registry().codes(),
+                        help="Kullanılacak katsayı paketi (varsayılan: UK)")
+    parser.add_argument("--population", default=None,
+                        help="Karşılaştırmada CSV yerine kullanılacak nüfus toplamları (batch --aggregate çıktısı)")
+    parser.add_argument("--lang", default=DEFAULT_LANGUAGE, choices=LANGUAGES,
+                        help="Sonuç, grafik ve rapor dili (varsayılan: tr)")
+    parser.add_argument("--benchmark", default=None,
+                        help="Sektör karşılaştırmalarının okunup kaydedileceği JSON dosyası (yoksa oluşturulur)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch_parser = subparsers.add_parser("batch", help="JSONL dosyasındaki kayıtları toplu hesaplar")
+    batch_parser.add_argument("input", help="Her satırı bir kayıt olan JSONL dosyası")
+    batch_parser.add_argument("--cache-size", type=int, default=10000, help="Bellekteki en fazla sonuç sayısı")
+    batch_parser.add_argument("--cache-db", default=None, help="Kalıcı önbellek için SQLite dosyası")
+    batch_parser.add_argument("--store", default=None, help="Gönderimlerin kaydedileceği SQLite veritabanı")
+    batch_parser.add_argument("--year", type=int, default=None,
+                              help="'year' alanı olmayan kayıtların raporlama yılı (varsayılan: kayıt anının yılı)")
+    batch_parser.add_argument("--eeio", nargs='?', const="", default=None,
+                              help="Tedarik zinciri emisyonları için EEIO tablosu (CSV; değer verilmezse örnek tablo)")
+    batch_parser.add_argument("--airports", nargs='?', const="", default=None,
+                              help="Rota bazlı uçuşlar için havalimanı tablosu (CSV; değer verilmezse paketteki tablo)")
+    batch_parser.add_argument("--grid", default=None,
+                              help="Saatlik elektrik profilleri için <bölge>_<yıl>.npy dosyalarının klasörü")
+    batch_parser.add_argument("--aggregate", default=None,
+                              help="Şehir/sektör bazında toplamların yazılacağı JSON dosyası")
+    batch_parser.add_argument("--aggregate-only", action="store_true",
+                              help="Sonuç satırlarını yazmadan yalnızca toplamları üretir")
+
+    profile_parser = subparsers.add_parser("profile", help="Örnek bir iş yükünün aşama aşama süre ve bellek profili")
+    profile_parser.add_argument("--input", required=True, help="'batch' biçiminde JSONL dosyası")
+    profile_parser.add_argument("--charts", type=int, default=10, help="Grafiği çizilecek kayıt sayısı")
+    profile_parser.add_argument("--reports", type=int, default=200, help="Raporu yazılacak kayıt sayısı")
+    profile_parser.add_argument("--top", type=int, default=10, help="Gösterilecek bellek ayırma satırı sayısı")
+    profile_parser.add_argument("--output", default=None, help="Raporların yazılacağı klasör (varsayılan: geçici)")
+    profile_parser.add_argument("--no-memory", action="store_true",
+                                help="tracemalloc ile ikinci (bellek) çalıştırmayı atlar")
+
+    args = parser.parse_args()
+
+    factors = get_registry().get(args.factors) if args.factors else None
+    benchmark = None
+    if args.benchmark:
+        from benchmark import open_benchmark
+        benchmark = open_benchmark(args.benchmark)
+
+    if args.command == "batch":
+        store = None
+        if args.store:
+            from storage import SubmissionStore
+            store = SubmissionStore(args.store)
+        supply_chain = None
+        if args.eeio is not None:
+            from supply_chain import EEIO_PATH, EEIOTable
+            supply_chain = EEIOTable(args.eeio or EEIO_PATH)
+        flights = None
+        if args.airports is not None:
+            from flights import AIRPORTS_PATH, FlightEmissions
+            flights = FlightEmissions(args.airports or AIRPORTS_PATH)
+        grid_intensity = None
+        if args.grid is not None:
+            from grid_intensity import GridIntensityProvider
+            grid_intensity = GridIntensityProvider(args.grid)
+        aggregates = None
+        if args.aggregate:
+            from aggregation import default_aggregates
+            aggregates = default_aggregates()
+        run_batch(args.input, configure_shared_cache(args.cache_size, args.cache_db), factors=factors, store=store,
+                  supply_chain=supply_chain, flights=flights, aggregates=aggregates,
+                  write_results=not args.aggregate_only, grid_intensity=grid_intensity, benchmark=benchmark,
+                  year=args.year)
+        if aggregates is not None:
+            from aggregation import save_aggregates
+            save_aggregates(aggregates, args.aggregate)
+        if store is not None:
+            store.close()
+    elif args.command == "profile":
+        from profiling import profile_run
+        calculator = CarbonCalculator(factors)
+        calculator.language = args.lang
+        profiler = profile_run(args.input, calculator, charts=args.charts, reports=args.reports, top=args.top,
+                               output_dir=args.output, trace_memory=not args.no_memory)
+        print(profiler.report())
+    else:
+        calculator = CarbonCalculator(factors)
+        calculator.language = args.lang
+        if args.population:
+            from aggregation import load_aggregates
+            calculator.population = load_aggregates(args.population)["individual"]
+        calculator.benchmark = benchmark
+        calculator.run()
+
+    if benchmark is not None:
+        benchmark.save(args.benchmark)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,290 @@
+"""SQLite persistence of submissions and their results."""
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Iterable, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    external_id TEXT,
+    calculator_type TEXT NOT NULL,
+    name TEXT,
+    sector TEXT,
+    created_at TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    factor_pack TEXT,
+    total REAL NOT NULL,
+    num_employees INTEGER,
+    inputs TEXT NOT NULL,
+    emissions TEXT NOT NULL,
+    factor_fingerprint TEXT,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS factor_sets (
+    fingerprint TEXT PRIMARY KEY,
+    code TEXT NOT NULL,
+    name TEXT,
+    version TEXT,
+    factors TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_type_year_total ON submissions (calculator_type, year, total DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_sector_year_total ON submissions (sector, year, total DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_created_at ON submissions (created_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_external_id ON submissions (external_id);
+"""
+
+INSERT_SQL = """
+INSERT INTO submissions (external_id, calculator_type, name, sector, created_at, year, factor_pack,
+                         total, num_employees, inputs, emissions, factor_fingerprint, settings)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+FACTOR_SET_SQL = "INSERT OR IGNORE INTO factor_sets (fingerprint, code, name, version, factors) VALUES (?, ?, ?, ?, ?)"
+
+# Columns added after the first schema, created on open in older databases
+ADDED_COLUMNS = {"factor_fingerprint": "TEXT", "settings": "TEXT"}
+
+
+def calculator_settings(calculator) -> dict:
+    """Options besides the factor pack that a calculator scores with (EEIO and airport tables, grid data)."""
+    settings = {}
+    if calculator.supply_chain is not None:
+        settings["eeio"] = {"path": calculator.supply_chain.path, "fingerprint": calculator.supply_chain.fingerprint}
+    if calculator.flights is not None:
+        settings["airports"] = {"path": calculator.flights.path, "fingerprint": calculator.flights.fingerprint}
+    if calculator.grid_intensity is not None:
+        settings["grid"] = {"data_dir": calculator.grid_intensity.data_dir}
+    return settings
+
+
+@dataclass
+class Submission:
+    calculator_type: str
+    total: float
+    emissions: dict
+    inputs: dict
+    created_at: datetime
+    external_id: Optional[str] = None
+    name: Optional[str] = None
+    sector: Optional[str] = None
+    num_employees: Optional[int] = None
+    factor_pack: Optional[str] = None
+    year: Optional[int] = None  # Reporting year; the year of created_at when not given
+    pack: Optional[object] = None  # FactorPack scored with; its factors are stored once per fingerprint
+    settings: Optional[dict] = None  # calculator_settings() of the calculator scored with
+
+    def scored_with(self, calculator) -> "Submission":
+        """Record the factor pack and options ``calculator`` scored with; returns the submission."""
+        self.factor_pack = calculator.factors.code
+        self.pack = calculator.factors
+        self.settings = calculator_settings(calculator)
+        return self
+
+    def to_row(self) -> tuple:
+        return (
+            None if self.external_id is None else str(self.external_id),
+            self.calculator_type,
+            self.name,
+            self.sector,
+            self.created_at.isoformat(timespec='seconds'),
+            self.year if self.year is not None else self.created_at.year,
+            self.factor_pack,
+            float(self.total),
+            self.num_employees,
+            json.dumps(self.inputs, ensure_ascii=False),
+            json.dumps(self.emissions, ensure_ascii=False),
+            None if self.pack is None else self.pack.fingerprint,
+            None if self.settings is None else json.dumps(self.settings, ensure_ascii=False)
+        )
+
+
+def business_submission(business, emissions: dict, created_at: Optional[datetime] = None, external_id=None,
+                        factor_pack: Optional[str] = None, year: Optional[int] = None,
+                        calculator=None) -> Submission:
+    """Build a submission from a ``Business`` and its ``calculate_business_emissions`` result.
+
+    With ``calculator`` the factor pack and options it scored with are stored too.
+    """
+    submission = Submission(
+        calculator_type='business',
+        total=emissions['toplam'],
+        emissions=emissions,
+        inputs={"business": asdict(business)},
+        created_at=created_at or datetime.now(),
+        external_id=external_id,
+        name=business.name,
+        sector=business.sector,
+        num_employees=business.num_employees,
+        factor_pack=factor_pack,
+        year=year
+    )
+    return submission if calculator is None else submission.scored_with(calculator)
+
+
+def individual_submission(household, personal, emissions: dict, total: float,
+                          created_at: Optional[datetime] = None, external_id=None,
+                          factor_pack: Optional[str] = None, year: Optional[int] = None,
+                          calculator=None) -> Submission:
+    """Build a submission from household/personal inputs and their category emissions."""
+    submission = Submission(
+        calculator_type='individual',
+        total=total,
+        emissions=emissions,
+        inputs={"household": asdict(household), "personal": asdict(personal)},
+        created_at=created_at or datetime.now(),
+        external_id=external_id,
+        factor_pack=factor_pack,
+        year=year
+    )
+    return submission if calculator is None else submission.scored_with(calculator)
+
+
+class ConnectionPool:
+    """A fixed set of SQLite connections shared between threads.
+
+    A connection is used by one thread at a time; ``check_same_thread`` is
+    off so it can move between the GUI worker thread and service threads.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self._connections = queue.Queue()
+        for _ in range(size):
+            connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.row_factory = sqlite3.Row
+            self._connections.put(connection)
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+class SubmissionStore:
+    """Embedded store of submissions with batched writes and indexed dashboard queries."""
+
+    def __init__(self, path: str = "gonderimler.db", pool_size: int = 4, batch_size: int = 10000):
+        self.pool = ConnectionPool(path, pool_size)
+        self.batch_size = batch_size
+        self._write_lock = threading.Lock()  # SQLite allows one writer at a time
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(submissions)")}
+            with connection:
+                for name, kind in ADDED_COLUMNS.items():
+                    if name not in columns:
+                        connection.execute(f"ALTER TABLE submissions ADD COLUMN {name} {kind}")
+
+    def add(self, submission: Submission) -> int:
+        with self._write_lock, self.pool.connection() as connection:
+            with connection:
+                self._add_factor_sets(connection, [submission.pack])
+                return connection.execute(INSERT_SQL, submission.to_row()).lastrowid
+
+    def add_many(self, submissions: Iterable[Submission]) -> int:
+        """Insert submissions with executemany, one transaction per ``batch_size`` rows."""
+        count = 0
+        batch = []
+        packs = {}
+        with self._write_lock, self.pool.connection() as connection:
+            for submission in submissions:
+                batch.append(submission.to_row())
+                if submission.pack is not None:
+                    packs[submission.pack.fingerprint] = submission.pack
+                if len(batch) >= self.batch_size:
+                    with connection:
+                        self._add_factor_sets(connection, packs.values())
+                        connection.executemany(INSERT_SQL, batch)
+                    count += len(batch)
+                    batch = []
+                    packs = {}
+            if batch:
+                with connection:
+                    self._add_factor_sets(connection, packs.values())
+                    connection.executemany(INSERT_SQL, batch)
+                count += len(batch)
+        return count
+
+    @staticmethod
+    def _add_factor_sets(connection: sqlite3.Connection, packs: Iterable):
+        connection.executemany(FACTOR_SET_SQL, [
+            (pack.fingerprint, pack.code, pack.name, pack.version,
+             json.dumps(pack.factors, ensure_ascii=False, default=dict))  # read-only mappings as dicts
+            for pack in packs if pack is not None
+        ])
+
+    def factor_set(self, fingerprint: str) -> Optional[dict]:
+        """Return the stored ``code``, ``name``, ``version`` and ``factors`` of a pack fingerprint."""
+        with self.pool.connection() as connection:
+            row = connection.execute("SELECT * FROM factor_sets WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is None:
+            return None
+        result = dict(row)
+        result["factors"] = json.loads(result["factors"])
+        return result
+
+    def top_emitters(self, calculator_type: str = 'business', sector: Optional[str] = None,
+                     year: Optional[int] = None, limit: int = 100) -> list[dict]:
+        """Return the highest totals, e.g. the top 100 emitters of one sector this year."""
+        conditions = ["calculator_type = ?"]
+        params = [calculator_type]
+        if sector is not None:
+            conditions.append("sector = ?")
+            params.append(sector)
+        if year is not None:
+            conditions.append("year = ?")
+            params.append(year)
+        sql = (f"SELECT id, external_id, name, sector, created_at, total, num_employees FROM submissions "
+               f"WHERE {' AND '.join(conditions)} ORDER BY total DESC LIMIT ?")
+        with self.pool.connection() as connection:
+            return [dict(row) for row in connection.execute(sql, params + [limit])]
+
+    def sector_summary(self, year: Optional[int] = None) -> list[dict]:
+        """Return the number of businesses, total and mean emissions per sector."""
+        sql = ("SELECT sector, COUNT(*) AS count, SUM(total) AS total, AVG(total) AS mean FROM submissions "
+               "WHERE calculator_type = 'business'" + (" AND year = ?" if year is not None else "") +
+               " GROUP BY sector ORDER BY total DESC")
+        with self.pool.connection() as connection:
+            return [dict(row) for row in connection.execute(sql, [year] if year is not None else [])]
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> dict:
+        result = dict(row)
+        result["inputs"] = json.loads(result["inputs"])
+        result["emissions"] = json.loads(result["emissions"])
+        result["settings"] = json.loads(result["settings"]) if result["settings"] else {}
+        return result
+
+    def get(self, submission_id: int) -> Optional[dict]:
+        with self.pool.connection() as connection:
+            row = connection.execute("SELECT * FROM submissions WHERE id = ?", (submission_id,)).fetchone()
+        return self._decode(row) if row is not None else None
+
+    def history(self, external_id) -> list[dict]:
+        """Return every submission of one entity, by reporting year and then insert time."""
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT * FROM submissions WHERE external_id = ? ORDER BY year, created_at, id",
+                                      (str(external_id),)).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def count(self) -> int:
+        with self.pool.connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+
+    def close(self):
+        self.pool.close()
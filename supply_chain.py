@@ -0,0 +1,110 @@
+"""Scope 3 supply-chain emissions from procurement spend with an EEIO factor table."""
+import hashlib
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+EEIO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "eeio.csv")
+
+
+class CSRMatrix:
+    """A minimal compressed sparse row matrix on plain numpy arrays."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: tuple):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @classmethod
+    def from_triplets(cls, rows, cols, values, shape: tuple) -> "CSRMatrix":
+        """Build a matrix from ``(row, col, value)`` entries; duplicate entries are summed."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        keys, inverse = np.unique(rows * shape[1] + cols, return_inverse=True)
+        data = np.bincount(inverse, weights=values, minlength=len(keys))
+        key_rows = keys // shape[1]
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key_rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, keys % shape[1], data, shape)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def row_indices(self) -> np.ndarray:
+        """Return the row of every stored entry."""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def matmul(self, other: "CSRMatrix") -> "CSRMatrix":
+        """Sparse × sparse product: every entry (r, i) meets the stored entries of ``other``'s row i."""
+        if self.shape[1] != other.shape[0]:
+            raise ValueError(f"Boyutlar uyuşmuyor: {self.shape} × {other.shape}")
+        counts = np.diff(other.indptr)[self.indices]
+        total = int(counts.sum())
+        source = np.repeat(np.arange(self.nnz), counts)
+        offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = other.indptr[self.indices][source] + offset
+        return CSRMatrix.from_triplets(self.row_indices()[source], other.indices[positions],
+                                       self.data[source] * other.data[positions],
+                                       (self.shape[0], other.shape[1]))
+
+    def row_sums(self) -> np.ndarray:
+        return np.bincount(self.row_indices(), weights=self.data, minlength=self.shape[0])
+
+    def toarray(self) -> np.ndarray:
+        dense = np.zeros(self.shape)
+        dense[self.row_indices(), self.indices] = self.data
+        return dense
+
+
+class EEIOTable:
+    """Supply-chain emission intensities between sectors, loaded once as a CSR matrix.
+
+    Row ``i``, column ``j`` holds the kg CO2e emitted in sector ``j`` per
+    currency unit spent on sector ``i`` (direct and upstream). A batch of
+    spend vectors is scored with one sparse product ``spend × table``.
+    """
+
+    def __init__(self, path: str = EEIO_PATH):
+        self.path = path
+        df = pd.read_csv(path, comment='#', encoding='utf-8')
+        self.sectors = tuple(dict.fromkeys(df.iloc[:, 0].tolist() + df.iloc[:, 1].tolist()))
+        self.index = {sector: i for i, sector in enumerate(self.sectors)}
+        self.matrix = CSRMatrix.from_triplets(df.iloc[:, 0].map(self.index), df.iloc[:, 1].map(self.index),
+                                              df.iloc[:, 2].to_numpy(dtype=np.float64) / 1000,  # kg -> tonnes
+                                              (len(self.sectors), len(self.sectors)))
+        self.intensities = self.matrix.row_sums()  # tonnes per currency unit, by purchased sector
+        with open(path, 'rb') as f:
+            self.fingerprint = hashlib.sha256(f.read()).hexdigest()[:16]
+
+    def _sector_index(self, sector: str) -> int:
+        try:
+            return self.index[sector]
+        except KeyError:
+            raise KeyError(f"EEIO tablosunda bilinmeyen sektör: {sector}") from None
+
+    def emissions(self, spend: dict[str, float]) -> float:
+        """Return the supply-chain tonnes CO2e of one ``{sector: spend}`` dict."""
+        return float(sum(amount * self.intensities[self._sector_index(sector)] for sector, amount in spend.items()))
+
+    def spend_matrix(self, spends: list[Optional[dict]]) -> CSRMatrix:
+        """Stack ``{sector: spend}`` dicts (or None) into a companies × sectors CSR matrix."""
+        rows, cols, values = [], [], []
+        for row, spend in enumerate(spends):
+            for sector, amount in (spend or {}).items():
+                rows.append(row)
+                cols.append(self._sector_index(sector))
+                values.append(amount)
+        return CSRMatrix.from_triplets(rows, cols, values, (len(spends), len(self.sectors)))
+
+    def emissions_by_sector(self, spends: list[Optional[dict]]) -> CSRMatrix:
+        """Return the companies × emitting-sector tonnes as one sparse product."""
+        return self.spend_matrix(spends).matmul(self.matrix)
+
+    def emissions_batch(self, spends: list[Optional[dict]]) -> np.ndarray:
+        """Return the supply-chain tonnes CO2e of every company."""
+        return self.emissions_by_sector(spends).row_sums()
@@ -0,0 +1,320 @@
+"""Localized (TR/EN) output templates that render results without recomputing them."""
+from datetime import datetime
+from typing import Optional
+
+LANGUAGES = ("tr", "en")
+DEFAULT_LANGUAGE = "tr"
+
+# Display names of the language-neutral result keys
+LABELS = {
+    "tr": {
+        "ev_enerjisi": "Ev Enerjisi",
+        "ulasim": "Ulaşım",
+        "gida": "Gıda",
+        "harcama": "Tüketici Harcaması",
+        "kamu_hizmetleri": "Kamu Hizmetleri",
+        "bina": "Bina operasyonları",
+        "elektrik": "Elektrik kullanımı",
+        "dogalgaz": "Doğalgaz kullanımı",
+        "araclar": "Şirket araçları",
+        "hava_yolculugu": "İş hava yolculuğu",
+        "calisanlar": "Çalışanla ilgili",
+        "veri_merkezi": "Veri merkezi",
+        "tedarik_zinciri": "Tedarik zinciri",
+        "kapsam_1": "Kapsam 1 (doğrudan)",
+        "kapsam_2": "Kapsam 2 (enerji)",
+        "kapsam_3": "Kapsam 3 (değer zinciri)",
+        "toplam": "Toplam emisyonlar",
+        "calisan_basina": "Çalışan başına"
+    },
+    "en": {
+        "ev_enerjisi": "Home Energy",
+        "ulasim": "Transport",
+        "gida": "Food",
+        "harcama": "Consumer Spending",
+        "kamu_hizmetleri": "Public Services",
+        "bina": "Building operations",
+        "elektrik": "Electricity use",
+        "dogalgaz": "Natural gas use",
+        "araclar": "Company vehicles",
+        "hava_yolculugu": "Business air travel",
+        "calisanlar": "Employee-related",
+        "veri_merkezi": "Data center",
+        "tedarik_zinciri": "Supply chain",
+        "kapsam_1": "Scope 1 (direct)",
+        "kapsam_2": "Scope 2 (energy)",
+        "kapsam_3": "Scope 3 (value chain)",
+        "toplam": "Total emissions",
+        "calisan_basina": "Per employee"
+    }
+}
+
+REGION_NAMES = {
+    "tr": {"UK": "Birleşik Krallık", "TR": "Türkiye", "US": "ABD", "EU": "AB"},
+    "en": {"UK": "United Kingdom", "TR": "Türkiye", "US": "United States", "EU": "European Union"}
+}
+
+# Reduction actions of recommendations.py
+ACTIONS = {
+    "tr": {
+        "yesil_tarife": "Yeşil elektrik tarifesine geçin",
+        "isi_yalitimi": "Yalıtım ve termostat ayarlarıyla doğalgaz kullanımını %15 azaltın",
+        "kucuk_arac": "Büyük aracınızı küçük bir araçla değiştirin",
+        "toplu_tasima": "Araba yolculuklarınızın dörtte birinde otobüse binin",
+        "daha_az_ucus": "Uçuş saatlerinizi yarıya indirin",
+        "daha_az_et": "Et ve süt tüketimini ortalamanın altına indirin",
+        "yerel_gida": "Daha fazla yerel gıda satın alın",
+        "daha_az_harcama": "Tüketim harcamalarınızı ortalamanın altına indirin",
+        "yesil_elektrik": "Yenilenebilir elektrik tarifesine geçin",
+        "yenilenebilir_enerji": "Yenilenebilir enerji payını %50'ye çıkarın",
+        "kucuk_filo": "Filodaki büyük araçları küçük araçlarla değiştirin",
+        "bina_verimliligi": "Bina enerji verimliliği iyileştirmelerine yatırım yapın",
+        "video_konferans": "İş uçuşlarının dörtte birini video konferansla değiştirin",
+        "verimli_veri_merkezi": "Verimli bir veri merkezi sağlayıcısına geçin"
+    },
+    "en": {
+        "yesil_tarife": "Switch to a green electricity tariff",
+        "isi_yalitimi": "Cut gas use by 15% with insulation and thermostat settings",
+        "kucuk_arac": "Replace your large car with a small one",
+        "toplu_tasima": "Take the bus for a quarter of your car journeys",
+        "daha_az_ucus": "Halve your flight hours",
+        "daha_az_et": "Eat less meat and dairy than average",
+        "yerel_gida": "Buy more local food",
+        "daha_az_harcama": "Bring your consumer spending below average",
+        "yesil_elektrik": "Switch to a renewable electricity tariff",
+        "yenilenebilir_enerji": "Raise the renewable energy share to 50%",
+        "kucuk_filo": "Replace the large vehicles of your fleet with small ones",
+        "bina_verimliligi": "Invest in building energy efficiency improvements",
+        "video_konferans": "Replace a quarter of business flights with video calls",
+        "verimli_veri_merkezi": "Move to an efficient data center provider"
+    }
+}
+
+TEMPLATES = {
+    "tr": {
+        "individual_title": "\n=== Karbon Ayak İzi Sonuçlarınız ===",
+        "total": "Toplam yıllık emisyonlar: {total:.1f} ton CO2e",
+        "breakdown_title": "\nKategoriye göre dağılım:",
+        "category": "\n{label}:",
+        "category_emissions": "  Emisyonlar: {value:.1f} ton CO2e (toplamınızın %{share:.1f}'si)",
+        "category_comparison": "  {region} ortalamasına kıyasla: {ratio:.1f} kat",
+        "actions_title": "\nÖnerilen Eylemler (yıllık tasarruf):",
+        "action": "• {action}: {saving:.1f} ton CO2e",
+        "priorities_title": "\nAzaltılması Gereken Öncelikli Alanlar:",
+        "priority": "• {label}: Ortalamanın %{excess:.0f} üzerinde",
+        "comparison_title": "\nEmisyon Karşılaştırması (kişi başına ton CO2e):",
+        "comparison_header": "{location:<25} {co2:>15}",
+        "comparison_row": "{location:<25} {co2:>15.1f}",
+        "comparison_user_row": ">>> {location:<22} {co2:>15.1f} <<<",
+        "location": "Konum",
+        "co2": "CO2 Emisyonları",
+        "you": "Sizin Ayak İziniz",
+        "pie_title": "Karbon Ayak İzi Dağılımı",
+        "bar_title": "Karbon Ayak İzi Karşılaştırması",
+        "bar_xlabel": "Ülkeler",
+        "bar_ylabel": "Karbon Ayak İzi (ton CO2e)",
+        "business_title": "\n=== İşletme Karbon Ayak İzi Sonuçları ===",
+        "business_name": "\nSonuçlar: {name}",
+        "business": "İşletme: {name}",
+        "sector": "Sektör: {sector}",
+        "business_breakdown_title": "\nKategoriye göre emisyonlar (yılda ton CO2e):",
+        "business_category": "{label:<26} {value:.1f}",
+        "business_total": "\nToplam yıllık emisyonlar: {total:.1f} ton CO2e",
+        "scopes_title": "\nGHG Protokolü kapsamları (ayarlamalar dahil):",
+        "allocated_title": "\nKapsamlara dağıtılan kategoriler (ayarlamalar dahil):",
+        "per_employee": "Çalışan başına emisyonlar: {value:.1f} ton CO2e",
+        "benchmark_title": "\nSektör karşılaştırması ({count} şirket):",
+        "benchmark_row": "{label}: sektörünüzdeki işletmelerin %{share:.0f} kadarından yüksek",
+        "business_tips_title": "\nAzaltma için öneriler:",
+        "business_action": "- {action} ({saving:.1f} ton CO2e/yıl)",
+        "report_title": "Karbon Ayak İzi Analiz Raporu",
+        "report_created": "Oluşturulma Tarihi: {created:%Y-%m-%d %H:%M:%S}\n",
+        "report_individual_title": "=== Bireysel Karbon Ayak İzi ===",
+        "report_averages_title": "\nOrtalamalarla Karşılaştırma:",
+        "report_yours": "Sizin ayak iziniz: {total:.1f} ton CO2e",
+        "report_world": "Dünya ortalaması:  4.4 ton CO2e",
+        "report_average": "{region} ortalaması: {average:.1f} ton CO2e",
+        "report_business_title": "=== İşletme Karbon Ayak İzi: {name} ===",
+        "report_breakdown_title": "\nKategoriye göre emisyonlar (ton CO2e):",
+        "report_category": "{label:<26} {value:.1f}",
+        "report_total": "\nToplam emisyonlar: {total:.1f} ton CO2e",
+        "report_scope": "{label:<26} {value:.1f} ton CO2e",
+        "report_per_employee": "Çalışan başına:    {value:.1f} ton CO2e",
+        "report_footer": "\nRapor, Karbon Ayak İzi Hesaplayıcı v1.0 tarafından oluşturuldu",
+        "report_saved": "\nAyrıntılı rapor şuraya kaydedildi: {filename}",
+        "report_heading": "Karbon Ayak İzi Raporu: {id}",
+        "report_breakdown": "Kategoriye göre dağılım:",
+        "report_share": "  {label:<26} {value:>8.1f} ton CO2e  (%{share:.1f})"
+    },
+    "en": {
+        "individual_title": "\n=== Your Carbon Footprint Results ===",
+        "total": "Total annual emissions: {total:.1f} tonnes CO2e",
+        "breakdown_title": "\nBreakdown by category:",
+        "category": "\n{label}:",
+        "category_emissions": "  Emissions: {value:.1f} tonnes CO2e ({share:.1f}% of your total)",
+        "category_comparison": "  Compared to the {region} average: {ratio:.1f}x",
+        "actions_title": "\nRecommended Actions (yearly savings):",
+        "action": "• {action}: {saving:.1f} tonnes CO2e",
+        "priorities_title": "\nPriority Areas for Reduction:",
+        "priority": "• {label}: {excess:.0f}% above average",
+        "comparison_title": "\nEmissions Comparison (tonnes CO2e per person):",
+        "comparison_header": "{location:<25} {co2:>15}",
+        "comparison_row": "{location:<25} {co2:>15.1f}",
+        "comparison_user_row": ">>> {location:<22} {co2:>15.1f} <<<",
+        "location": "Location",
+        "co2": "CO2 Emissions",
+        "you": "Your Footprint",
+        "pie_title": "Carbon Footprint Breakdown",
+        "bar_title": "Carbon Footprint Comparison",
+        "bar_xlabel": "Countries",
+        "bar_ylabel": "Carbon Footprint (tonnes CO2e)",
+        "business_title": "\n=== Business Carbon Footprint Results ===",
+        "business_name": "\nResults for: {name}",
+        "business": "Business: {name}",
+        "sector": "Sector: {sector}",
+        "business_breakdown_title": "\nEmissions by category (tonnes CO2e per year):",
+        "business_category": "{label:<26} {value:.1f}",
+        "business_total": "\nTotal annual emissions: {total:.1f} tonnes CO2e",
+        "scopes_title": "\nGHG Protocol scopes (adjustments included):",
+        "allocated_title": "\nCategories allocated to scopes (adjustments included):",
+        "per_employee": "Emissions per employee: {value:.1f} tonnes CO2e",
+        "benchmark_title": "\nSector comparison ({count} companies):",
+        "benchmark_row": "{label}: higher than {share:.0f}% of businesses in your sector",
+        "business_tips_title": "\nRecommendations for reduction:",
+        "business_action": "- {action} ({saving:.1f} tonnes CO2e/year)",
+        "report_title": "Carbon Footprint Analysis Report",
+        "report_created": "Created: {created:%Y-%m-%d %H:%M:%S}\n",
+        "report_individual_title": "=== Individual Carbon Footprint ===",
+        "report_averages_title": "\nComparison with Averages:",
+        "report_yours": "Your footprint: {total:.1f} tonnes CO2e",
+        "report_world": "World average:  4.4 tonnes CO2e",
+        "report_average": "{region} average: {average:.1f} tonnes CO2e",
+        "report_business_title": "=== Business Carbon Footprint: {name} ===",
+        "report_breakdown_title": "\nEmissions by category (tonnes CO2e):",
+        "report_category": "{label:<26} {value:.1f}",
+        "report_total": "\nTotal emissions: {total:.1f} tonnes CO2e",
+        "report_scope": "{label:<26} {value:.1f} tonnes CO2e",
+        "report_per_employee": "Per employee:    {value:.1f} tonnes CO2e",
+        "report_footer": "\nReport generated by Carbon Footprint Calculator v1.0",
+        "report_saved": "\nDetailed report saved to: {filename}",
+        "report_heading": "Carbon Footprint Report: {id}",
+        "report_breakdown": "Breakdown by category:",
+        "report_share": "  {label:<26} {value:>8.1f} tonnes CO2e  ({share:.1f}%)"
+    }
+}
+
+
+class Catalog:
+    """The templates of one language, compiled once into bound ``str.format`` methods."""
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE):
+        if language not in LANGUAGES:
+            raise ValueError(f"Desteklenmeyen dil: {language} (desteklenen: {', '.join(LANGUAGES)})")
+        self.language = language
+        self._formatters = {key: template.format for key, template in TEMPLATES[language].items()}
+        self._labels = LABELS[language]
+        self._regions = REGION_NAMES[language]
+        self._actions = ACTIONS[language]
+
+    def __call__(self, key: str, **values) -> str:
+        return self._formatters[key](**values)
+
+    def label(self, key: str) -> str:
+        return self._labels.get(key, key)
+
+    def region(self, code: str) -> str:
+        return self._regions.get(code, code)
+
+    def action(self, key: str) -> str:
+        return self._actions.get(key, key)
+
+
+_catalogs = {}
+
+
+def get_catalog(language: str = DEFAULT_LANGUAGE) -> Catalog:
+    catalog = _catalogs.get(language)
+    if catalog is None:
+        catalog = _catalogs[language] = Catalog(language)
+    return catalog
+
+
+def render_individual(result, catalog: Catalog) -> str:
+    """Console text of an ``IndividualResult``: totals, category breakdown, actions and priorities."""
+    lines = [catalog("individual_title"), catalog("total", total=result.total), catalog("breakdown_title"), "-" * 50]
+    region = catalog.region(result.region)
+    for key, value in result.emissions.items():
+        lines.append(catalog("category", label=catalog.label(key)))
+        lines.append(catalog("category_emissions", value=value, share=result.percentages[key]))
+        lines.append(catalog("category_comparison", region=region, ratio=result.comparison[key]))
+    if result.actions:
+        lines.append(catalog("actions_title"))
+        lines.extend(catalog("action", action=catalog.action(key), saving=saving) for key, saving in result.actions)
+    lines.append(catalog("priorities_title"))
+    for key in result.priorities:
+        lines.append(catalog("priority", label=catalog.label(key), excess=(result.comparison[key] - 1) * 100))
+    return "\n".join(lines)
+
+
+def render_comparison_table(user_total: float, comparison_df, catalog: Catalog) -> str:
+    """Location/CO2 table with the user's footprint sorted in and highlighted."""
+    you = catalog("you")
+    rows = sorted(list(zip(comparison_df['Konum'], comparison_df['CO2'])) + [(you, user_total)],
+                  key=lambda row: row[0])
+    lines = [catalog("comparison_title"), "-" * 45,
+             catalog("comparison_header", location=catalog("location"), co2=catalog("co2")), "-" * 45]
+    for location, co2 in rows:
+        lines.append(catalog("comparison_user_row" if location == you else "comparison_row", location=location, co2=co2))
+    lines.append("-" * 45)
+    return "\n".join(lines)
+
+
+def render_business(result, catalog: Catalog) -> str:
+    """Console text of a ``BusinessResult``."""
+    lines = [catalog("business_title"), catalog("business_name", name=result.name),
+             catalog("sector", sector=result.sector), catalog("business_breakdown_title")]
+    for key, value in result.emissions.items():
+        if key != "toplam":
+            lines.append(catalog("business_category", label=catalog.label(key) + ":", value=value))
+    lines.append(catalog("business_total", total=result.total))
+    lines.append(catalog("scopes_title"))
+    for key, value in result.scopes.items():
+        lines.append(catalog("business_category", label=catalog.label(key) + ":", value=value))
+    lines.append(catalog("allocated_title"))
+    for key, value in result.categories.items():
+        lines.append(catalog("business_category", label=catalog.label(key) + ":", value=value))
+    lines.append(catalog("per_employee", value=result.per_employee))
+    if result.sector_percentiles:
+        lines.append(catalog("benchmark_title", count=result.sector_count))
+        for key, share in result.sector_percentiles.items():
+            lines.append(catalog("benchmark_row", label=catalog.label(key), share=share))
+    lines.append(catalog("business_tips_title"))
+    lines.extend(catalog("business_action", action=catalog.action(key), saving=saving)
+                 for key, saving in result.actions)
+    return "\n".join(lines)
+
+
+def render_report(result, catalog: Catalog, created: Optional[datetime] = None) -> str:
+    """Text report file contents of an ``IndividualResult`` or ``BusinessResult``."""
+    created = created or datetime.now()
+    lines = [catalog("report_title"), catalog("report_created", created=created)]
+    if hasattr(result, "percentages"):
+        lines += [catalog("report_individual_title"), catalog("total", total=result.annual_total),
+                  catalog("report_averages_title"), catalog("report_yours", total=result.annual_total),
+                  catalog("report_world"),
+                  catalog("report_average", region=catalog.region(result.region), average=result.average)]
+    else:
+        lines += [catalog("report_business_title", name=result.name), catalog("sector", sector=result.sector),
+                  catalog("report_breakdown_title")]
+        for key, value in result.emissions.items():
+            if key != "toplam":
+                lines.append(catalog("report_category", label=catalog.label(key), value=value))
+        lines.append(catalog("report_total", total=result.total))
+        for key, value in result.scopes.items():
+            lines.append(catalog("report_scope", label=catalog.label(key), value=value))
+        lines.append(catalog("allocated_title"))
+        for key, value in result.categories.items():
+            lines.append(catalog("report_scope", label=catalog.label(key), value=value))
+        lines.append(catalog("report_per_employee", value=result.per_employee))
+    lines.append(catalog("report_footer"))
+    return "\n".join(lines)
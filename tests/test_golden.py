@@ -0,0 +1,17 @@
+"""Every calculation engine against the pinned golden reference (tests/golden_reference.npz).
+
+Re-record the reference only for an intended change of results:
+``python golden.py record --size 1000 --output tests/golden_reference.npz``
+"""
+import os
+
+import pytest
+
+from golden import ENGINES, check
+
+REFERENCE = os.path.join(os.path.dirname(__file__), "golden_reference.npz")
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_engine_matches_pinned_reference(engine):
+    assert check([engine], REFERENCE)
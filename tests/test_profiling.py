@@ -0,0 +1,20 @@
+"""The profiler's report stage writes one file per record."""
+import json
+from dataclasses import asdict
+
+from golden import generate_corpus
+from profiling import profile_run
+
+
+def test_report_stage_keeps_similar_ids_apart(tmp_path):
+    household, personal = generate_corpus(1).pairs[0]
+    path = tmp_path / "kayitlar.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        for record_id in ("a.b@c.com", "a_b@c.com"):
+            f.write(json.dumps({"id": record_id, "type": "individual", "household": asdict(household),
+                                "personal": asdict(personal)}, ensure_ascii=False) + "\n")
+    output = tmp_path / "raporlar"
+    output.mkdir()
+
+    profile_run(str(path), charts=0, reports=10, output_dir=str(output), trace_memory=False)
+    assert len(list(output.iterdir())) == 2
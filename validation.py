@@ -0,0 +1,425 @@
+"""Column-wise validation and coercion of bulk input records."""
+import math
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from flights import CABIN_CLASSES
+from grid_intensity import HOURS_PER_LEAP_YEAR, HOURS_PER_YEAR
+from son import Household, Personal, Business, PERSONAL_CHOICES, SUPPLY_CHAIN_OPTIONS
+
+MISSING = object()
+
+BOOL_LABELS = {
+    "true": True, "false": False, "1": True, "0": False, "1.0": True, "0.0": False,
+    "e": True, "evet": True, "h": False, "hayır": False
+}
+
+
+@dataclass
+class FieldRule:
+    kind: str  # "float", "int", "bool", "str", "choice", "vehicles", "spend", "legs", "profile" or "any"
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    exclusive_minimum: bool = False
+    choices: Optional[list] = None
+    default: object = MISSING
+    requires: tuple = ()  # Fields that must also be set when this one is
+    count_of: Optional[str] = None  # Field whose number of entries this one must equal; filled from it when omitted
+
+
+@dataclass
+class RowError:
+    row: int
+    field: str
+    message: str
+    value: object = None
+
+    def to_dict(self) -> dict:
+        value = self.value if isinstance(self.value, (str, int, float, bool, type(None))) else repr(self.value)
+        return {"row": self.row, "field": self.field, "message": self.message, "value": value}
+
+
+@dataclass
+class ValidationReport:
+    records: list  # Validated object per row, None where the row has errors
+    errors: list[RowError] = field(default_factory=list)
+
+    @property
+    def valid_count(self) -> int:
+        return sum(record is not None for record in self.records)
+
+    def errors_by_row(self) -> dict[int, list[RowError]]:
+        grouped = {}
+        for error in self.errors:
+            grouped.setdefault(error.row, []).append(error)
+        return grouped
+
+
+def _check_numeric(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+    # true/false would coerce to 1/0, and NaN/Infinity are valid JSON but not usable amounts
+    is_bool = values.map(lambda value: isinstance(value, (bool, np.bool_))).to_numpy(dtype=bool)
+    bad = ~np.isfinite(numbers) | is_bool
+    messages = np.full(len(numbers), "", dtype=object)
+    messages[bad] = "sayı olmalıdır"
+
+    with np.errstate(invalid='ignore'):
+        if rule.kind == "int":
+            not_int = ~bad & (numbers != np.floor(numbers))
+            messages[not_int] = "tam sayı olmalıdır"
+            bad |= not_int
+        if rule.minimum is not None:
+            low = ~bad & ((numbers <= rule.minimum) if rule.exclusive_minimum else (numbers < rule.minimum))
+            messages[low] = (f"{rule.minimum} değerinden büyük olmalıdır" if rule.exclusive_minimum
+                             else f"en az {rule.minimum} olmalıdır")
+            bad |= low
+        if rule.maximum is not None:
+            high = ~bad & (numbers > rule.maximum)
+            messages[high] = f"en fazla {rule.maximum} olmalıdır"
+            bad |= high
+
+    for i in np.flatnonzero(bad):
+        errors.append(RowError(int(rows[i]), name, messages[i], values.iat[i]))
+    if rule.kind == "int":
+        return [int(number) if np.isfinite(number) else None for number in numbers]
+    return numbers.tolist()
+
+
+def _check_bool(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    mapped = values.astype(str).str.strip().str.lower().map(BOOL_LABELS)
+    for i in np.flatnonzero(mapped.isna().to_numpy()):
+        errors.append(RowError(int(rows[i]), name, "evet/hayır (true/false) olmalıdır", values.iat[i]))
+    return mapped.tolist()
+
+
+def _check_choice(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    for i in np.flatnonzero(~values.isin(rule.choices).to_numpy()):
+        errors.append(RowError(int(rows[i]), name, f"geçersiz seçenek; geçerli seçenekler: {rule.choices}",
+                               values.iat[i]))
+    return values.tolist()
+
+
+def _check_str(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    is_str = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    for i in np.flatnonzero(~is_str):
+        errors.append(RowError(int(rows[i]), name, "metin olmalıdır", values.iat[i]))
+    return values.tolist()
+
+
+def _check_vehicles(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    coerced = []
+    for i, vehicles in enumerate(values):
+        if not isinstance(vehicles, dict):
+            errors.append(RowError(int(rows[i]), name, "araç sözlüğü olmalıdır", vehicles))
+            coerced.append(None)
+            continue
+        clean = {}
+        for key, vehicle in vehicles.items():
+            try:
+                vehicle_type = vehicle["type"]
+                mileage = float(vehicle["mileage"])
+            except (KeyError, TypeError, ValueError):
+                errors.append(RowError(int(rows[i]), f"{name}.{key}", "'type' ve sayısal 'mileage' içermelidir",
+                                       vehicle))
+                continue
+            if vehicle_type not in rule.choices:
+                errors.append(RowError(int(rows[i]), f"{name}.{key}.type",
+                                       f"geçersiz araç tipi; geçerli tipler: {rule.choices}", vehicle_type))
+            elif not mileage >= 0:
+                errors.append(RowError(int(rows[i]), f"{name}.{key}.mileage", "negatif olamaz", mileage))
+            else:
+                clean[key] = {"type": vehicle_type, "mileage": mileage}
+        coerced.append(clean)
+    return coerced
+
+
+def _check_spend(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    coerced = []
+    for i, spend in enumerate(values):
+        if spend is None:
+            coerced.append(None)
+            continue
+        if not isinstance(spend, dict):
+            errors.append(RowError(int(rows[i]), name, "sektör -> harcama sözlüğü olmalıdır", spend))
+            coerced.append(None)
+            continue
+        clean = {}
+        for sector, amount in spend.items():
+            if sector not in rule.choices:
+                errors.append(RowError(int(rows[i]), f"{name}.{sector}",
+                                       f"geçersiz sektör; geçerli sektörler: {rule.choices}", sector))
+                continue
+            try:
+                amount = float(amount)
+            except (TypeError, ValueError):
+                errors.append(RowError(int(rows[i]), f"{name}.{sector}", "sayı olmalıdır", amount))
+                continue
+            if not amount >= 0:
+                errors.append(RowError(int(rows[i]), f"{name}.{sector}", "negatif olamaz", amount))
+            else:
+                clean[sector] = amount
+        coerced.append(clean)
+    return coerced
+
+
+def _check_legs(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    airports = set(rule.choices) if rule.choices is not None else None
+    coerced = []
+    for i, legs in enumerate(values):
+        if legs is None:
+            coerced.append(None)
+            continue
+        if not isinstance(legs, list):
+            errors.append(RowError(int(rows[i]), name, "uçuş listesi olmalıdır", legs))
+            coerced.append(None)
+            continue
+        clean = []
+        for j, leg in enumerate(legs):
+            try:
+                origin, destination = str(leg["origin"]), str(leg["destination"])
+                cabin = leg.get("cabin", CABIN_CLASSES[0])
+                count = float(leg.get("count", 1))
+            except (KeyError, TypeError, AttributeError, ValueError):
+                errors.append(RowError(int(rows[i]), f"{name}[{j}]",
+                                       "'origin', 'destination' ve sayısal 'count' içermelidir", leg))
+                continue
+            unknown = [code for code in (origin, destination) if airports is not None and code not in airports]
+            if unknown:
+                errors.append(RowError(int(rows[i]), f"{name}[{j}]", f"bilinmeyen havalimanı: {unknown[0]}", leg))
+            elif cabin not in CABIN_CLASSES:
+                errors.append(RowError(int(rows[i]), f"{name}[{j}].cabin",
+                                       f"geçersiz kabin sınıfı; geçerli sınıflar: {list(CABIN_CLASSES)}", cabin))
+            elif not count >= 0:
+                errors.append(RowError(int(rows[i]), f"{name}[{j}].count", "negatif olamaz", count))
+            else:
+                clean.append({"origin": origin, "destination": destination, "cabin": cabin, "count": count})
+        coerced.append(clean)
+    return coerced
+
+
+def _check_profile(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    coerced = []
+    for i, profile in enumerate(values):
+        if not isinstance(profile, (list, tuple, np.ndarray)):
+            errors.append(RowError(int(rows[i]), name, f"{HOURS_PER_YEAR} saatlik kWh değeri listesi olmalıdır",
+                                   profile))
+            coerced.append(None)
+            continue
+        if len(profile) not in (HOURS_PER_YEAR, HOURS_PER_LEAP_YEAR):
+            errors.append(RowError(int(rows[i]), name,
+                                   f"{HOURS_PER_YEAR} (artık yılda {HOURS_PER_LEAP_YEAR}) saatlik değer içermelidir",
+                                   len(profile)))
+            coerced.append(None)
+            continue
+        hourly = pd.to_numeric(pd.Series(profile, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            bad = np.flatnonzero(~(hourly >= 0))
+        if len(bad):
+            errors.append(RowError(int(rows[i]), f"{name}[{bad[0]}]", "negatif olmayan bir sayı olmalıdır",
+                                   profile[bad[0]]))
+            coerced.append(None)
+        else:
+            coerced.append(hourly.tolist())
+    return coerced
+
+
+def _check_any(values: pd.Series, rule: FieldRule, name: str, rows: np.ndarray, errors: list) -> list:
+    return values.tolist()
+
+
+CHECKERS = {
+    "float": _check_numeric,
+    "int": _check_numeric,
+    "bool": _check_bool,
+    "choice": _check_choice,
+    "str": _check_str,
+    "vehicles": _check_vehicles,
+    "spend": _check_spend,
+    "legs": _check_legs,
+    "profile": _check_profile,
+    "any": _check_any
+}
+
+
+class CompiledValidator:
+    """Validates a batch of dicts against one dataclass, one column at a time.
+
+    Rules are resolved to checker functions once; every column is then checked
+    and coerced in a single vectorized pass where the value type allows it.
+    Problems are collected per row instead of raising on the first bad value.
+    """
+
+    def __init__(self, cls, rules: dict[str, FieldRule]):
+        self.cls = cls
+        self.field_names = [f.name for f in fields(cls)]
+        unknown = set(rules) - set(self.field_names)
+        if unknown:
+            raise ValueError(f"{cls.__name__} için bilinmeyen alanlar: {sorted(unknown)}")
+        self._columns = [(name, rules[name], CHECKERS[rules[name].kind]) for name in self.field_names]
+        self._known = set(self.field_names)
+
+    def validate(self, rows: list, prefix: str = "") -> ValidationReport:
+        errors = []
+        bad_rows = set()
+        dict_rows = []
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors.append(RowError(i, prefix.rstrip(".") or self.cls.__name__, "nesne olmalıdır", row))
+                bad_rows.add(i)
+                continue
+            for name in row.keys() - self._known:
+                errors.append(RowError(i, prefix + name, "bilinmeyen alan", row[name]))
+            dict_rows.append(i)
+
+        columns = {}
+        for name, rule, checker in self._columns:
+            raw = [rows[i].get(name, rule.default) for i in dict_rows]
+            present = np.array([value is not MISSING for value in raw], dtype=bool)
+            for i in np.flatnonzero(~present):
+                errors.append(RowError(dict_rows[i], prefix + name, "zorunlu alan eksik"))
+            rows_present = np.asarray(dict_rows, dtype=np.int64)[present]
+            values = pd.Series([value for value in raw if value is not MISSING], dtype=object)
+
+            if rule.kind != "any" and rule.default is None:
+                # Optional fields: None passes through unchecked
+                is_set = values.map(lambda value: value is not None).to_numpy(dtype=bool)
+                checked = checker(values[is_set].reset_index(drop=True), rule, prefix + name,
+                                  rows_present[is_set], errors)
+                coerced = [None] * len(values)
+                for position, value in zip(np.flatnonzero(is_set), checked):
+                    coerced[position] = value
+            else:
+                coerced = checker(values, rule, prefix + name, rows_present, errors)
+            columns[name] = dict(zip(rows_present.tolist(), coerced))
+
+        # Fields that only make sense together (e.g. an hourly profile needs its grid region and year)
+        for name, rule, _ in self._columns:
+            for required in rule.requires:
+                for i, value in columns[name].items():
+                    if value is not None and columns[required].get(i) is None:
+                        errors.append(RowError(i, prefix + required, f"{prefix + name} verildiğinde zorunludur"))
+
+        # Counts of another field's entries (e.g. num_cars of car_mileages)
+        for name, rule, _ in self._columns:
+            if rule.count_of is None:
+                continue
+            for i, value in columns[name].items():
+                entries = columns[rule.count_of].get(i)
+                if entries is None:
+                    continue  # already reported by the field's own checker
+                if value is None:
+                    columns[name][i] = len(entries)
+                elif value != len(entries):
+                    errors.append(RowError(i, prefix + name, f"{prefix + rule.count_of} içindeki kayıt sayısına "
+                                                             f"({len(entries)}) eşit olmalıdır", value))
+
+        bad_rows.update(error.row for error in errors)
+        records = []
+        for i in range(len(rows)):
+            if i in bad_rows:
+                records.append(None)
+            else:
+                records.append(self.cls(**{name: columns[name][i] for name in self.field_names}))
+        return ValidationReport(records, errors)
+
+
+def build_validators(calculator) -> dict[str, CompiledValidator]:
+    """Compile validators for the calculator's current sectors and car types.
+
+    Procurement sectors are those of the loaded EEIO table, if any, and
+    flight legs are checked against the loaded airports.
+    """
+    car_types = list(calculator.CAR_MPG.keys())
+    non_negative = dict(kind="float", minimum=0)
+
+    household = CompiledValidator(Household, {
+        "members": FieldRule("float", minimum=0, exclusive_minimum=True),
+        "electricity_kwh": FieldRule(**non_negative),
+        "electricity_green": FieldRule("bool", default=False),
+        "gas_kwh": FieldRule(**non_negative),
+        "other_heating": FieldRule("bool", default=False),
+        "num_cars": FieldRule("int", minimum=0, default=None, count_of="car_mileages"),
+        "car_mileages": FieldRule("vehicles", choices=car_types, default={})
+    })
+
+    personal_rules = {name: FieldRule("choice", choices=options) for name, options in PERSONAL_CHOICES.items()}
+    personal_rules.update({
+        "bus_miles": FieldRule(**non_negative, default=0.0),
+        "train_miles": FieldRule(**non_negative, default=0.0),
+        "flight_hours": FieldRule(**non_negative, default=0.0),
+        "recycles_basic": FieldRule("bool", default=False),
+        "recycles_plastic": FieldRule("bool", default=False)
+    })
+    personal = CompiledValidator(Personal, personal_rules)
+
+    business = CompiledValidator(Business, {
+        "name": FieldRule("str"),
+        "sector": FieldRule("choice", choices=list(calculator.SECTOR_MULTIPLIERS.keys())),
+        "num_employees": FieldRule("int", minimum=0, exclusive_minimum=True),
+        "office_space_sqft": FieldRule(**non_negative),
+        "electricity_kwh": FieldRule(**non_negative),
+        "electricity_green": FieldRule("bool", default=False),
+        "gas_kwh": FieldRule(**non_negative),
+        "company_vehicles": FieldRule("vehicles", choices=car_types, default={}),
+        "air_travel_hours": FieldRule(**non_negative, default=0.0),
+        "waste_recycling_rate": FieldRule("float", minimum=0, maximum=1, default=0.0),
+        "data_center_usage": FieldRule(**non_negative, default=0.0),
+        "supply_chain_assessment": FieldRule("choice", choices=SUPPLY_CHAIN_OPTIONS, default=SUPPLY_CHAIN_OPTIONS[0]),
+        "renewable_energy_percent": FieldRule("float", minimum=0, maximum=100, default=0.0),
+        "electricity_profile": FieldRule("profile", default=None, requires=("grid_region", "grid_year")),
+        "grid_region": FieldRule("str", default=None),
+        "grid_year": FieldRule("int", default=None),
+        "procurement_spend": FieldRule("spend", default=None,
+                                       choices=list(calculator.supply_chain.sectors if calculator.supply_chain
+                                                    else calculator.SECTOR_MULTIPLIERS.keys())),
+        "travel_legs": FieldRule("legs", choices=list(calculator.flights.codes) if calculator.flights else None,
+                                 default=None)
+    })
+
+    return {"household": household, "personal": personal, "business": business}
+
+
+def validate_records(records: list, validators: dict[str, CompiledValidator]) -> ValidationReport:
+    """Validate mixed batch records (see ``son.run_batch``) section by section.
+
+    Each valid row becomes a dict with the record type, its reporting year (None
+    when the record has no ``year``) and its dataclass inputs.
+    """
+    errors = []
+    sections = {"individual": [], "business": []}
+    years = [None] * len(records)
+    for i, record in enumerate(records):
+        record_type = record.get("type", "individual") if isinstance(record, dict) else None
+        if record_type not in sections:
+            errors.append(RowError(i, "type", "'individual' veya 'business' olmalıdır", record_type))
+            continue
+        # Optional reporting year of the record (e.g. when backfilling history)
+        year = record.get("year")
+        if year is not None:
+            if isinstance(year, bool) or not isinstance(year, (int, float)) or not math.isfinite(year) \
+                    or year != int(year):
+                errors.append(RowError(i, "year", "tam sayı olmalıdır", year))
+                continue
+            years[i] = int(year)
+        sections[record_type].append(i)
+
+    results = [None] * len(records)
+    section_fields = {"individual": ("household", "personal"), "business": ("business",)}
+    for record_type, indices in sections.items():
+        parts = {}
+        for name in section_fields[record_type]:
+            report = validators[name].validate([records[i].get(name) for i in indices], prefix=f"{name}.")
+            for error in report.errors:
+                error.row = indices[error.row]
+            errors.extend(report.errors)
+            parts[name] = report.records
+        for position, i in enumerate(indices):
+            values = {name: parts[name][position] for name in parts}
+            if all(value is not None for value in values.values()):
+                results[i] = {"type": record_type, "year": years[i], **values}
+
+    errors.sort(key=lambda error: error.row)
+    return ValidationReport(results, errors)
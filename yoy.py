@@ -0,0 +1,267 @@
+"""Year-over-year change of business and individual footprints, with attribution."""
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from batch import (BUSINESS_CATEGORIES, INDIVIDUAL_CATEGORIES, business_arrays, business_emissions_batch,
+                   individual_analysis_batch, individual_arrays)
+
+# Effects the change in the total is split into
+ACTIVITY = "aktivite"
+FACTORS = "katsayi"
+SECTOR_MULTIPLIER = "sektor_carpani"
+RENEWABLE = "yenilenebilir"
+
+
+@dataclass
+class DeltaResult:
+    """Per-entity baseline/current category emissions and the attribution of the change.
+
+    Every array has one element per entity pair. The ``attribution`` arrays
+    add up exactly to ``delta["toplam"]``; ``category_attribution`` splits the
+    change of each (unadjusted) category into activity and factor effects.
+    """
+    categories: tuple
+    baseline: dict
+    current: dict
+    attribution: dict
+    category_attribution: dict = field(default_factory=dict)
+
+    @property
+    def delta(self) -> dict:
+        return {key: self.current[key] - self.baseline[key] for key in self.baseline}
+
+    def __len__(self):
+        return len(self.baseline["toplam"])
+
+    def rows(self) -> list[dict]:
+        """Return one plain dict per entity pair, e.g. for JSON output."""
+        delta = self.delta
+        return [{
+            "onceki": {key: float(values[i]) for key, values in self.baseline.items()},
+            "simdiki": {key: float(values[i]) for key, values in self.current.items()},
+            "degisim": {key: float(values[i]) for key, values in delta.items()},
+            "etkiler": {key: float(values[i]) for key, values in self.attribution.items()}
+        } for i in range(len(self))]
+
+
+def _midpoint_split(x0, x1, y0, y1):
+    """Split Δ(x·y) into (ȳ·Δx, x̄·Δy); the two parts add up exactly."""
+    return (y0 + y1) / 2 * (x1 - x0), (x0 + x1) / 2 * (y1 - y0)
+
+
+def business_deltas(baseline: list, current: list, baseline_calculator, current_calculator=None) -> DeltaResult:
+    """Compare ``current[i]`` with ``baseline[i]`` for every business in one vectorized pass.
+
+    ``current_calculator`` holds the factors of the current year (defaults to
+    the baseline calculator). With subtotal ``s = Σ activity·factor`` and
+    total ``s · k · (1 - r)``, the change is split with midpoint weights into
+    activity, factor, sector multiplier ``k`` and renewable share ``r`` effects.
+    """
+    if len(baseline) != len(current):
+        raise ValueError("Önceki ve şimdiki dönem aynı sayıda işletme içermelidir")
+    current_calculator = current_calculator or baseline_calculator
+    before = business_arrays(baseline, baseline_calculator)
+    after = business_arrays(current, current_calculator)
+
+    activity_effect, factor_effect = _midpoint_split(before.activity, after.activity, before.factor, after.factor)
+    subtotal0 = (before.activity * before.factor).sum(axis=1)
+    subtotal1 = (after.activity * after.factor).sum(axis=1)
+    retained0 = 1 - before.renewable_share
+    retained1 = 1 - after.renewable_share
+    adjustment0 = before.sector_multiplier * retained0
+    adjustment1 = after.sector_multiplier * retained1
+
+    # Δtotal = m̄·Δs + s̄·Δm, and Δm = (1-r)‾·Δk + k̄·Δ(1-r)
+    mean_adjustment = (adjustment0 + adjustment1) / 2
+    mean_subtotal = (subtotal0 + subtotal1) / 2
+    multiplier_effect, renewable_effect = _midpoint_split(before.sector_multiplier, after.sector_multiplier,
+                                                          retained0, retained1)
+    attribution = {
+        ACTIVITY: mean_adjustment * activity_effect.sum(axis=1),
+        FACTORS: mean_adjustment * factor_effect.sum(axis=1),
+        SECTOR_MULTIPLIER: mean_subtotal * multiplier_effect,
+        RENEWABLE: mean_subtotal * renewable_effect
+    }
+    category_attribution = {
+        category: {ACTIVITY: activity_effect[:, j], FACTORS: factor_effect[:, j]}
+        for j, category in enumerate(BUSINESS_CATEGORIES)
+    }
+    return DeltaResult(
+        categories=BUSINESS_CATEGORIES,
+        baseline=business_emissions_batch(before),
+        current=business_emissions_batch(after),
+        attribution=attribution,
+        category_attribution=category_attribution
+    )
+
+
+def _individual_analysis(pairs: list, calculator) -> dict:
+    result = individual_analysis_batch(individual_arrays(pairs, calculator), calculator)
+    result["toplam"] = sum(result.values())
+    return result
+
+
+def individual_deltas(baseline: list, current: list, baseline_calculator, current_calculator=None) -> DeltaResult:
+    """Compare ``(household, personal)`` pairs category by category, as ``analyze_individual_emissions``.
+
+    The analysis is not a single product, so activity and factor effects are
+    the symmetric (Shapley) split over the four input/factor combinations;
+    they add up exactly to the change of every category and of the total.
+    """
+    if len(baseline) != len(current):
+        raise ValueError("Önceki ve şimdiki dönem aynı sayıda katılımcı içermelidir")
+    current_calculator = current_calculator or baseline_calculator
+    old = _individual_analysis(baseline, baseline_calculator)
+    new = _individual_analysis(current, current_calculator)
+    if current_calculator is baseline_calculator:
+        category_attribution = {key: {ACTIVITY: new[key] - old[key], FACTORS: np.zeros(len(baseline))}
+                                for key in old}
+    else:
+        new_inputs_old_factors = _individual_analysis(current, baseline_calculator)
+        old_inputs_new_factors = _individual_analysis(baseline, current_calculator)
+        category_attribution = {}
+        for key in old:
+            activity = ((new_inputs_old_factors[key] - old[key]) + (new[key] - old_inputs_new_factors[key])) / 2
+            category_attribution[key] = {ACTIVITY: activity, FACTORS: new[key] - old[key] - activity}
+    total = category_attribution.pop("toplam")
+    return DeltaResult(
+        categories=INDIVIDUAL_CATEGORIES,
+        baseline=old,
+        current=new,
+        attribution=total,
+        category_attribution=category_attribution
+    )
+
+
+def _consecutive(snapshots: list, calculators, compare):
+    if not isinstance(calculators, (list, tuple)):
+        calculators = [calculators] * len(snapshots)
+    if len(calculators) != len(snapshots):
+        raise ValueError("Her dönem için bir hesaplayıcı verilmelidir")
+    if len(snapshots) < 2:
+        raise ValueError("Karşılaştırma için en az iki dönem gereklidir")
+
+    # Pair every snapshot with the previous one; different factor packs per year
+    # are compared group by group, equal packs in one vectorized call
+    groups = {}
+    for i in range(1, len(snapshots)):
+        groups.setdefault((id(calculators[i - 1]), id(calculators[i])), []).append(i)
+    results = [None] * (len(snapshots) - 1)
+    for indices in groups.values():
+        first = indices[0]
+        result = compare([snapshots[i - 1] for i in indices], [snapshots[i] for i in indices],
+                         calculators[first - 1], calculators[first])
+        for position, i in enumerate(indices):
+            results[i - 1] = _select(result, position)
+    return results
+
+
+def _select(result: DeltaResult, i: int) -> DeltaResult:
+    take = lambda values: {key: value[i:i + 1] for key, value in values.items()}
+    return DeltaResult(
+        categories=result.categories,
+        baseline=take(result.baseline),
+        current=take(result.current),
+        attribution=take(result.attribution),
+        category_attribution={key: take(value) for key, value in result.category_attribution.items()}
+    )
+
+
+def business_series(snapshots: list, calculators) -> list[DeltaResult]:
+    """Year-over-year changes of one business: one single-row ``DeltaResult`` per consecutive pair.
+
+    ``calculators`` is one calculator for every year or a list with one per snapshot.
+    """
+    return _consecutive(snapshots, calculators, business_deltas)
+
+
+def individual_series(snapshots: list, calculators) -> list[DeltaResult]:
+    """Year-over-year changes of one respondent's ``(household, personal)`` snapshots."""
+    return _consecutive(snapshots, calculators, individual_deltas)
+
+
+def stored_calculator(store, submission: dict, default_factors: Optional[str] = None,
+                      calculators: Optional[dict] = None):
+    """Rebuild the calculator a ``SubmissionStore`` submission was scored with.
+
+    Factors come from the factor set stored under the submission's fingerprint,
+    so a pack edited since keeps the values it had; the EEIO table, airports and
+    grid data are reopened from their recorded paths. Rows stored without a
+    fingerprint fall back to the registry pack of their code. ``calculators``
+    caches rebuilt calculators between calls.
+    """
+    from factor_packs import FactorPack, _freeze, get_registry
+    from son import CarbonCalculator
+
+    settings = submission.get("settings") or {}
+    fingerprint = submission.get("factor_fingerprint")
+    key = (fingerprint or submission["factor_pack"] or default_factors, json.dumps(settings, sort_keys=True))
+    calculators = {} if calculators is None else calculators
+    if key in calculators:
+        return calculators[key]
+
+    factor_set = store.factor_set(fingerprint) if fingerprint else None
+    if factor_set is not None:
+        pack = FactorPack(code=factor_set["code"], name=factor_set["name"], version=factor_set["version"],
+                          fingerprint=fingerprint, factors=_freeze(factor_set["factors"]))
+    else:
+        registry = get_registry()
+        pack = registry.get(submission["factor_pack"] or default_factors or registry.get().code)
+    calculator = CarbonCalculator(pack)
+
+    if "eeio" in settings:
+        from supply_chain import EEIOTable
+        calculator.supply_chain = _reopen(EEIOTable, settings["eeio"])
+    if "airports" in settings:
+        from flights import FlightEmissions
+        calculator.flights = _reopen(FlightEmissions, settings["airports"])
+    if "grid" in settings:
+        from grid_intensity import GridIntensityProvider
+        calculator.grid_intensity = GridIntensityProvider(settings["grid"]["data_dir"])
+    calculators[key] = calculator
+    return calculator
+
+
+def _reopen(table_type, recorded: dict):
+    table = table_type(recorded["path"])
+    if table.fingerprint != recorded["fingerprint"]:
+        raise ValueError(f"{recorded['path']} kayıttan sonra değişmiş; gönderim aynı tabloyla "
+                         "yeniden hesaplanamaz")
+    return table
+
+
+def stored_series(store, external_id, default_factors: Optional[str] = None) -> dict[tuple, DeltaResult]:
+    """Year-over-year changes of an entity from its ``SubmissionStore`` history.
+
+    Submissions are grouped by reporting year, the latest one of a year
+    replacing earlier ones, and consecutive reported years are compared. Each
+    is evaluated with the calculator it was scored with (``stored_calculator``),
+    so the attribution shows the effect of factor updates between years.
+    Returns ``{(previous year, year): DeltaResult}``.
+    """
+    from son import Business, Household, Personal
+
+    by_year = {}
+    for submission in store.history(external_id):  # ordered by year, then insert time
+        by_year[submission["year"]] = submission
+    if len(by_year) < 2:
+        raise ValueError(f"{external_id} için en az iki farklı yılın kaydı gereklidir")
+
+    years = sorted(by_year)
+    calculators = {}
+    snapshots = []
+    snapshot_calculators = []
+    for year in years:
+        submission = by_year[year]
+        snapshot_calculators.append(stored_calculator(store, submission, default_factors, calculators))
+        inputs = submission["inputs"]
+        if submission["calculator_type"] == "business":
+            snapshots.append(Business(**inputs["business"]))
+        else:
+            snapshots.append((Household(**inputs["household"]), Personal(**inputs["personal"])))
+
+    series = business_series if by_year[years[0]]["calculator_type"] == "business" else individual_series
+    return dict(zip(zip(years[:-1], years[1:]), series(snapshots, snapshot_calculators)))